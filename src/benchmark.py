@@ -0,0 +1,285 @@
+"""
+Benchmark Harness (benchmark.py)
+Measures all twelve CLI operations against a local MySQL/MariaDB instance,
+optionally at several generated data scales. Reports latency percentiles,
+throughput, peak RSS and rows read (from the server's Handler_read_*
+counters), writes the results as JSON, and fails when an operation regresses
+past a threshold against a baseline run.
+
+    python3 main_app.py benchmark --scales 10k,100k --load --output run.json
+    python3 main_app.py benchmark --baseline run.json --threshold 0.25
+"""
+
+import sys
+import json
+import time
+import random
+import platform
+import datetime
+
+import operations
+import datagen
+
+DEFAULT_ITERATIONS = 20
+DEFAULT_WARMUP = 2
+DEFAULT_THRESHOLD = 0.25      # 25% slower than the baseline counts as a regression
+DEFAULT_METRIC = 'p50_ms'
+COMPARABLE_METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'mean_ms', 'rows_read_per_op')
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is reported as null.
+    resource = None
+
+
+# --- Measurements ---
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _handler_reads(connection):
+    """Sum of this session's Handler_read_* counters (rows/index entries read)."""
+    with connection.cursor() as cursor:
+        cursor.execute("SHOW SESSION STATUS LIKE 'Handler_read%%'")
+        return sum(int(row['Value']) for row in cursor.fetchall())
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# --- Workload ---
+
+class _Ids:
+    """ID ranges of the loaded dataset, used to pick deterministic parameters."""
+
+    def __init__(self, pool):
+        with pool.connection() as connection, connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT (SELECT MAX(Mission_ID) FROM MISSION) AS Missions,
+                       (SELECT MAX(Pokemon_ID) FROM POKEMON) AS Pokemon,
+                       (SELECT MAX(Personnel_ID) FROM PERSONNEL) AS Personnel,
+                       (SELECT MIN(Grunt_Personnel_ID) FROM GRUNT) AS First_Grunt,
+                       (SELECT MAX(Grunt_Personnel_ID) FROM GRUNT) AS Last_Grunt
+            """)
+            row = cursor.fetchone()
+        self.missions = row['Missions'] or 1
+        self.pokemon = row['Pokemon'] or 1
+        self.personnel = row['Personnel'] or 1
+        self.first_grunt = row['First_Grunt'] or 1
+        self.last_grunt = row['Last_Grunt'] or 1
+
+
+def _rolled_back(pool, statements):
+    """
+    Runs a write operation's statements and rolls them back, so every run sees
+    the same dataset and results stay comparable between runs.
+    """
+    with pool.connection() as connection:
+        with connection.cursor() as cursor:
+            statements(cursor)
+        connection.rollback()
+
+
+def _drain(rows):
+    for _ in rows:
+        pass
+
+
+def build_workload(ids, rng):
+    """
+    The twelve operations as (name, callable(pool)) pairs. Reads call the
+    operations layer with the cache bypassed; writes run the same statements
+    as the operations layer inside a transaction that is rolled back.
+    """
+    def recruit(cursor):
+        operations.insert_personnel(cursor, 'Bench', 'Recruit', 'Grunt', None)
+
+    def assign(cursor):
+        personnel_id = rng.randint(1, ids.personnel)
+        operations.lock_serving_personnel(cursor, personnel_id)
+        # INSERT IGNORE: a random pair may already exist in the dataset.
+        cursor.execute(operations.INSERT_OWNERSHIP_SQL.replace('INSERT', 'INSERT IGNORE', 1),
+                       (personnel_id, rng.randint(1, ids.pokemon)))
+
+    def mission_status(cursor):
+        cursor.execute(operations.mission_status_sql('Completed'), ('Completed', rng.randint(1, ids.missions)))
+
+    def pokemon_stats(cursor):
+        cursor.execute(operations.UPDATE_POKEMON_STATS_SQL,
+                       (rng.randint(20, 255), rng.randint(5, 190), rng.randint(5, 230), rng.randint(1, ids.pokemon)))
+
+    def fire(cursor):
+        # Grunts never appear in EXPERIMENTATION_EVENT (ON DELETE RESTRICT), so the cascade always succeeds.
+        cursor.execute(operations.DELETE_PERSONNEL_SQL, (rng.randint(ids.first_grunt, ids.last_grunt),))
+
+    return [
+        ('show_active_missions', lambda pool: _drain(operations.iter_active_missions(pool))),
+        ('calculate_pending_mission_risk', lambda pool: operations.fetch_pending_mission_risk(pool, use_cache=False)),
+        ('find_top_performing_personnel', lambda pool: operations.fetch_top_performing_personnel(pool, 5, use_cache=False)),
+        ('list_unassigned_assets', lambda pool: _drain(operations.iter_unassigned_assets(pool))),
+        ('analyze_pokemon_stats_by_type', lambda pool: operations.fetch_pokemon_stats_by_type(pool, use_cache=False)),
+        ('find_trainers_with_high_notoriety_no_mission', lambda pool: _drain(operations.iter_untargeted_trainers(pool, 500))),
+        ('mission_success_rate_by_base', lambda pool: operations.fetch_mission_success_rate_by_base(pool, use_cache=False)),
+        ('recruit_new_personnel', lambda pool: _rolled_back(pool, recruit)),
+        ('assign_pokemon_to_personnel', lambda pool: _rolled_back(pool, assign)),
+        ('update_mission_status', lambda pool: _rolled_back(pool, mission_status)),
+        ('update_pokemon_stats', lambda pool: _rolled_back(pool, pokemon_stats)),
+        ('fire_personnel', lambda pool: _rolled_back(pool, fire)),
+    ]
+
+
+def measure(pool, name, func, iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP, probe_cost=0):
+    """
+    Times `iterations` calls of func(pool) after `warmup` untimed calls. The
+    pool must hold a single connection so the session counters cover every call.
+    """
+    for _ in range(warmup):
+        func(pool)
+
+    with pool.connection() as connection:
+        reads_before = _handler_reads(connection)
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        func(pool)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+
+    with pool.connection() as connection:
+        rows_read = _handler_reads(connection) - reads_before - probe_cost
+
+    latencies.sort()
+    return {
+        'operation': name,
+        'iterations': iterations,
+        'p50_ms': round(_percentile(latencies, 50), 3),
+        'p95_ms': round(_percentile(latencies, 95), 3),
+        'p99_ms': round(_percentile(latencies, 99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'max_ms': round(latencies[-1], 3),
+        'throughput_ops_s': round(iterations / elapsed, 2) if elapsed > 0 else None,
+        # Only MySQL has the Handler_read_* counters.
+        'rows_read_per_op': round(max(rows_read, 0) / iterations, 1) if pool.dialect == 'mysql' else None,
+        'peak_rss_kb': _peak_rss_kb(),
+    }
+
+
+def _probe_cost(pool):
+    """Handler reads caused by SHOW SESSION STATUS itself, subtracted from each measurement."""
+    with pool.connection() as connection:
+        first = _handler_reads(connection)
+        second = _handler_reads(connection)
+    return second - first
+
+
+def _server_version(pool):
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute("SELECT VERSION() AS Version")
+        return cursor.fetchone()['Version']
+
+
+def run_benchmarks(pool, label, iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP, seed=42, only=None):
+    """Runs the workload once against whatever data `pool` currently points at."""
+    if iterations < 1:
+        raise ValueError("iterations must be at least 1")
+    workload = build_workload(_Ids(pool), random.Random(seed))
+    if only:
+        unknown = set(only) - {name for name, _ in workload}
+        if unknown:
+            raise ValueError(f"Unknown operation(s): {', '.join(sorted(unknown))}")
+        workload = [(name, func) for name, func in workload if name in only]
+
+    probe_cost = _probe_cost(pool)
+    results = []
+    for name, func in workload:
+        result = measure(pool, name, func, iterations, warmup, probe_cost)
+        result['scale'] = label
+        results.append(result)
+    return results
+
+
+def run_suite(pool, scales=None, load=False, seed=42, iterations=DEFAULT_ITERATIONS,
+              warmup=DEFAULT_WARMUP, only=None, load_method='infile'):
+    """
+    Benchmarks every scale in `scales` (each generated and loaded first when
+    `load` is set, replacing the database contents) or, without scales, the
+    data already loaded. Returns the JSON-ready report.
+    """
+    # One connection, so the session's Handler_read_* counters cover every call.
+    bench_pool = pool.clone(max_size=1)
+    report = {
+        'meta': {
+            'started_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'backend': pool.dialect,
+            'server_version': None,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'iterations': iterations,
+            'warmup': warmup,
+            'seed': seed,
+        },
+        'results': [],
+    }
+    try:
+        report['meta']['server_version'] = _server_version(bench_pool)
+        if not scales:
+            report['results'] += run_benchmarks(bench_pool, 'current', iterations, warmup, seed, only)
+            return report
+
+        for scale in scales:
+            personnel = datagen.parse_scale(scale)
+            if load:
+                data_dir = datagen.default_data_dir(personnel, seed)
+                datagen.print_manifest(datagen.generate_dataset(data_dir, personnel, seed))
+                for _ in datagen.load_dataset(bench_pool, data_dir, method=load_method, truncate=True):
+                    pass
+            report['results'] += run_benchmarks(bench_pool, scale, iterations, warmup, seed, only)
+        return report
+    finally:
+        bench_pool.close()
+
+
+def compare(report, baseline, metric=DEFAULT_METRIC, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares `report` against `baseline` on `metric`. Returns one row per
+    (scale, operation) present in both, flagging those slower than
+    (1 + threshold) x baseline.
+    """
+    previous = {(r['scale'], r['operation']): r for r in baseline.get('results', [])}
+    rows = []
+    for result in report['results']:
+        before = previous.get((result['scale'], result['operation']))
+        if before is None or before.get(metric) in (None, 0) or result.get(metric) is None:
+            continue
+        ratio = result[metric] / before[metric]
+        rows.append({
+            'scale': result['scale'],
+            'operation': result['operation'],
+            'metric': metric,
+            'baseline': before[metric],
+            'current': result[metric],
+            'ratio': round(ratio, 3),
+            'regressed': ratio > 1 + threshold,
+        })
+    return rows
+
+
+def write_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def read_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
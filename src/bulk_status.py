@@ -0,0 +1,145 @@
+"""
+Bulk Mission Status Transitions (bulk_status.py)
+Moves every mission matching a filter to a new status, in Mission_ID chunks
+with one short transaction per chunk, so thousands of missions can be closed
+without a commit per row or one long UPDATE that holds its row locks for the
+whole run. Runs can be previewed with a dry run and resumed after an
+interruption from --after-id or a checkpoint file.
+
+    python3 main_app.py bulk-set-mission-status --status Aborted --from-status Pending --trainer-id 42 --dry-run
+    python3 main_app.py bulk-set-mission-status --status Completed --from-status Active --base-id 3 --checkpoint close_base3.json
+"""
+
+import os
+import json
+import time
+
+import operations
+from cache import result_cache
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Filter name -> (SQL condition on MISSION m, how many times the value is bound).
+FILTERS = {
+    'from_status': ("m.`Status` IN ({placeholders})", None),
+    'trainer_id': ("m.Target_Trainer_ID = %s", 1),
+    'base_id': ("EXISTS (SELECT 1 FROM MISSION_ASSIGNMENT ma JOIN PERSONNEL p ON p.Personnel_ID = ma.Personnel_ID "
+                "WHERE ma.Mission_ID = m.Mission_ID AND p.Base_ID = %s)", 1),
+    'started_before': ("m.StartDate < %s", 1),
+    'started_after': ("m.StartDate >= %s", 1),
+}
+
+CHUNK_IDS_SQL = "SELECT m.Mission_ID FROM MISSION m WHERE m.Mission_ID > %s AND {where} ORDER BY m.Mission_ID LIMIT %s"
+COUNT_SQL = "SELECT COUNT(*) AS Matched, MIN(m.Mission_ID) AS First_ID, MAX(m.Mission_ID) AS Last_ID FROM MISSION m WHERE m.Mission_ID > %s AND {where}"
+# Same SET clause as the single-mission path (operations.mission_status_sql); the
+# filter is re-applied so rows changed since the chunk was read are left alone.
+# SET columns stay unqualified, which SQLite (sqlite_backend.py) requires.
+BULK_UPDATE_SQL = "UPDATE MISSION m SET `Status` = %s{end_date_sql} WHERE m.Mission_ID IN ({ids}) AND {where}"
+
+
+def build_filter(new_status, filters):
+    """
+    Returns (where_sql, params) for missions that match `filters` and are not
+    already in `new_status`. Closing transitions skip missions that start in
+    the future, since an EndDate of today would violate the EndDate >= StartDate check.
+    """
+    clauses, params = ["m.`Status` <> %s"], [new_status]
+    for name, value in filters.items():
+        if value is None:
+            continue
+        condition, binds = FILTERS[name]
+        if name == 'from_status':
+            statuses = [operations.normalize_mission_status(s) for s in value]
+            clauses.append(condition.format(placeholders=', '.join(['%s'] * len(statuses))))
+            params += statuses
+        else:
+            clauses.append(condition)
+            params += [value] * binds
+    if len(clauses) == 1:
+        raise ValueError("Refusing to transition every mission; give at least one filter.")
+    if new_status in operations.CLOSED_MISSION_STATUSES:
+        clauses.append("(m.StartDate IS NULL OR m.StartDate <= CURDATE())")
+    return " AND ".join(clauses), params
+
+
+# --- Checkpoints ---
+
+def _load_checkpoint(path, signature):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    if checkpoint.get('signature') != signature:
+        raise ValueError(f"Checkpoint {path} belongs to a different transition; remove it or pick another file.")
+    return checkpoint['last_id']
+
+
+def _save_checkpoint(path, signature, last_id):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'signature': signature, 'last_id': last_id}, f)
+    os.replace(tmp, path)  # atomic, so an interruption never leaves a torn file
+
+
+# --- Transition ---
+
+def count_matches(pool, new_status, filters, after_id=0):
+    """Dry run: how many missions the transition would touch, and their ID range."""
+    where, params = build_filter(new_status, filters)
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute(COUNT_SQL.format(where=where), (int(after_id), *params))
+        return cursor.fetchone()
+
+
+def transition_missions(pool, new_status, filters, chunk_size=DEFAULT_CHUNK_SIZE, after_id=0,
+                        checkpoint=None, pause=0.0):
+    """
+    Sets `new_status` (and EndDate for closing statuses) on every matching
+    mission with Mission_ID > after_id, one committed chunk at a time. Yields
+    {'Chunk', 'First_ID', 'Last_ID', 'Updated', 'Seconds'} per chunk. With
+    `checkpoint`, progress is saved after each commit and picked up again on
+    the next run; the file is removed once the transition completes.
+    """
+    new_status = operations.normalize_mission_status(new_status)
+    chunk_size = int(chunk_size)
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    if filters.get('from_status'):
+        filters = {**filters, 'from_status': sorted(map(operations.normalize_mission_status, filters['from_status']))}
+    where, params = build_filter(new_status, filters)
+    # Round-tripped through JSON so it compares equal to the one read back from the file.
+    signature = json.loads(json.dumps({'status': new_status, 'filters': {k: v for k, v in filters.items() if v is not None}},
+                                      default=str, sort_keys=True))
+    resumed = _load_checkpoint(checkpoint, signature)
+    last_id = max(int(after_id), resumed or 0)
+
+    select_sql = CHUNK_IDS_SQL.format(where=where)
+    chunk = 0
+    while True:
+        started = time.monotonic()
+        with pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(select_sql, (last_id, *params, chunk_size))
+                ids = [row['Mission_ID'] for row in cursor.fetchall()]
+                if not ids:
+                    break
+                update_sql = BULK_UPDATE_SQL.format(
+                    end_date_sql=operations.mission_end_date_sql(new_status),
+                    ids=', '.join(['%s'] * len(ids)), where=where)
+                updated = cursor.execute(update_sql, (new_status, *ids, *params))
+            connection.commit()
+        result_cache.invalidate('MISSION')
+
+        chunk += 1
+        last_id = ids[-1]
+        if checkpoint:
+            _save_checkpoint(checkpoint, signature, last_id)
+        yield {'Chunk': chunk, 'First_ID': ids[0], 'Last_ID': last_id, 'Updated': updated,
+               'Seconds': round(time.monotonic() - started, 3)}
+        if len(ids) < chunk_size:
+            break
+        if pause:
+            time.sleep(pause)  # let queued lock waiters and replicas catch up
+
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
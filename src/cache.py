@@ -0,0 +1,155 @@
+"""
+Query Result Cache (cache.py)
+An in-process LRU cache with TTL for read-report results. Entries are keyed by
+query and parameters and tagged with the tables they read; write operations
+invalidate the tags of the tables they touch once they commit.
+"""
+
+import time
+import threading
+import functools
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 15.0  # seconds; bounds staleness from writers in other processes
+
+
+class QueryCache:
+    """
+    Thread-safe LRU + TTL cache. `get` returns (hit, value); expired entries
+    count as misses and are dropped on access.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = True
+        self._entries = OrderedDict()   # key -> (expires_at, tags, value)
+        self._by_tag = {}               # tag -> set of keys
+        self._generations = {}          # tag -> number of invalidations so far
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _drop(self, key):
+        _, tags, _ = self._entries.pop(key)
+        for tag in tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[2]
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return False, None
+
+    def generation(self, tags):
+        """Snapshot of the invalidation counters for `tags`, taken before a read runs."""
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def put(self, key, value, tags, generation=None):
+        """
+        Stores `value` under `key`. If `generation` is given and any of the tags
+        was invalidated since it was taken, the (possibly stale) value is dropped.
+        """
+        with self._lock:
+            if generation is not None and generation != tuple(self._generations.get(tag, 0) for tag in tags):
+                return
+            if key in self._entries:
+                self._drop(key)
+            tags = frozenset(tags)
+            self._entries[key] = (time.monotonic() + self.ttl, tags, value)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tags):
+        """Drops every entry tagged with any of `tags`. Returns how many were dropped."""
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                keys |= self._by_tag.get(tag, set())
+            for key in keys:
+                self._drop(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+# Process-wide cache shared by the interactive menu, batch runs and reports.
+result_cache = QueryCache()
+
+
+def cached_query(*tables):
+    """
+    Decorator for read operations taking (pool, *params). Results are cached
+    per database, function and parameters, tagged with `tables`. Callers can
+    pass use_cache=False to bypass the cache for one call. Cached rows are
+    shared, so callers must treat them as read-only.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(pool, *args, use_cache=True, **kwargs):
+            if not use_cache or not result_cache.enabled:
+                return func(pool, *args, **kwargs)
+            key = (getattr(pool, 'dsn', id(pool)), func.__name__, args, tuple(sorted(kwargs.items())))
+            hit, value = result_cache.get(key)
+            if hit:
+                return value
+            generation = result_cache.generation(tables)
+            value = func(pool, *args, **kwargs)
+            result_cache.put(key, value, tables, generation)
+            return value
+        wrapper.cache_tables = tables
+        return wrapper
+    return decorator
+
+
+def invalidates(*tables):
+    """
+    Decorator for write operations: once the wrapped call returns (i.e. its
+    transaction committed), cached results that read any of `tables` are dropped.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            result_cache.invalidate(*tables)
+            return result
+        wrapper.invalidated_tables = tables
+        return wrapper
+    return decorator
@@ -0,0 +1,122 @@
+"""
+Daemon Client (client.py)
+Thin client for the warm daemon (see server.py). It needs only the standard
+library, so it starts in a fraction of the time of main_app.py and never
+touches the database itself. Commands and flags are the headless ones; the
+output is the same JSON lines or CSV.
+
+Examples:
+    python3 client.py active-missions
+    python3 client.py --format csv base-success-rate
+    python3 client.py --socket /tmp/chimera.sock set-mission-status --mission-id 7 --status Completed
+    python3 client.py --url http://127.0.0.1:8765 stats
+
+`health`, `stats` and `metrics` query the daemon itself. Exit status: 0 on
+success, 1 when the command failed or the daemon could not be reached.
+"""
+
+import os
+import sys
+import csv
+import json
+import socket
+import argparse
+import http.client
+from urllib.parse import urlsplit
+
+DEFAULT_SOCKET = '/tmp/chimera.sock'
+ENV_SOCKET = 'CHIMERA_SOCKET'
+ENV_URL = 'CHIMERA_URL'
+DAEMON_COMMANDS = {'health': '/health', 'stats': '/stats', 'metrics': '/metrics'}
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket."""
+
+    def __init__(self, path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def _connect(args):
+    url = args.url or (None if args.socket else os.environ.get(ENV_URL))
+    if url:
+        parts = urlsplit(url)
+        return http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=args.timeout)
+    return UnixHTTPConnection(args.socket or os.environ.get(ENV_SOCKET) or DEFAULT_SOCKET, timeout=args.timeout)
+
+
+def _write_rows(lines, fmt, out):
+    """Writes the streamed rows and returns the trailer (None if the stream was cut off)."""
+    csv_writer = csv.writer(out) if fmt == 'csv' else None
+    csv_columns = None
+    for line in lines:
+        row = json.loads(line)
+        if row.get('_end'):
+            return row
+        if csv_writer is None:
+            out.write(line.decode('utf-8'))
+            continue
+        columns = list(row)
+        if columns != csv_columns:
+            csv_writer.writerow(columns)
+            csv_columns = columns
+        csv_writer.writerow([row[column] for column in columns])
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='client.py', description="Send a headless command to a running Chimera DB daemon.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--socket', help=f"Daemon Unix socket (env {ENV_SOCKET}, default {DEFAULT_SOCKET})")
+    target.add_argument('--url', help=f"Daemon HTTP address, e.g. http://127.0.0.1:8765 (env {ENV_URL})")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl', help="Output format (default jsonl)")
+    parser.add_argument('--timeout', type=float, default=None, help="Seconds to wait on the daemon (default no limit)")
+    parser.add_argument('command', help="A headless command, or health / stats / metrics")
+    parser.add_argument('arguments', nargs=argparse.REMAINDER, help="The command's own flags")
+    args = parser.parse_args(argv)
+
+    connection = _connect(args)
+    try:
+        if args.command in DAEMON_COMMANDS and not args.arguments:
+            connection.request('GET', DAEMON_COMMANDS[args.command])
+            response = connection.getresponse()
+            body = response.read().decode('utf-8')
+            sys.stdout.write(body if args.command == 'metrics' else json.dumps(json.loads(body), indent=2) + "\n")
+            return 0 if response.status == 200 else 1
+
+        payload = json.dumps({'argv': [args.command] + args.arguments})
+        connection.request('POST', '/run', body=payload, headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        if response.status != 200:
+            print(f"[ERROR] {json.loads(response.read() or b'{}').get('error', response.reason)}", file=sys.stderr)
+            return 1
+        trailer = _write_rows(response, args.format, sys.stdout)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        return 1  # output consumer (e.g. head) stopped reading
+    except (OSError, http.client.HTTPException, ValueError) as e:
+        print(f"[ERROR] Could not talk to the daemon: {e}", file=sys.stderr)
+        return 1
+    finally:
+        connection.close()
+
+    if trailer is None:
+        print("[ERROR] The daemon closed the connection before the command finished.", file=sys.stderr)
+        return 1
+    sys.stderr.write(trailer['stderr'])
+    if not trailer['ok']:
+        print(f"[ERROR] {trailer['error']}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Operations Dashboard (dashboard.py)
+Runs the read reports concurrently, one connection per report, so the morning
+status check takes as long as the slowest report instead of the sum of all
+seven. Every worker opens a REPEATABLE READ consistent snapshot and waits at
+a barrier until all snapshots are open before running its report; results
+are yielded as each report finishes, and a report that exceeds its timeout
+has its query killed without holding up the others.
+
+    python3 main_app.py dashboard
+    python3 main_app.py dashboard --report pending-risk --report base-success-rate --timeout 5
+"""
+
+import time
+import threading
+import itertools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import pymysql
+
+import metrics
+import operations
+from db import PinnedPool
+
+DEFAULT_TIMEOUT = 30.0       # seconds per report, counted from the dashboard start
+DEFAULT_MIN_SCORE = 500      # notoriety threshold for untargeted-trainers
+DEFAULT_LIMIT = 5            # rows for top-personnel
+SNAPSHOT_BARRIER_TIMEOUT = 10.0
+
+
+def _limited(rows, max_rows):
+    return list(rows if max_rows is None else itertools.islice(rows, max_rows))
+
+
+# Report name -> callable(pool, options) returning rows. The list reports
+# stream, so max_rows stops them early instead of fetching everything.
+REPORTS = {
+    'active-missions': lambda pool, o: _limited(operations.iter_active_missions(pool), o['max_rows']),
+    'pending-risk': lambda pool, o: [operations.fetch_pending_mission_risk(pool, use_cache=False)],
+    'top-personnel': lambda pool, o: operations.fetch_top_performing_personnel(pool, o['limit'], use_cache=False),
+    'unassigned-assets': lambda pool, o: _limited(operations.iter_unassigned_assets(pool), o['max_rows']),
+    'pokemon-type-stats': lambda pool, o: operations.fetch_pokemon_stats_by_type(pool, use_cache=False),
+    'untargeted-trainers': lambda pool, o: _limited(operations.iter_untargeted_trainers(pool, o['min_score']),
+                                                    o['max_rows']),
+    'base-success-rate': lambda pool, o: operations.fetch_mission_success_rate_by_base(pool, use_cache=False),
+}
+
+
+def _open_snapshot(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+
+
+def _run_report(pool, name, options, barrier, thread_ids):
+    """Worker: borrow a connection, open the snapshot, line up with the others, run."""
+    connection = pool.acquire()
+    discard = True
+    try:
+        thread_ids[name] = connection.thread_id()
+        _open_snapshot(connection)
+        try:
+            barrier.wait(SNAPSHOT_BARRIER_TIMEOUT)
+        except threading.BrokenBarrierError:
+            pass  # A worker failed to start; the rest still run, just less aligned.
+
+        pinned = PinnedPool(connection, pool.dsn)
+        started = time.perf_counter()
+        with metrics.command(f"dashboard:{name}"):
+            rows = list(REPORTS[name](pinned, options))
+        seconds = time.perf_counter() - started
+        discard = pinned.discarded
+        return rows, seconds
+    finally:
+        pool.release(connection, discard=discard)
+
+
+def _kill_query(control_pool, thread_id):
+    """Aborts the statement running on another session (KILL QUERY)."""
+    connection = control_pool.connect_unpooled()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("KILL QUERY %s", (int(thread_id),))
+    except pymysql.Error:
+        pass  # The query finished in the meantime.
+    finally:
+        connection.close()
+
+
+def run_dashboard(pool, names=None, timeout=DEFAULT_TIMEOUT, report_timeouts=None,
+                  min_score=DEFAULT_MIN_SCORE, limit=DEFAULT_LIMIT, max_rows=None, lock_snapshot=False):
+    """
+    Runs the chosen reports (default: all) concurrently on a dedicated pool with
+    one connection each. Yields one dict per report as it finishes: Report,
+    Status ('ok', 'error' or 'timeout'), Seconds, Rows (list or None), Error.
+
+    `report_timeouts` overrides `timeout` per report name. With lock_snapshot,
+    FLUSH TABLES WITH READ LOCK is held while the snapshots open so they are
+    identical (needs the RELOAD privilege and briefly blocks writers).
+    """
+    names = list(names or REPORTS)
+    unknown = [name for name in names if name not in REPORTS]
+    if unknown:
+        raise ValueError(f"Unknown report(s): {', '.join(unknown)}")
+    report_timeouts = report_timeouts or {}
+    options = {'min_score': int(min_score), 'limit': int(limit), 'max_rows': max_rows}
+
+    workers = pool.clone(max_size=len(names))
+    executor = ThreadPoolExecutor(max_workers=len(names), thread_name_prefix='dashboard')
+    thread_ids = {}
+    lock_connection = None
+    # The coordinator joins the barrier only when it has to release the global lock.
+    barrier = threading.Barrier(len(names) + (1 if lock_snapshot else 0))
+    start = time.monotonic()
+    timed_out = False
+    try:
+        if lock_snapshot:
+            lock_connection = pool.connect_unpooled()
+            with lock_connection.cursor() as cursor:
+                cursor.execute("FLUSH TABLES WITH READ LOCK")
+
+        futures = {executor.submit(_run_report, workers, name, options, barrier, thread_ids): name for name in names}
+        deadlines = {future: start + report_timeouts.get(name, timeout) for future, name in futures.items()}
+
+        if lock_connection is not None:
+            try:
+                barrier.wait(SNAPSHOT_BARRIER_TIMEOUT)
+            except threading.BrokenBarrierError:
+                pass
+            finally:
+                with lock_connection.cursor() as cursor:
+                    cursor.execute("UNLOCK TABLES")
+
+        pending = set(futures)
+        while pending:
+            done, _ = wait(pending, timeout=max(0.0, min(deadlines[f] for f in pending) - time.monotonic()),
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                name = futures[future]
+                try:
+                    rows, seconds = future.result()
+                    yield {'Report': name, 'Status': 'ok', 'Seconds': round(seconds, 3), 'Rows': rows, 'Error': None}
+                except (pymysql.Error, ValueError) as e:
+                    yield {'Report': name, 'Status': 'error', 'Seconds': round(time.monotonic() - start, 3),
+                           'Rows': None, 'Error': str(e)}
+
+            now = time.monotonic()
+            for future in [f for f in pending if deadlines[f] <= now]:
+                pending.discard(future)
+                name = futures[future]
+                timed_out = True
+                if name in thread_ids:
+                    _kill_query(pool, thread_ids[name])
+                yield {'Report': name, 'Status': 'timeout', 'Seconds': round(now - start, 3), 'Rows': None,
+                       'Error': f"No result within {report_timeouts.get(name, timeout):g}s; query killed."}
+    finally:
+        if lock_connection is not None:
+            lock_connection.close()
+        # Killed reports unwind on their own; don't wait for them.
+        executor.shutdown(wait=not timed_out, cancel_futures=True)
+        workers.close()
@@ -0,0 +1,409 @@
+"""
+Synthetic Data Generator (datagen.py)
+Generates a seeded, deterministic chimera_db dataset at any scale and bulk
+loads it. Every FK, CHECK and ENUM in schema.sql is respected, including the
+BOSS/GRUNT/SCIENTIST split of PERSONNEL, the circular BASE <-> PERSONNEL link
+and the composite keys of FIELD_ENGAGEMENT and EXPERIMENTATION_EVENT.
+
+Rows are streamed straight to one tab-separated file per table and loaded with
+LOAD DATA LOCAL INFILE (or multi-row INSERTs), with FK and unique checks off.
+
+    python3 main_app.py generate-data --personnel 1M --seed 7 --load --truncate
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import datetime
+
+import pymysql
+
+import summaries
+import mission_archive
+import personnel_archive
+
+# --- Table Layout ---
+# Load order also satisfies the FKs, so the INSERT path works with checks on.
+
+TABLE_COLUMNS = {
+    'TRAINER': ('Trainer_ID', 'Name', 'Affiliation', 'NotorietyScore'),
+    'RESEARCH_PROJECT': ('Project_ID', 'Title', '`Status`', 'StartDate', 'EndDate'),
+    'ASSET': ('Asset_Code', 'Asset_Type', 'Value_Estimate'),
+    'SERUM': ('Serum_ID', 'Serum_Name', 'Formula_Code', 'Target_Effect'),
+    'PERSONNEL': ('Personnel_ID', 'FName', 'LName', '`Rank`', 'StartDate', 'Base_ID'),
+    'POKEMON': ('Pokemon_ID', 'Name', 'HP', 'Attack', 'Defense', 'Project_ID'),
+    'BOSS': ('Boss_Personnel_ID', 'Region_Managed'),
+    'BASE': ('Base_ID', 'Name', 'Location', '`Status`', 'Boss_ID'),
+    'SQUADS': ('Squad_ID', 'Boss_ID'),
+    'GRUNT': ('Grunt_Personnel_ID', 'Squad_ID'),
+    'SCIENTIST': ('Scientist_Personnel_ID', 'Specialization', 'Project_ID'),
+    'POKEMON_TYPE': ('Pokemon_ID', 'Type'),
+    'EXPERIMENTAL_LOG': ('Project_ID', 'Log_ID', 'Objective', '`Status`', 'StartDate'),
+    'MISSION': ('Mission_ID', 'Objective', '`Status`', 'StartDate', 'EndDate', 'Target_Trainer_ID'),
+    'ASSIGNED_TO': ('Personnel_ID', 'Mission_ID'),
+    'MISSION_ASSIGNMENT': ('Mission_ID', 'Personnel_ID', 'Role', 'AssignedDate', '`Status`'),
+    'MISSION_ASSETS': ('Mission_ID', 'Asset_Code', 'Acquisition_Status'),
+    'OWNERSHIP': ('Personnel_ID', 'Pokemon_ID'),
+    'FIELD_ENGAGEMENT': ('Grunt_Personnel_ID', 'Trainer_ID', 'Mission_ID', 'Pokemon_ID'),
+    'EXPERIMENTATION_EVENT': ('Scientist_Personnel_ID', 'Serum_ID', 'Pokemon_ID', 'Project_ID'),
+}
+
+# --- Vocabulary ---
+
+FIRST_NAMES = ('Silas', 'Serena', 'Marcus', 'Aris', 'Evelyn', 'Kenji', 'Elara', 'Felix', 'Gideon', 'Inara',
+               'Jonas', 'Lyra', 'Milo', 'Nadia', 'Orion', 'Kai', 'Ria', 'Jax', 'Anya', 'Bram', 'Cora', 'Dax',
+               'Ezra', 'Faye', 'Garrus', 'Hana', 'Ivan', 'Jett', 'Kara', 'Leon')
+LAST_NAMES = ('Vane', 'Kross', 'Grave', 'Thorne', 'Reed', 'Nomura', 'Vance', 'Hale', 'Marr', 'Sol', 'Wren',
+              'Kane', 'Payne', 'Black', 'Stone', 'Ash', 'Frost', 'Crow', 'Steel', 'Moss')
+AFFILIATIONS = ('Kanto League', 'Johto League', 'Hoenn League', 'Sinnoh League', 'Unova League',
+                'Kalos League', 'Galar League', 'Paldea League', 'Independent', 'Unknown')
+REGIONS = ('Kanto', 'Johto', 'Hoenn', 'Sinnoh', 'Unova', 'Kalos', 'Alola', 'Galar', 'Paldea')
+SPECIALIZATIONS = ('Genetic Engineering', 'Biochemistry', 'Cloning', 'Marine Biology', 'Physics',
+                   'Data Science', 'Robotics', 'Paleontology', 'Weaponry')
+POKEMON_NAMES = ('Mewtwo', 'Rattata', 'Pidgey', 'Zubat', 'Ekans', 'Gyarados', 'Arcanine', 'Machamp',
+                 'Alakazam', 'Gengar', 'Onix', 'Weezing', 'Tauros', 'Lapras', 'Snorlax', 'Dragonite')
+POKEMON_TYPES = ('Normal', 'Fire', 'Water', 'Electric', 'Grass', 'Ice', 'Fighting', 'Poison', 'Ground',
+                 'Flying', 'Psychic', 'Bug', 'Rock', 'Ghost', 'Dragon', 'Dark', 'Steel', 'Fairy')
+ASSET_TYPES = ('Stealth Helicopter', 'Scout Drone', 'Combat Drone', 'Armored Transport Truck',
+               'Genetic Sequencer', 'EM Pulse Generator', 'Data Encryption Node', 'Vibranium-Alloy Safe')
+MISSION_VERBS = ('Capture', 'Ambush', 'Steal', 'Disrupt', 'Infiltrate', 'Sabotage', 'Escort', 'Survey')
+MISSION_TARGETS = ('Legendary Pokemon', 'research data', 'Gym Leader', 'Master Ball prototype',
+                   'Silph Co. keycard', 'Safari Zone subjects', 'League meeting', 'fossil samples')
+ROLES = ('Field Leader', 'Field Operative', 'Infiltrator', 'Saboteur', 'Lookout', 'Driver', 'Analyst')
+
+PROJECT_STATUSES = ('Planning', 'Active', 'On Hold', 'Completed', 'Cancelled')
+BASE_STATUSES = ('Active', 'Inactive', 'Under Construction', 'Destroyed')
+ASSIGNMENT_STATUSES = ('Assigned', 'Engaged', 'Battle Lost', 'Travelling')
+ACQUISITION_STATUSES = ('Pending', 'Acquired', 'Lost', 'Returned')
+LOG_STATUSES = ('Planned', 'In Progress', 'Successful', 'Failed', 'Cancelled')
+
+# Mission status mix: most history is closed, a minority is live work.
+MISSION_STATUS_WEIGHTS = (('Pending', 15), ('Active', 10), ('Completed', 55), ('Failed', 12), ('Aborted', 8))
+
+EPOCH = datetime.date(2015, 1, 1)
+DATE_SPAN_DAYS = 11 * 365
+
+LOAD_BATCH_ROWS = 5000  # rows per multi-row INSERT on the fallback path
+
+
+# --- Scale ---
+
+def parse_scale(text):
+    """Parses '10k', '1M', '2.5m' or '10000' into an integer row count."""
+    text = str(text).strip().lower().replace('_', '')
+    multiplier = 1
+    if text.endswith('k'):
+        multiplier, text = 1_000, text[:-1]
+    elif text.endswith('m'):
+        multiplier, text = 1_000_000, text[:-1]
+    try:
+        value = int(float(text) * multiplier)
+    except ValueError:
+        raise ValueError(f"Invalid scale '{text}'. Use e.g. 10k, 1M or 10000.") from None
+    if value < 10:
+        raise ValueError("Scale must be at least 10 personnel.")
+    return value
+
+
+def plan_counts(personnel):
+    """Derives every table's size from the personnel count."""
+    bosses = max(3, personnel // 500)
+    scientists = max(1, personnel * 15 // 100)
+    return {
+        'personnel': personnel,
+        'bosses': bosses,                      # one base per boss (BASE.Boss_ID is UNIQUE)
+        'scientists': scientists,
+        'grunts': personnel - bosses - scientists,
+        'squads': max(1, (personnel - bosses - scientists) // 10),
+        'trainers': max(30, personnel // 2),
+        'projects': max(10, personnel // 1000),
+        'serums': max(30, personnel // 2000),
+        'assets': max(30, personnel // 5),
+        'pokemon': max(30, personnel * 2),
+        'missions': max(20, personnel // 2),
+        'logs': max(10, personnel // 20),
+        'events': max(10, personnel // 10),
+    }
+
+
+# --- Row Generation ---
+
+def _date(rng, start=None, max_days=DATE_SPAN_DAYS):
+    base = start or EPOCH
+    return base + datetime.timedelta(days=rng.randrange(max_days))
+
+
+def _tsv_field(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, str):
+        return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+    return str(value)
+
+
+class _TableWriter:
+    """Streams rows for every table into <out_dir>/<TABLE>.tsv and counts them."""
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.counts = {}
+        self._files = {}
+
+    def write(self, table, row):
+        f = self._files.get(table)
+        if f is None:
+            f = self._files[table] = open(os.path.join(self.out_dir, f"{table}.tsv"), 'w', encoding='utf-8', newline='\n')
+            self.counts[table] = 0
+        f.write('\t'.join(_tsv_field(v) for v in row) + '\n')
+        self.counts[table] += 1
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+
+def _generate(rng, counts, out):
+    n = counts
+    bosses, scientists = n['bosses'], n['scientists']
+    first_scientist, first_grunt = bosses + 1, bosses + scientists + 1
+    personnel = n['personnel']
+
+    for trainer_id in range(1, n['trainers'] + 1):
+        # A long tail: most trainers are minor, a few are champions.
+        score = min(1500, int((rng.paretovariate(1.5) - 1) * 150))
+        out.write('TRAINER', (trainer_id, f"{rng.choice(FIRST_NAMES)} #{trainer_id}",
+                              rng.choice(AFFILIATIONS), score))
+
+    for project_id in range(1, n['projects'] + 1):
+        start = _date(rng)
+        status = rng.choice(PROJECT_STATUSES)
+        end = start + datetime.timedelta(days=rng.randrange(1, 900)) if status in ('Completed', 'Cancelled') else None
+        out.write('RESEARCH_PROJECT', (project_id, f"Project {project_id:07d}", status, start, end))
+
+    for i in range(1, n['assets'] + 1):
+        value = None if rng.random() < 0.02 else round(rng.lognormvariate(11, 1.5), 2)
+        out.write('ASSET', (f"AST-{i:08d}", rng.choice(ASSET_TYPES), value))
+
+    for serum_id in range(1, n['serums'] + 1):
+        out.write('SERUM', (serum_id, f"Serum {serum_id:06d}", f"FOR-{serum_id:08d}", "Synthetic compound."))
+
+    # PERSONNEL ids are laid out as [bosses | scientists | grunts]; boss i runs base i.
+    for personnel_id in range(1, personnel + 1):
+        if personnel_id < first_scientist:
+            rank, base_id = 'Boss', personnel_id
+        else:
+            rank = 'Scientist' if personnel_id < first_grunt else 'Grunt'
+            base_id = None if rng.random() < 0.05 else rng.randint(1, bosses)
+        out.write('PERSONNEL', (personnel_id, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rank,
+                                _date(rng), base_id))
+
+    for pokemon_id in range(1, n['pokemon'] + 1):
+        project_id = rng.randint(1, n['projects']) if rng.random() < 0.3 else None
+        out.write('POKEMON', (pokemon_id, rng.choice(POKEMON_NAMES), rng.randint(20, 255),
+                              rng.randint(5, 190), rng.randint(5, 230), project_id))
+        for type_name in rng.sample(POKEMON_TYPES, 1 if rng.random() < 0.6 else 2):
+            out.write('POKEMON_TYPE', (pokemon_id, type_name))
+
+    for boss_id in range(1, bosses + 1):
+        out.write('BOSS', (boss_id, rng.choice(REGIONS)))
+        out.write('BASE', (boss_id, f"Base {boss_id:05d}", f"{rng.choice(REGIONS)} sector {boss_id}",
+                           rng.choice(BASE_STATUSES), boss_id))
+
+    for squad_id in range(1, n['squads'] + 1):
+        out.write('SQUADS', (squad_id, rng.randint(1, bosses)))
+    for grunt_id in range(first_grunt, personnel + 1):
+        squad_id = None if rng.random() < 0.1 else rng.randint(1, n['squads'])
+        out.write('GRUNT', (grunt_id, squad_id))
+    for scientist_id in range(first_scientist, first_grunt):
+        project_id = None if rng.random() < 0.2 else rng.randint(1, n['projects'])
+        out.write('SCIENTIST', (scientist_id, rng.choice(SPECIALIZATIONS), project_id))
+
+    # Log_IDs are sequential within each project (composite key).
+    per_project = max(1, n['logs'] // n['projects'])
+    for project_id in range(1, n['projects'] + 1):
+        for log_id in range(1, rng.randint(1, 2 * per_project) + 1):
+            started = datetime.datetime.combine(_date(rng), datetime.time(rng.randrange(24), rng.randrange(60)))
+            out.write('EXPERIMENTAL_LOG', (project_id, log_id, f"Trial {log_id} of project {project_id}.",
+                                           rng.choice(LOG_STATUSES), started))
+
+    statuses = [status for status, _ in MISSION_STATUS_WEIGHTS]
+    weights = [weight for _, weight in MISSION_STATUS_WEIGHTS]
+    for mission_id in range(1, n['missions'] + 1):
+        status = rng.choices(statuses, weights)[0]
+        start = _date(rng)
+        end = start + datetime.timedelta(days=rng.randrange(0, 120)) if status in ('Completed', 'Failed', 'Aborted') else None
+        target = None if rng.random() < 0.1 else rng.randint(1, n['trainers'])
+        objective = f"{rng.choice(MISSION_VERBS)} {rng.choice(MISSION_TARGETS)} in {rng.choice(REGIONS)} (op {mission_id})."
+        out.write('MISSION', (mission_id, objective, status, start, end, target))
+
+        team = rng.sample(range(1, personnel + 1), min(personnel, rng.randint(1, 4)))
+        for position, personnel_id in enumerate(team):
+            role = 'Field Leader' if position == 0 else rng.choice(ROLES)
+            out.write('MISSION_ASSIGNMENT', (mission_id, personnel_id, role, start, rng.choice(ASSIGNMENT_STATUSES)))
+            out.write('ASSIGNED_TO', (personnel_id, mission_id))
+            # Grunts on a targeted mission may have engaged the target trainer.
+            if target is not None and personnel_id >= first_grunt and rng.random() < 0.5:
+                pokemon_id = rng.randint(1, n['pokemon']) if rng.random() < 0.9 else None
+                out.write('FIELD_ENGAGEMENT', (personnel_id, target, mission_id, pokemon_id))
+
+        if rng.random() < 0.6:
+            for asset_index in rng.sample(range(1, n['assets'] + 1), rng.randint(1, 2)):
+                out.write('MISSION_ASSETS', (mission_id, f"AST-{asset_index:08d}", rng.choice(ACQUISITION_STATUSES)))
+
+    for personnel_id in range(1, personnel + 1):
+        for pokemon_id in rng.sample(range(1, n['pokemon'] + 1), rng.randint(0, 2)):
+            out.write('OWNERSHIP', (personnel_id, pokemon_id))
+
+    # Event e maps to a unique (scientist, pokemon) pair, which keeps the
+    # 4-column primary key unique without remembering every tuple.
+    stride = 7919 if n['pokemon'] % 7919 else 1
+    events = min(n['events'], scientists * n['pokemon'])
+    for e in range(events):
+        scientist_id = first_scientist + e % scientists
+        pokemon_id = 1 + ((e // scientists) * stride) % n['pokemon']
+        out.write('EXPERIMENTATION_EVENT', (scientist_id, rng.randint(1, n['serums']), pokemon_id,
+                                            rng.randint(1, n['projects'])))
+
+
+def generate_dataset(out_dir, personnel, seed=42):
+    """
+    Writes one <TABLE>.tsv file per table plus manifest.json into `out_dir`.
+    Identical (personnel, seed) pairs always produce identical files, so an
+    existing matching manifest is reused instead of regenerating.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('personnel') == personnel and manifest.get('seed') == seed:
+            return manifest
+
+    started = time.monotonic()
+    writer = _TableWriter(out_dir)
+    try:
+        _generate(random.Random(seed), plan_counts(personnel), writer)
+    finally:
+        writer.close()
+
+    manifest = {
+        'personnel': personnel,
+        'seed': seed,
+        'rows': writer.counts,
+        'generated_seconds': round(time.monotonic() - started, 2),
+    }
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# --- Loading ---
+
+_TSV_UNESCAPES = {'t': '\t', 'n': '\n', '\\': '\\'}
+
+
+def _read_tsv(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            yield [None if v == '\\N' else re.sub(r'\\(.)', lambda m: _TSV_UNESCAPES.get(m.group(1), m.group(1)), v)
+                   for v in fields]
+
+
+def _load_table_infile(cursor, table, path):
+    columns = ', '.join(TABLE_COLUMNS[table])
+    return cursor.execute(
+        f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+        f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({columns})",
+        (path,))
+
+
+def _load_table_insert(cursor, table, path, batch_rows):
+    columns = TABLE_COLUMNS[table]
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    loaded, batch = 0, []
+    for row in _read_tsv(path):
+        batch.append(row)
+        if len(batch) >= batch_rows:
+            # executemany folds the batch into a single multi-row INSERT.
+            loaded += cursor.executemany(sql, batch)
+            batch = []
+    if batch:
+        loaded += cursor.executemany(sql, batch)
+    return loaded
+
+
+def load_dataset(pool, data_dir, method='infile', truncate=False, batch_rows=LOAD_BATCH_ROWS, progress=None):
+    """
+    Bulk loads the files written by generate_dataset() into an empty
+    chimera_db (or one emptied by truncate=True). FK and unique checks are
+    disabled for the load session and each table is committed on its own;
+    summary triggers are skipped and the summary tables rebuilt at the end.
+    Yields one {'Table', 'Rows', 'Seconds'} dict per table as it finishes.
+    """
+    if method not in ('infile', 'insert'):
+        raise ValueError(f"Unknown load method '{method}'")
+    if pool.dialect != 'mysql':
+        method = 'insert'  # LOAD DATA LOCAL INFILE is MySQL-only
+    with open(os.path.join(data_dir, 'manifest.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    connection = pool.connect_unpooled(local_infile=(method == 'infile'))
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SET SESSION foreign_key_checks = 0")
+            cursor.execute("SET SESSION unique_checks = 0")
+            # Per-row summary deltas would dominate the load; the tables are rebuilt once at the end.
+            cursor.execute("SET @skip_summary_triggers = 1")
+
+            if truncate:
+                # The archives name IDs from the old dataset, so they go too.
+                for table in [*reversed(list(TABLE_COLUMNS)), *personnel_archive.ARCHIVE_TABLES,
+                              *mission_archive.HISTORY_TABLES]:
+                    cursor.execute(f"TRUNCATE TABLE {table}")
+            else:
+                cursor.execute("SELECT EXISTS(SELECT 1 FROM PERSONNEL) AS Has_Rows")
+                if cursor.fetchone()['Has_Rows']:
+                    raise ValueError("chimera_db already has data; pass truncate=True (--truncate) to replace it.")
+
+            for table in TABLE_COLUMNS:
+                if table not in manifest['rows']:
+                    continue
+                path = os.path.abspath(os.path.join(data_dir, f"{table}.tsv"))
+                started = time.monotonic()
+                if method == 'infile':
+                    rows = _load_table_infile(cursor, table, path)
+                else:
+                    rows = _load_table_insert(cursor, table, path, batch_rows)
+                connection.commit()
+                yield {'Table': table, 'Rows': rows, 'Seconds': round(time.monotonic() - started, 2)}
+
+            started = time.monotonic()
+            for table, rows in summaries.rebuild_summaries(cursor):
+                yield {'Table': table, 'Rows': rows, 'Seconds': round(time.monotonic() - started, 2)}
+                started = time.monotonic()
+            connection.commit()
+
+            # Fresh statistics so the optimizer plans against the new volumes.
+            cursor.execute(f"ANALYZE TABLE {', '.join(TABLE_COLUMNS)}")
+            cursor.fetchall()
+            cursor.execute("SET SESSION foreign_key_checks = 1")
+            cursor.execute("SET SESSION unique_checks = 1")
+    except pymysql.Error:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def default_data_dir(personnel, seed):
+    return os.path.join('chimera_data', f"personnel_{personnel}_seed_{seed}")
+
+
+def print_manifest(manifest, stream=None):
+    total = sum(manifest['rows'].values())
+    print(f"[INFO] Dataset: {manifest['personnel']} personnel, seed {manifest['seed']}, "
+          f"{total} rows across {len(manifest['rows'])} tables.", file=stream or sys.stderr)
@@ -0,0 +1,277 @@
+"""
+Data-Access Layer (db.py)
+A bounded, health-checked connection pool shared by every command of the
+Chimera DB interface. Commands borrow a connection, use it, and hand it back.
+"""
+
+import sys
+import time
+import queue
+import threading
+from contextlib import contextmanager
+
+import pymysql
+
+from metrics import InstrumentedConnection, InstrumentedDictCursor
+
+# --- Defaults ---
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_CHECKOUT_TIMEOUT = 30.0      # seconds to wait for a free connection
+DEFAULT_PING_INTERVAL = 1.0          # idle seconds after which a checkout pings
+DEFAULT_ISOLATION_LEVEL = 'READ COMMITTED'
+DEFAULT_LOCK_WAIT_TIMEOUT = 10       # seconds (innodb_lock_wait_timeout)
+
+VALID_ISOLATION_LEVELS = ('READ UNCOMMITTED', 'READ COMMITTED', 'REPEATABLE READ', 'SERIALIZABLE')
+
+
+class PoolExhaustedError(pymysql.err.OperationalError):
+    """
+    Raised when no connection becomes free within the checkout timeout.
+    Subclasses pymysql's OperationalError so existing handlers catch it.
+    """
+
+
+# --- Connection Pool ---
+
+class ConnectionPool:
+    """
+    A thread-safe pool of at most `max_size` pymysql connections.
+
+    Every checkout of a connection that sat idle longer than `ping_interval`
+    is pinged first; dead connections are dropped and replaced transparently.
+    Each new connection gets the session settings (isolation level and lock
+    wait timeout) applied once, right after the handshake. Connections and
+    their cursors are instrumented (see metrics.py).
+
+    Other backends subclass it and override the connection hooks
+    (_open_connection, _apply_session_settings, dsn, clone); see sqlite_backend.py.
+    """
+
+    dialect = 'mysql'
+
+    def __init__(self, db_user, db_pass, db_host, db_name,
+                 max_size=DEFAULT_POOL_SIZE,
+                 checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT,
+                 ping_interval=DEFAULT_PING_INTERVAL,
+                 isolation_level=DEFAULT_ISOLATION_LEVEL,
+                 lock_wait_timeout=DEFAULT_LOCK_WAIT_TIMEOUT,
+                 **connect_kwargs):
+        if isolation_level is not None and isolation_level.upper() not in VALID_ISOLATION_LEVELS:
+            raise ValueError(f"Invalid isolation level '{isolation_level}'")
+        self._init_pool(max_size, checkout_timeout, ping_interval, isolation_level, lock_wait_timeout)
+
+        self._connect_kwargs = dict(
+            host=db_host,
+            user=db_user,
+            password=db_pass,
+            database=db_name,
+            cursorclass=InstrumentedDictCursor,
+            autocommit=False,
+        )
+        self._connect_kwargs.update(connect_kwargs)
+
+    def _init_pool(self, max_size, checkout_timeout, ping_interval, isolation_level, lock_wait_timeout):
+        """Pool bookkeeping shared by every backend."""
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.ping_interval = ping_interval
+        self.isolation_level = isolation_level.upper() if isolation_level else None
+        self.lock_wait_timeout = lock_wait_timeout
+
+        # LIFO keeps the most recently used (warmest) connections in play.
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+    @property
+    def dsn(self):
+        """Identifies the target database, e.g. 'localhost/chimera_db'."""
+        return f"{self._connect_kwargs.get('host')}/{self._connect_kwargs.get('database')}"
+
+    # --- Connection lifecycle ---
+
+    def _apply_session_settings(self, connection):
+        with connection.cursor() as cursor:
+            if self.isolation_level:
+                cursor.execute(f"SET SESSION TRANSACTION ISOLATION LEVEL {self.isolation_level}")
+            if self.lock_wait_timeout is not None:
+                cursor.execute("SET SESSION innodb_lock_wait_timeout = %s", (int(self.lock_wait_timeout),))
+
+    def _open_connection(self, **overrides):
+        return InstrumentedConnection(**{**self._connect_kwargs, **overrides})
+
+    def _connect(self):
+        """Opens a new pooled connection and applies the per-session settings."""
+        connection = self._open_connection()
+        try:
+            self._apply_session_settings(connection)
+        except pymysql.Error:
+            connection.close()
+            raise
+        with self._lock:
+            self._created += 1
+        return connection
+
+    def connect_unpooled(self, **overrides):
+        """
+        Opens a dedicated connection with the pool's credentials and session
+        settings plus `overrides` (e.g. local_infile=True). The caller closes it.
+        """
+        connection = self._open_connection(**overrides)
+        try:
+            self._apply_session_settings(connection)
+        except pymysql.Error:
+            connection.close()
+            raise
+        return connection
+
+    def clone(self, **pool_overrides):
+        """
+        A new, empty pool for the same database and session settings, with
+        `pool_overrides` (e.g. max_size=1) applied to the pool options.
+        """
+        connect_kwargs = dict(self._connect_kwargs)
+        options = dict(
+            max_size=self.max_size,
+            checkout_timeout=self.checkout_timeout,
+            ping_interval=self.ping_interval,
+            isolation_level=self.isolation_level,
+            lock_wait_timeout=self.lock_wait_timeout,
+        )
+        options.update(pool_overrides)
+        return ConnectionPool(connect_kwargs.pop('user'), connect_kwargs.pop('password'),
+                              connect_kwargs.pop('host'), connect_kwargs.pop('database'),
+                              **options, **connect_kwargs)
+
+    def _discard(self, connection):
+        with self._lock:
+            self._created -= 1
+        try:
+            connection.close()
+        except pymysql.Error:
+            pass  # Already gone; nothing left to release.
+
+    @staticmethod
+    def _is_alive(connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except pymysql.Error:
+            return False
+
+    def acquire(self, timeout=None):
+        """
+        Checks a connection out of the pool, opening a new one if none are idle.
+        Raises PoolExhaustedError if the pool stays full for `timeout` seconds.
+        """
+        if self._closed:
+            raise pymysql.err.InterfaceError("Connection pool is closed.")
+
+        timeout = self.checkout_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise PoolExhaustedError(f"No free database connection after {timeout:.1f}s (pool size {self.max_size}).")
+
+        try:
+            while True:
+                try:
+                    connection, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+
+                if time.monotonic() - last_used < self.ping_interval or self._is_alive(connection):
+                    return connection
+                # Stale socket (server restart, wait_timeout, network drop): replace it.
+                self._discard(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection, discard=False):
+        """
+        Returns a connection to the pool. Any open transaction is rolled back so
+        the next borrower starts clean; broken connections are closed instead.
+        """
+        try:
+            if not discard and connection.open:
+                try:
+                    connection.reset()
+                except pymysql.Error:
+                    discard = True
+            else:
+                discard = True
+
+            if discard or self._closed:
+                self._discard(connection)
+            else:
+                self._idle.put((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Context manager that borrows a connection for the duration of a block.
+        Connections that fail at the protocol level are not returned to the pool.
+        """
+        connection = self.acquire(timeout)
+        discard = False
+        try:
+            yield connection
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+            discard = not connection.open or not self._is_alive(connection)
+            raise
+        finally:
+            self.release(connection, discard=discard)
+
+    def close(self):
+        """Closes every idle connection and refuses further checkouts."""
+        self._closed = True
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
+
+
+class PinnedPool:
+    """
+    Pool-compatible view of one connection the caller has already borrowed,
+    so functions that take a pool run inside the caller's transaction (e.g. a
+    consistent snapshot). Releasing is a no-op; a discard request is recorded
+    in `discarded` for the owner to act on.
+    """
+
+    def __init__(self, connection, dsn):
+        self._connection = connection
+        self.dsn = dsn
+        self.discarded = False
+
+    def acquire(self, timeout=None):
+        return self._connection
+
+    def release(self, connection, discard=False):
+        if discard:
+            self.discarded = True
+
+    @contextmanager
+    def connection(self, timeout=None):
+        yield self._connection
+
+def create_pool(db_user, db_pass, db_host, db_name, **pool_kwargs):
+    """
+    Builds a ConnectionPool and opens one connection up front so bad
+    credentials are reported at login. Returns None on failure.
+    """
+    try:
+        pool = ConnectionPool(db_user, db_pass, db_host, db_name, **pool_kwargs)
+        pool.release(pool.acquire())
+        return pool
+    except pymysql.Error as e:
+        print(f"\n[ERROR] Failed to connect to MySQL Database: {e}", file=sys.stderr)
+        return None
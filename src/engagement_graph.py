@@ -0,0 +1,323 @@
+"""
+Engagement Graph (engagement_graph.py)
+In-memory graph over the junction tables the reports never walk:
+FIELD_ENGAGEMENT (grunt x trainer x mission x Pokemon), MISSION_ASSIGNMENT and
+OWNERSHIP. Questions like "which grunts engaged trainers within two hops of
+trainer 12" become self-joins that multiply at every hop in SQL; here they
+are breadth-first searches over compressed sparse row (CSR) adjacency arrays.
+
+    python3 main_app.py graph neighbors --node trainer:12 --hops 3 --kind personnel
+    python3 main_app.py graph path --from trainer:12 --to personnel:40
+    python3 main_app.py graph top-degree --kind trainer --limit 10
+    python3 main_app.py untargeted-trainers --min-score 50 --rank-by centrality
+
+Nodes are (kind, ID) pairs: personnel, trainer, mission and pokemon. Each
+junction row adds undirected edges:
+
+- MISSION_ASSIGNMENT: personnel - mission
+- OWNERSHIP: personnel - pokemon
+- FIELD_ENGAGEMENT: trainer - grunt, trainer - mission, trainer - pokemon
+
+Edges repeat when the same pair meets in several rows, so a trainer's degree
+counts engagements. Refreshing reads only the rows past the highest Seq
+loaded so far. Deleted rows are noticed by a row count
+check, which reloads the graph. The check runs whenever this process has
+written to one of the junction tables (their result cache generation moved),
+and every FULL_CHECK_INTERVAL seconds for writes from other processes.
+Inside the warm daemon (serve) one graph is kept per database.
+"""
+
+import time
+import threading
+from array import array
+from collections import deque
+
+from cache import result_cache
+from operations import stream_rows
+
+KINDS = ('personnel', 'trainer', 'mission', 'pokemon')
+FULL_CHECK_INTERVAL = 60.0    # seconds between row count checks for deletes by other processes
+COMPACT_RATIO = 0.1           # fold pending edges into the CSR arrays past this share of the total
+COMPACT_MIN_EDGES = 10000
+
+# Table -> (columns as (name, node kind), edges as pairs of column positions).
+EDGE_TABLES = {
+    'MISSION_ASSIGNMENT': ((('Personnel_ID', 'personnel'), ('Mission_ID', 'mission')), ((0, 1),)),
+    'OWNERSHIP': ((('Personnel_ID', 'personnel'), ('Pokemon_ID', 'pokemon')), ((0, 1),)),
+    'FIELD_ENGAGEMENT': ((('Grunt_Personnel_ID', 'personnel'), ('Trainer_ID', 'trainer'),
+                          ('Mission_ID', 'mission'), ('Pokemon_ID', 'pokemon')), ((1, 0), (1, 2), (1, 3))),
+}
+
+
+def parse_node(text):
+    """'trainer:12' -> ('trainer', 12). Raises ValueError for anything else."""
+    kind, _, node_id = str(text).partition(':')
+    kind = kind.strip().lower()
+    if kind not in KINDS or not node_id.strip().isdigit():
+        raise ValueError(f"Invalid node '{text}'; expected KIND:ID with KIND one of {', '.join(KINDS)}.")
+    return kind, int(node_id)
+
+
+class EngagementGraph:
+    """
+    Undirected multigraph in CSR form: the neighbours of node n are
+    indices[indptr[n]:indptr[n + 1]], plus any edges added since the arrays
+    were last compacted. Node numbers are dense and never reused.
+    """
+
+    def __init__(self):
+        self.kind_of = array('b')          # node -> position in KINDS
+        self.id_of = array('i')            # node -> ID within its kind
+        self._nodes = {kind: {} for kind in KINDS}   # kind -> {ID: node}
+        self.indptr = array('q', [0])
+        self.indices = array('i')
+        self._pending = {}                 # node -> [neighbours added since the last compaction]
+        self._pending_edges = 0
+        self.rows = {table: 0 for table in EDGE_TABLES}
+        self.marks = {table: 0 for table in EDGE_TABLES}   # highest Seq loaded per table
+        self.loaded_at = None
+        self.checked_at = None
+        self.generation = None             # result cache generation of EDGE_TABLES at the last refresh
+        self.lock = threading.RLock()
+
+    # --- Building ---
+
+    def node(self, kind, node_id, create=False):
+        """The node number of (kind, ID), or None if it is not in the graph (unless `create`)."""
+        nodes = self._nodes[kind]
+        number = nodes.get(node_id)
+        if number is None and create:
+            number = nodes[node_id] = len(self.id_of)
+            self.kind_of.append(KINDS.index(kind))
+            self.id_of.append(node_id)
+        return number
+
+    def add_rows(self, table, rows):
+        """Adds the edges of `rows` (dicts with the table's columns and Seq). Returns the row count."""
+        columns, edges = EDGE_TABLES[table]
+        count = 0
+        for row in rows:
+            nodes = [None if row[name] is None else self.node(kind, row[name], create=True)
+                     for name, kind in columns]
+            for a, b in edges:
+                if nodes[a] is not None and nodes[b] is not None:
+                    self._pending.setdefault(nodes[a], []).append(nodes[b])
+                    self._pending.setdefault(nodes[b], []).append(nodes[a])
+                    self._pending_edges += 2
+            self.marks[table] = max(self.marks[table], row['Seq'])
+            count += 1
+        self.rows[table] += count
+        return count
+
+    def compact(self):
+        """Folds the pending edges into fresh CSR arrays (one pass over every edge)."""
+        node_count = len(self.id_of)
+        old_nodes = len(self.indptr) - 1
+        degrees = [self.indptr[n + 1] - self.indptr[n] if n < old_nodes else 0 for n in range(node_count)]
+        for n, extra in self._pending.items():
+            degrees[n] += len(extra)
+
+        indptr = array('q', [0]) * (node_count + 1)
+        for n in range(node_count):
+            indptr[n + 1] = indptr[n] + degrees[n]
+        indices = array('i', [0]) * indptr[node_count]
+        for n in range(node_count):
+            start = indptr[n]
+            if n < old_nodes:
+                existing = self.indices[self.indptr[n]:self.indptr[n + 1]]
+                indices[start:start + len(existing)] = existing
+                start += len(existing)
+            extra = self._pending.get(n)
+            if extra:
+                indices[start:start + len(extra)] = array('i', extra)
+
+        self.indptr, self.indices = indptr, indices
+        self._pending, self._pending_edges = {}, 0
+
+    def maybe_compact(self):
+        if self._pending_edges > max(COMPACT_MIN_EDGES, COMPACT_RATIO * len(self.indices)):
+            self.compact()
+
+    # --- Queries ---
+
+    def neighbours(self, n):
+        """Neighbour node numbers of `n`, one per edge."""
+        if n < len(self.indptr) - 1:
+            yield from self.indices[self.indptr[n]:self.indptr[n + 1]]
+        yield from self._pending.get(n, ())
+
+    def degree(self, n):
+        stored = self.indptr[n + 1] - self.indptr[n] if n < len(self.indptr) - 1 else 0
+        return stored + len(self._pending.get(n, ()))
+
+    def label(self, n):
+        return KINDS[self.kind_of[n]], self.id_of[n]
+
+    def _require(self, kind, node_id):
+        n = self.node(kind, node_id)
+        if n is None:
+            raise ValueError(f"{kind}:{node_id} has no edges in the engagement graph.")
+        return n
+
+    def neighborhood(self, kind, node_id, hops=1, only=None):
+        """
+        Every node within `hops` edges of (kind, ID), nearest first, as
+        (kind, ID, distance). `only` keeps one kind; the walk still passes
+        through the others.
+        """
+        start = self._require(kind, node_id)
+        distance = {start: 0}
+        queue = deque([start])
+        while queue:
+            n = queue.popleft()
+            if distance[n] == hops:
+                continue
+            for m in self.neighbours(n):
+                if m not in distance:
+                    distance[m] = distance[n] + 1
+                    queue.append(m)
+        del distance[start]
+        hits = [(*self.label(n), d) for n, d in distance.items()]
+        if only is not None:
+            hits = [hit for hit in hits if hit[0] == only]
+        return sorted(hits, key=lambda hit: (hit[2], KINDS.index(hit[0]), hit[1]))
+
+    def shortest_path(self, source, target):
+        """Fewest-edge path between two (kind, ID) nodes as a list of them, or None if unconnected."""
+        start, goal = self._require(*source), self._require(*target)
+        parent = {start: None}
+        queue = deque([start])
+        while queue and goal not in parent:
+            n = queue.popleft()
+            for m in self.neighbours(n):
+                if m not in parent:
+                    parent[m] = n
+                    queue.append(m)
+        if goal not in parent:
+            return None
+        path = []
+        n = goal
+        while n is not None:
+            path.append(self.label(n))
+            n = parent[n]
+        return path[::-1]
+
+    def top_degree(self, kind, limit=10):
+        """The `limit` nodes of `kind` with the most edges, as (ID, degree, distinct neighbours)."""
+        ranked = sorted(((self.degree(n), node_id, n) for node_id, n in self._nodes[kind].items()),
+                        key=lambda entry: (-entry[0], entry[1]))[:int(limit)]
+        return [(node_id, degree, len(set(self.neighbours(n)))) for degree, node_id, n in ranked]
+
+    def trainer_centrality(self, trainer_id):
+        """
+        Engagement centrality of a trainer: (engagements, distinct grunts,
+        distinct missions). Engagements is the trainer's FIELD_ENGAGEMENT row
+        count, i.e. its degree towards personnel.
+        """
+        n = self.node('trainer', trainer_id)
+        if n is None:
+            return 0, 0, 0
+        personnel, missions = KINDS.index('personnel'), KINDS.index('mission')
+        engagements, grunts, seen_missions = 0, set(), set()
+        for m in self.neighbours(n):
+            if self.kind_of[m] == personnel:
+                engagements += 1
+                grunts.add(m)
+            elif self.kind_of[m] == missions:
+                seen_missions.add(m)
+        return engagements, len(grunts), len(seen_missions)
+
+    def stats(self):
+        return {'Nodes': len(self.id_of), 'Edges': (len(self.indices) + self._pending_edges) // 2,
+                'Pending_Edges': self._pending_edges // 2,
+                **{f"{table}_Rows": rows for table, rows in self.rows.items()},
+                **{f"{table}_Seq": mark for table, mark in self.marks.items()},
+                'Loaded_At': self.loaded_at}
+
+
+# --- Loading & Refresh ---
+
+def _load_new_rows(pool, graph, table):
+    """Adds the rows of `table` past graph.marks[table], in Seq order. Returns how many."""
+    columns, _ = EDGE_TABLES[table]
+    sql = (f"SELECT Seq, {', '.join(name for name, _ in columns)} FROM {table}"
+           f" WHERE Seq > %s ORDER BY Seq")
+    return graph.add_rows(table, stream_rows(pool, sql, (graph.marks[table],)))
+
+
+def _row_counts(pool):
+    with pool.connection() as connection, connection.cursor() as cursor:
+        counts = {}
+        for table in EDGE_TABLES:
+            cursor.execute(f"SELECT COUNT(*) AS N FROM {table}")
+            counts[table] = cursor.fetchone()['N']
+    return counts
+
+
+def load(pool):
+    """A new graph holding every row of the junction tables."""
+    graph = EngagementGraph()
+    for table in EDGE_TABLES:
+        _load_new_rows(pool, graph, table)
+    graph.compact()
+    graph.loaded_at = graph.checked_at = time.time()
+    return graph
+
+
+def refresh(pool, graph, full_check=None):
+    """
+    Brings `graph` up to date in place with the rows inserted since it was
+    loaded, and returns it. Every FULL_CHECK_INTERVAL seconds (or when
+    `full_check` is true) the table row counts are compared as well; if rows
+    were deleted, a freshly loaded graph is returned instead.
+    """
+    with graph.lock:
+        added = sum(_load_new_rows(pool, graph, table) for table in EDGE_TABLES)
+        graph.maybe_compact()
+        if full_check is None:
+            full_check = time.time() - graph.checked_at >= FULL_CHECK_INTERVAL
+        if full_check:
+            if _row_counts(pool) != graph.rows:
+                return load(pool)
+            graph.checked_at = time.time()
+        if added:
+            graph.loaded_at = time.time()
+        return graph
+
+
+_graphs = {}                # dsn -> EngagementGraph
+_graphs_lock = threading.Lock()
+
+
+def graph_for(pool, full_check=None):
+    """
+    The process-wide graph for `pool`'s database, loaded on first use and
+    refreshed on every call. Writes this process made to the junction tables
+    since the last call (retire, fire, archive-missions) force the row count
+    check, so their deletes are never served from the old graph.
+    """
+    with _graphs_lock:
+        generation = result_cache.generation(EDGE_TABLES)
+        graph = _graphs.get(pool.dsn)
+        if graph is None:
+            graph = load(pool)
+        elif graph.generation != generation:
+            graph = refresh(pool, graph, full_check=True)
+        else:
+            graph = refresh(pool, graph, full_check)
+        graph.generation = generation
+        _graphs[pool.dsn] = graph
+        return graph
+
+
+def rank_trainers(graph, rows):
+    """
+    READ 6 rows (with Trainer_ID) with Engagements, Grunts_Engaged and
+    Missions_Engaged added, most engaged first, then by notoriety.
+    """
+    ranked = []
+    for row in rows:
+        engagements, grunts, missions = graph.trainer_centrality(row['Trainer_ID'])
+        ranked.append({**row, 'Engagements': engagements, 'Grunts_Engaged': grunts, 'Missions_Engaged': missions})
+    ranked.sort(key=lambda row: (-row['Engagements'], -row['NotorietyScore'], row['Trainer_ID']))
+    return ranked
@@ -0,0 +1,497 @@
+"""
+Experiment Ingest (experiment_ingest.py)
+Streams lab instrument output into EXPERIMENTAL_LOG and EXPERIMENTATION_EVENT.
+Records are read from files or stdin, checked against in-memory sets of the
+IDs they reference, and written by a few writer threads as multi-row INSERTs,
+one transaction per batch. Log_IDs are reserved per project in blocks from
+EXPERIMENTAL_LOG_SEQUENCE, so no row pays for a MAX(Log_ID) + 1 lookup and
+concurrent ingests never hand out the same Log_ID.
+
+    instrument_feed | python3 main_app.py ingest-experiments - --input-format jsonl
+    python3 main_app.py ingest-experiments run1.jsonl run2.csv --writers 4
+
+Log records: project_id, objective, status (default Planned), start_date (ISO
+date or datetime, default the time the record was read).
+Event records: scientist_id, serum_id, pokemon_id, project_id.
+An optional `type` field ('log' or 'event') picks the table; without it,
+records that have a scientist_id are events.
+
+The reader, the batcher and the writers are joined by bounded queues. When the
+database falls behind, the queues fill up and reading pauses, so a producer
+piping into stdin is slowed down instead of this process buffering without
+limit. Reserved Log_IDs that end up unused (rejected rows, an interrupted
+run) leave gaps, as AUTO_INCREMENT does.
+"""
+
+import sys
+import time
+import queue
+import datetime
+import threading
+
+import pymysql
+
+import metrics
+import recruit_import
+from cache import result_cache
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_BATCH_SIZE = 5000
+DEFAULT_WRITERS = 2
+MAX_WRITERS = 16
+DEFAULT_BLOCK_SIZE = 1000         # Log_IDs reserved per round trip
+DEFAULT_MAX_PENDING = 4           # full batches waiting for a writer
+DEFAULT_FLUSH_INTERVAL = 1.0      # seconds a partial batch may wait for more records
+DEFAULT_PROGRESS_INTERVAL = 5.0   # seconds between progress lines on stderr
+MISSING_ID_TTL = 5.0              # seconds an ID found missing is not looked up again
+POLL_INTERVAL = 0.25
+
+KINDS = ('log', 'event')
+LOG_STATUSES = ('Planned', 'In Progress', 'Successful', 'Failed', 'Cancelled')
+OBJECTIVE_MAX_BYTES = 65535       # TEXT
+MAX_INT = 2 ** 31 - 1
+FIELDS = {
+    'log': ('project_id', 'objective', 'status', 'start_date'),
+    'event': ('scientist_id', 'serum_id', 'pokemon_id', 'project_id'),
+}
+
+# Field -> (table, key column) the value must exist in.
+REFERENCES = {
+    'project_id': ('RESEARCH_PROJECT', 'Project_ID'),
+    'scientist_id': ('SCIENTIST', 'Scientist_Personnel_ID'),
+    'serum_id': ('SERUM', 'Serum_ID'),
+    'pokemon_id': ('POKEMON', 'Pokemon_ID'),
+}
+# Field -> extra condition on the referenced row. Soft-retired scientists
+# (personnel_archive.py) take no new events.
+REFERENCE_FILTERS = {
+    'scientist_id': "Scientist_Personnel_ID IN (SELECT Personnel_ID FROM PERSONNEL WHERE RetiredDate IS NULL)",
+}
+
+INSERT_LOG_SQL = ("INSERT INTO EXPERIMENTAL_LOG (Project_ID, Log_ID, Objective, `Status`, StartDate) "
+                  "VALUES (%s, %s, %s, %s, %s)")
+# An event is just its four IDs, so sending one twice is a no-op, not an error.
+# The no-op update skips only existing keys (0 rows affected); unlike INSERT
+# IGNORE it lets foreign key and data errors through to the savepoint retry.
+INSERT_EVENT_SQL = ("INSERT INTO EXPERIMENTATION_EVENT (Scientist_Personnel_ID, Serum_ID, Pokemon_ID, Project_ID) "
+                    "VALUES (%s, %s, %s, %s) ON DUPLICATE KEY UPDATE Project_ID = Project_ID")
+INSERT_SQL = {'log': INSERT_LOG_SQL, 'event': INSERT_EVENT_SQL}
+TABLES = {'log': 'EXPERIMENTAL_LOG', 'event': 'EXPERIMENTATION_EVENT'}
+
+SEED_SEQUENCE_SQL = "INSERT IGNORE INTO EXPERIMENTAL_LOG_SEQUENCE (Project_ID, Next_Log_ID) VALUES (%s, 1)"
+# Also skips past Log_IDs written without the sequence (populate.sql, older tools).
+RESERVE_LOG_IDS_SQL = """
+    UPDATE EXPERIMENTAL_LOG_SEQUENCE
+    SET Next_Log_ID = GREATEST(Next_Log_ID,
+                               (SELECT COALESCE(MAX(Log_ID), 0) + 1 FROM EXPERIMENTAL_LOG WHERE Project_ID = %s)) + %s
+    WHERE Project_ID = %s
+"""
+NEXT_LOG_ID_SQL = "SELECT Next_Log_ID FROM EXPERIMENTAL_LOG_SEQUENCE WHERE Project_ID = %s"
+
+
+# --- Validation ---
+
+def _text(record, field):
+    value = record.get(field)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _int(record, field):
+    value = _text(record, field)
+    if value is None:
+        raise ValueError(f"{field} is required.")
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {field} '{value}'.") from None
+    if not 1 <= value <= MAX_INT:
+        raise ValueError(f"{field} {value} is out of range.")
+    return value
+
+
+def validate_record(record, now):
+    """
+    Normalizes one raw record. Returns (kind, values, None) or (None, None,
+    error). References are only checked for shape here; the ingest checks they
+    exist.
+    """
+    if not isinstance(record, dict):
+        return None, None, record
+    kind = (_text(record, 'type') or ('event' if _text(record, 'scientist_id') else 'log')).lower()
+    if kind not in KINDS:
+        return None, None, f"Invalid type '{record.get('type')}' (expected log or event)."
+    # Empty values are ignored, so one CSV can hold both kinds.
+    unknown = sorted(f for f in record if f not in FIELDS[kind] and f != 'type' and _text(record, f) is not None)
+    if unknown:
+        return None, None, f"Unknown field(s) for a {kind} record: {', '.join(unknown)}."
+
+    try:
+        if kind == 'event':
+            return kind, {field: _int(record, field) for field in FIELDS['event']}, None
+        project_id = _int(record, 'project_id')
+    except ValueError as e:
+        return None, None, str(e)
+
+    objective = _text(record, 'objective')
+    if objective is not None and len(objective.encode('utf-8')) > OBJECTIVE_MAX_BYTES:
+        return None, None, f"objective is limited to {OBJECTIVE_MAX_BYTES} bytes."
+    status = _text(record, 'status') or 'Planned'
+    matches = [s for s in LOG_STATUSES if s.lower() == status.lower()]
+    if not matches:
+        return None, None, f"Invalid status '{status}'."
+
+    start_date = _text(record, 'start_date')
+    try:
+        start_date = datetime.datetime.fromisoformat(start_date) if start_date else now
+    except ValueError:
+        return None, None, f"Invalid start_date '{start_date}' (expected YYYY-MM-DD[ HH:MM:SS])."
+    if start_date.tzinfo is not None:
+        start_date = start_date.astimezone().replace(tzinfo=None)  # DATETIME holds local time
+    return kind, {'project_id': project_id, 'objective': objective, 'status': matches[0],
+                  'start_date': start_date}, None
+
+
+class _ReferenceCache:
+    """
+    The IDs of every referenced table, loaded once. An ID that is not in its
+    set is looked up before the record is rejected (rows created after the
+    ingest started are fine), and a miss is remembered for MISSING_ID_TTL so a
+    flood of bad records does not turn into a query each.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.known = {}
+        self.missing = {}
+        with connection.cursor() as cursor:
+            for field, (table, column) in REFERENCES.items():
+                cursor.execute(f"SELECT {column} AS Id FROM {table} WHERE {REFERENCE_FILTERS.get(field, 'TRUE')}")
+                self.known[field] = {row['Id'] for row in cursor.fetchall()}
+        connection.commit()
+
+    def missing_reference(self, values):
+        """The first field of `values` whose ID does not exist, or None."""
+        for field, value in values.items():
+            if field in REFERENCES and not self._exists(field, value):
+                return field
+        return None
+
+    def _exists(self, field, value):
+        if value in self.known[field]:
+            return True
+        checked = self.missing.get((field, value))
+        if checked is not None and time.monotonic() - checked < MISSING_ID_TTL:
+            return False
+        table, column = REFERENCES[field]
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"SELECT 1 FROM {table} WHERE {column} = %s AND {REFERENCE_FILTERS.get(field, 'TRUE')}",
+                           (value,))
+            found = cursor.fetchone() is not None
+        self.connection.commit()
+        if found:
+            self.known[field].add(value)
+            self.missing.pop((field, value), None)
+        else:
+            self.missing[(field, value)] = time.monotonic()
+        return found
+
+
+class _LogIdAllocator:
+    """
+    Hands out Log_IDs per project from blocks reserved in
+    EXPERIMENTAL_LOG_SEQUENCE. Each reservation is its own short transaction,
+    so other ingests only wait on the sequence row for one UPDATE.
+    """
+
+    def __init__(self, connection, block_size=DEFAULT_BLOCK_SIZE):
+        self.connection = connection
+        self.block_size = block_size
+        self.blocks = {}  # Project_ID -> [next, end)
+        self.reservations = 0
+
+    def take(self, project_id):
+        block = self.blocks.get(project_id)
+        if block is None or block[0] >= block[1]:
+            block = self.blocks[project_id] = self._reserve(project_id)
+        log_id = block[0]
+        block[0] += 1
+        return log_id
+
+    def _reserve(self, project_id):
+        try:
+            with self.connection.cursor() as cursor:
+                if not cursor.execute(RESERVE_LOG_IDS_SQL, (project_id, self.block_size, project_id)):
+                    cursor.execute(SEED_SEQUENCE_SQL, (project_id,))
+                    cursor.execute(RESERVE_LOG_IDS_SQL, (project_id, self.block_size, project_id))
+                cursor.execute(NEXT_LOG_ID_SQL, (project_id,))
+                row = cursor.fetchone()
+            self.connection.commit()
+        except pymysql.Error:
+            self.connection.rollback()
+            raise
+        if row is None:
+            raise pymysql.err.IntegrityError(f"Could not reserve Log_IDs for project {project_id}.")
+        self.reservations += 1
+        end = row['Next_Log_ID']
+        return [end - self.block_size, end]
+
+
+# --- Writing ---
+
+def _row(kind, values):
+    if kind == 'event':
+        return (values['scientist_id'], values['serum_id'], values['pokemon_id'], values['project_id'])
+    return (values['project_id'], values['log_id'], values['objective'], values['status'], values['start_date'])
+
+
+def _write_one_by_one(cursor, sql, rows):
+    """
+    Slow path for a batch that failed as a whole: each row goes in under its
+    own savepoint. Returns (rows written, {row index: error}).
+    """
+    written, errors = 0, {}
+    for index, row in enumerate(rows):
+        cursor.execute("SAVEPOINT ingest_row")
+        try:
+            written += cursor.execute(sql, row)
+        except pymysql.Error as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT ingest_row")
+            errors[index] = str(e)
+    return written, errors
+
+
+def write_batch(connection, kind, rows):
+    """
+    Inserts one batch in one transaction. Returns (rows written, {row index:
+    error}); an event that already exists counts as neither.
+    """
+    sql = INSERT_SQL[kind]
+    with connection.cursor() as cursor:
+        try:
+            written, errors = cursor.executemany(sql, rows), {}
+        except (pymysql.err.IntegrityError, pymysql.err.DataError):
+            connection.rollback()
+            written, errors = _write_one_by_one(cursor, sql, rows)
+    connection.commit()
+    result_cache.invalidate(TABLES[kind])
+    return written, errors
+
+
+# --- Ingest ---
+
+_END = object()
+
+
+class ExperimentIngest:
+    """
+    One ingest run. run() yields a row for each record that was rejected or
+    failed to insert; summary() has the totals and the sustained rate.
+    """
+
+    def __init__(self, pool, batch_size=DEFAULT_BATCH_SIZE, writers=DEFAULT_WRITERS, block_size=DEFAULT_BLOCK_SIZE,
+                 max_pending=DEFAULT_MAX_PENDING, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 progress_interval=DEFAULT_PROGRESS_INTERVAL):
+        if not 1 <= batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"Batch size must be between 1 and {MAX_BATCH_SIZE}.")
+        if not 1 <= writers <= MAX_WRITERS:
+            raise ValueError(f"Writers must be between 1 and {MAX_WRITERS}.")
+        if block_size < 1 or max_pending < 1:
+            raise ValueError("Block size and max pending batches must be at least 1.")
+        self.pool = pool
+        self.batch_size = batch_size
+        self.writers = writers
+        self.block_size = block_size
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.progress_interval = progress_interval
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._failure = None
+        self._problems = queue.Queue()
+        self.counts = {'read': 0, 'log': 0, 'event': 0, 'duplicate': 0, 'invalid': 0, 'failed': 0, 'batches': 0}
+        self.stalled = 0.0
+        self.started = self.finished = None
+        self._allocator = None
+
+    # --- Threads ---
+
+    def _read(self, sources, fmt, incoming):
+        """Reader thread: parses every source in turn into (source, line, record)."""
+        try:
+            for name, stream in sources:
+                for line, record in recruit_import.read_records(stream, fmt or recruit_import.detect_format(name)):
+                    if not self._put(incoming, (name, line, record)):
+                        return
+            self._put(incoming, _END)
+        except Exception as e:  # raised again by run(), in the caller's thread
+            self._put(incoming, e)
+
+    def _write(self, workers, batches):
+        """Writer thread: inserts batches until it gets None."""
+        try:
+            with metrics.command('ingest-experiments:writer'), workers.connection() as connection:
+                while not self._stop.is_set():
+                    try:
+                        batch = batches.get(timeout=POLL_INTERVAL)
+                    except queue.Empty:
+                        continue
+                    if batch is None:
+                        return
+                    kind, refs, rows = batch
+                    written, errors = write_batch(connection, kind, rows)
+                    with self._lock:
+                        self.counts[kind] += written
+                        self.counts['batches'] += 1
+                        self.counts['failed'] += len(errors)
+                        if kind == 'event':
+                            self.counts['duplicate'] += len(rows) - written - len(errors)
+                    for index, error in errors.items():
+                        self._problems.put(self._problem(refs[index], kind, 'failed', error))
+        except Exception as e:  # raised again by run(), in the caller's thread
+            self._failure = e
+            self._stop.set()
+
+    def _put(self, target, item):
+        """Blocking put that gives up once the run is stopping. Returns False if it gave up."""
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    # --- Batching ---
+
+    @staticmethod
+    def _problem(ref, kind, status, error):
+        return {'Source': ref[0], 'Line': ref[1], 'Kind': kind, 'Status': status, 'Error': error}
+
+    def _submit(self, batches, kind, buffer):
+        refs, rows = buffer
+        if not rows:
+            return
+        waited = time.monotonic()
+        if not self._put(batches, (kind, list(refs), list(rows))):
+            raise self._failure or pymysql.err.OperationalError("Ingest stopped.")
+        self.stalled += time.monotonic() - waited
+        refs.clear()
+        rows.clear()
+
+    def _progress(self, previous):
+        now = time.monotonic()
+        written = self.written
+        rate = (written - previous[1]) / max(now - previous[0], 1e-9)
+        overall = written / max(now - self.started, 1e-9)
+        print(f"[INFO] {written} rows written: {rate:,.0f} rows/s now, {overall:,.0f} rows/s overall "
+              f"({self.counts['invalid'] + self.counts['failed']} rejected).", file=sys.stderr)
+        return now, written
+
+    @property
+    def written(self):
+        with self._lock:
+            return self.counts['log'] + self.counts['event']
+
+    def run(self, sources, fmt=None):
+        """
+        Ingests every (name, stream) source in order. `fmt` is 'csv' or
+        'jsonl' (default from each name's extension). Yields problem rows:
+        Source, Line, Kind, Status ('invalid' or 'failed'), Error.
+        """
+        workers = self.pool.clone(max_size=self.writers + 1)
+        incoming = queue.Queue(maxsize=self.batch_size * 2)
+        batches = queue.Queue(maxsize=self.max_pending)
+        buffers = {kind: ([], []) for kind in KINDS}
+        threads = [threading.Thread(target=self._write, args=(workers, batches), name=f'ingest-writer-{n}', daemon=True)
+                   for n in range(self.writers)]
+        reader = threading.Thread(target=self._read, args=(sources, fmt, incoming), name='ingest-reader', daemon=True)
+        self.started = time.monotonic()
+        try:
+            with workers.connection() as connection:
+                references = _ReferenceCache(connection)
+                allocator = self._allocator = _LogIdAllocator(connection, self.block_size)
+                for thread in threads + [reader]:
+                    thread.start()
+
+                flush_at = None
+                last_progress = (self.started, 0)
+                while True:
+                    if self._failure:
+                        raise self._failure
+                    try:
+                        item = incoming.get(timeout=POLL_INTERVAL)
+                    except queue.Empty:
+                        item = None
+                    if item is _END:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+
+                    if item is not None:
+                        source, line, record = item
+                        self.counts['read'] += 1
+                        kind, values, error = validate_record(record, datetime.datetime.now().replace(microsecond=0))
+                        if not error:
+                            field = references.missing_reference(values)
+                            if field:
+                                table, column = REFERENCES[field]
+                                retired = ' or has retired' if field in REFERENCE_FILTERS else ''
+                                error = f"{table} {column} {values[field]} does not exist{retired}."
+                        if error:
+                            self.counts['invalid'] += 1
+                            yield self._problem((source, line), kind, 'invalid', error)
+                        else:
+                            if kind == 'log':
+                                values['log_id'] = allocator.take(values['project_id'])
+                            refs, rows = buffers[kind]
+                            refs.append((source, line))
+                            rows.append(_row(kind, values))
+                            flush_at = flush_at or time.monotonic() + self.flush_interval
+                            if len(rows) >= self.batch_size:
+                                self._submit(batches, kind, buffers[kind])
+
+                    if flush_at and time.monotonic() >= flush_at:
+                        for kind in KINDS:
+                            self._submit(batches, kind, buffers[kind])
+                        flush_at = None
+                    while not self._problems.empty():
+                        yield self._problems.get()
+                    if self.progress_interval and time.monotonic() - last_progress[0] >= self.progress_interval:
+                        last_progress = self._progress(last_progress)
+
+                for kind in KINDS:
+                    self._submit(batches, kind, buffers[kind])
+                for _ in threads:
+                    self._put(batches, None)
+                for thread in threads:
+                    thread.join()
+                if self._failure:
+                    raise self._failure
+        finally:
+            self._stop.set()
+            self.finished = time.monotonic()
+            for thread in threads:
+                if thread.is_alive():
+                    thread.join()
+            workers.close()
+        while not self._problems.empty():
+            yield self._problems.get()
+
+    def summary(self):
+        seconds = (self.finished or time.monotonic()) - (self.started or time.monotonic())
+        return {
+            'Logs_Written': self.counts['log'],
+            'Events_Written': self.counts['event'],
+            'Duplicate_Events': self.counts['duplicate'],
+            'Invalid': self.counts['invalid'],
+            'Failed': self.counts['failed'],
+            'Batches': self.counts['batches'],
+            'Log_ID_Blocks': self._allocator.reservations if self._allocator else 0,
+            'Seconds': round(seconds, 3),
+            'Rows_Per_Sec': round(self.written / seconds, 1) if seconds > 0 else None,
+            'Stalled_Seconds': round(self.stalled, 3),
+        }
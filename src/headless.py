@@ -0,0 +1,910 @@
+"""
+Headless Interface (headless.py)
+Non-interactive entry point with one subcommand per operation, for cron jobs
+and scripts. Parameters come from flags, credentials from the environment or a
+MySQL option file, and results are written as JSON lines or CSV.
+
+Examples:
+    python3 main_app.py active-missions
+    python3 main_app.py --format csv base-success-rate
+    python3 main_app.py set-mission-status --mission-id 7 --status Completed
+    python3 main_app.py batch nightly_jobs.txt
+    python3 main_app.py --sqlite chimera.db sqlite-init --populate
+    python3 main_app.py serve --socket /tmp/chimera.sock
+    instrument_feed | python3 main_app.py ingest-experiments - --input-format jsonl
+"""
+
+import os
+import sys
+import time
+import csv
+import json
+import shlex
+import argparse
+import datetime
+import decimal
+
+import pymysql
+
+import datagen
+import dashboard
+import engagement_graph
+import experiment_ingest
+import metrics
+import benchmark
+import bulk_status
+import mission_archive
+import operations
+import personnel_archive
+import plan_audit
+import recruit_import
+import search
+import server
+import summaries
+import snapshot
+import sqlite_backend
+from cache import result_cache
+from db import ConnectionPool
+
+DEFAULT_HOST = 'localhost'
+DEFAULT_DATABASE = 'chimera_db'
+
+# Environment variables consulted for credentials and connection settings.
+ENV_HOST = 'CHIMERA_DB_HOST'
+ENV_DATABASE = 'CHIMERA_DB_NAME'
+ENV_USER = 'CHIMERA_DB_USER'
+ENV_PASSWORD = 'CHIMERA_DB_PASSWORD'
+ENV_DEFAULTS_FILE = 'CHIMERA_DB_DEFAULTS_FILE'
+ENV_SLOW_QUERY_MS = 'CHIMERA_SLOW_QUERY_MS'
+ENV_SQLITE_PATH = 'CHIMERA_SQLITE_PATH'
+
+OUTPUT_FORMATS = ('jsonl', 'csv')
+
+
+class CommandError(Exception):
+    """A command was invoked with arguments it cannot act on."""
+
+
+# --- Output ---
+
+def _to_plain(value):
+    """Converts driver types (Decimal, date) into JSON/CSV friendly values."""
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+class RowWriter:
+    """
+    Writes result rows as JSON lines or CSV. In CSV mode a header is written
+    whenever the column set changes, so batch output stays parseable per block.
+    """
+
+    def __init__(self, stream, fmt='jsonl'):
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{fmt}'")
+        self.stream = stream
+        self.fmt = fmt
+        self._csv_columns = None
+        self._csv_writer = csv.writer(stream) if fmt == 'csv' else None
+
+    def write(self, row):
+        row = {key: _to_plain(value) for key, value in row.items()}
+        if self.fmt == 'jsonl':
+            self.stream.write(json.dumps(row, default=str) + "\n")
+            return
+        columns = list(row)
+        if columns != self._csv_columns:
+            self._csv_writer.writerow(columns)
+            self._csv_columns = columns
+        self._csv_writer.writerow([row[column] for column in columns])
+
+    def write_all(self, rows):
+        count = 0
+        for row in rows:
+            self.write(row)
+            count += 1
+        self.stream.flush()
+        return count
+
+
+# --- Commands ---
+# Each handler takes (pool, args) and returns an iterable of row dicts.
+
+def _paged_or_streamed(args, fetch_page, stream):
+    """
+    List reports stream rows from a server-side cursor by default. With
+    --page-size they return a single keyset page and report the resume token.
+    """
+    if args.page_size is None:
+        if args.page_token:
+            raise CommandError("--page-token requires --page-size.")
+        return stream()
+    rows, next_token = fetch_page(args.page_size, args.page_token)
+    if next_token:
+        print(f"[INFO] next page token: {next_token}", file=sys.stderr)
+    return rows
+
+def _cmd_active_missions(pool, args):
+    return _paged_or_streamed(
+        args,
+        lambda size, token: operations.fetch_active_missions_page(pool, size, token),
+        lambda: operations.iter_active_missions(pool))
+
+def _cmd_pending_risk(pool, args):
+    result = operations.fetch_pending_mission_risk(pool)
+    return [result] if result else []
+
+def _cmd_top_personnel(pool, args):
+    return operations.fetch_top_performing_personnel(pool, limit=args.limit)
+
+def _cmd_unassigned_assets(pool, args):
+    return _paged_or_streamed(
+        args,
+        lambda size, token: operations.fetch_unassigned_assets_page(pool, size, token),
+        lambda: operations.iter_unassigned_assets(pool))
+
+def _cmd_pokemon_type_stats(pool, args):
+    return operations.fetch_pokemon_stats_by_type(pool)
+
+def _cmd_untargeted_trainers(pool, args):
+    if args.rank_by == 'centrality':
+        if args.page_size is not None or args.page_token:
+            raise CommandError("--rank-by centrality ranks every row; it cannot be combined with paging.")
+        graph = engagement_graph.graph_for(pool)
+        with graph.lock:
+            return engagement_graph.rank_trainers(graph, operations.fetch_untargeted_trainers(pool, args.min_score))
+    return _paged_or_streamed(
+        args,
+        lambda size, token: operations.fetch_untargeted_trainers_page(pool, args.min_score, size, token),
+        lambda: operations.iter_untargeted_trainers(pool, args.min_score))
+
+def _cmd_base_success_rate(pool, args):
+    return operations.fetch_mission_success_rate_by_base(pool)
+
+def _cmd_search(pool, args):
+    if search.engine(pool, args.target) != 'fulltext':
+        print(f"[INFO] No FULLTEXT index for {args.target} on this backend; searching an in-process inverted index.",
+              file=sys.stderr)
+    return _paged_or_streamed(
+        args,
+        lambda size, token: search.search_page(pool, args.query, args.target, size, token),
+        lambda: search.iter_search(pool, args.query, args.target))
+
+def _cmd_recruit(pool, args):
+    personnel_id = operations.recruit_personnel(
+        pool, args.first_name, args.last_name, args.rank, args.base_id,
+        specialization=args.specialization, region=args.region)
+    return [{'Personnel_ID': personnel_id, 'Rank': args.rank.capitalize()}]
+
+def _cmd_assign_pokemon(pool, args):
+    operations.assign_pokemon(pool, args.personnel_id, args.pokemon_id)
+    return [{'Personnel_ID': args.personnel_id, 'Pokemon_ID': args.pokemon_id}]
+
+def _cmd_set_mission_status(pool, args):
+    rows = operations.set_mission_status(pool, args.mission_id, args.status)
+    return [{'Mission_ID': args.mission_id, 'Status': args.status.capitalize(), 'Rows_Affected': rows}]
+
+def _cmd_bulk_set_mission_status(pool, args):
+    filters = {'from_status': args.from_status, 'trainer_id': args.trainer_id, 'base_id': args.base_id,
+               'started_before': args.started_before, 'started_after': args.started_after}
+    if args.dry_run:
+        yield {'Status': args.status, **bulk_status.count_matches(pool, args.status, filters, args.after_id)}
+        return
+    updated = 0
+    last_id = args.after_id
+    try:
+        for chunk in bulk_status.transition_missions(pool, args.status, filters, args.chunk_size, args.after_id,
+                                                     checkpoint=args.checkpoint, pause=args.pause_ms / 1000):
+            updated += chunk['Updated']
+            last_id = chunk['Last_ID']
+            yield chunk
+    except (pymysql.Error, KeyboardInterrupt):
+        print(f"[ERROR] Interrupted after Mission_ID {last_id}; rerun with --after-id {last_id}"
+              f"{' (or the same --checkpoint)' if args.checkpoint else ''} to resume.", file=sys.stderr)
+        raise
+    print(f"[INFO] {updated} mission(s) set to {args.status}.", file=sys.stderr)
+
+def _cmd_set_pokemon_stats(pool, args):
+    rows = operations.set_pokemon_stats(pool, args.pokemon_id, args.hp, args.attack, args.defense)
+    return [{'Pokemon_ID': args.pokemon_id, 'Rows_Affected': rows}]
+
+def _cmd_fire(pool, args):
+    if not args.yes:
+        raise CommandError("Refusing to delete without --yes.")
+    rows = operations.delete_personnel(pool, args.personnel_id)
+    return [{'Personnel_ID': args.personnel_id, 'Rows_Affected': rows}]
+
+def _cmd_retire(pool, args):
+    missing = []
+    if args.report:
+        for personnel_id in args.personnel_id:
+            report = personnel_archive.preflight(pool, personnel_id)
+            if not report:
+                missing.append(str(personnel_id))
+            if personnel_archive.blocks_delete(report):
+                print(f"[INFO] Personnel {personnel_id} has EXPERIMENTATION_EVENT rows; 'fire' would fail, 'retire' archives them.",
+                      file=sys.stderr)
+            yield from ({'Personnel_ID': personnel_id, **row} for row in report)
+        if missing:
+            raise CommandError(f"No personnel found with ID(s) {', '.join(missing)}.")
+        return
+    if not args.yes:
+        raise CommandError("Refusing to retire without --yes (use --report to preview).")
+
+    for personnel_id in args.personnel_id:
+        if args.soft:
+            rows = personnel_archive.soft_retire(pool, personnel_id)
+            yield {'Personnel_ID': personnel_id, 'Step': 'soft-retire', 'Table': 'PERSONNEL', 'Rows': rows, 'Seconds': None}
+            deleted = rows
+        else:
+            deleted = 0
+            for step in personnel_archive.retire(pool, personnel_id, args.batch_size, args.pause_ms / 1000):
+                deleted += step['Rows'] if step['Step'] == 'delete' else 0
+                yield step
+        if not deleted:
+            missing.append(str(personnel_id))
+    if missing:
+        raise CommandError(f"No {'serving ' if args.soft else ''}personnel found with ID(s) {', '.join(missing)}.")
+
+def _cmd_archive_missions(pool, args):
+    if args.report:
+        yield from mission_archive.report(pool, args.older_than)
+        return
+    if not args.yes:
+        raise CommandError("Refusing to archive without --yes (use --report to preview).")
+
+    missions = 0
+    for step in mission_archive.archive(pool, args.older_than, args.batch_size, args.pause_ms / 1000):
+        missions += step['Missions']
+        yield step
+    print(f"[INFO] Archived {missions} missions closed before {mission_archive.cutoff_date(args.older_than)}.",
+          file=sys.stderr)
+
+def _cmd_cache_stats(pool, args):
+    return [result_cache.stats()]
+
+def _cmd_plan_audit(pool, args):
+    findings = plan_audit.audit_queries(pool, args.query, args.min_rows)
+    unexpected = [f for f in findings if not f['Allowed']]
+    yield from (findings if args.all else unexpected)
+    if unexpected:
+        raise CommandError(f"{len(unexpected)} unexpected plan finding(s).")
+
+def _cmd_generate_data(pool, args):
+    personnel = datagen.parse_scale(args.personnel)
+    out_dir = args.out_dir or datagen.default_data_dir(personnel, args.seed)
+    manifest = datagen.generate_dataset(out_dir, personnel, args.seed)
+    datagen.print_manifest(manifest)
+    if not args.load:
+        for table, rows in manifest['rows'].items():
+            yield {'Table': table, 'Rows': rows, 'File': os.path.join(out_dir, f"{table}.tsv")}
+        return
+    yield from datagen.load_dataset(pool, out_dir, method=args.method, truncate=args.truncate)
+
+
+def _parse_report_timeouts(values):
+    timeouts = {}
+    for value in values or ():
+        name, sep, seconds = value.partition('=')
+        try:
+            timeouts[name] = float(seconds)
+        except ValueError:
+            sep = ''
+        if not sep or name not in dashboard.REPORTS:
+            raise CommandError(f"Invalid --report-timeout '{value}'; expected REPORT=SECONDS.")
+    return timeouts
+
+def _cmd_dashboard(pool, args):
+    results = dashboard.run_dashboard(
+        pool, args.report, args.timeout, _parse_report_timeouts(args.report_timeout),
+        min_score=args.min_score, limit=args.limit, max_rows=args.max_rows, lock_snapshot=args.lock_snapshot)
+    failed = []
+    for result in results:
+        if result['Status'] == 'ok':
+            print(f"[INFO] {result['Report']}: {len(result['Rows'])} rows in {result['Seconds']:.3f}s", file=sys.stderr)
+            for row in result['Rows']:
+                yield {'_report': result['Report'], **row}
+        else:
+            failed.append(result['Report'])
+            print(f"[ERROR] {result['Report']} ({result['Status']}): {result['Error']}", file=sys.stderr)
+    if failed:
+        raise CommandError(f"{len(failed)} report(s) did not complete: {', '.join(failed)}.")
+
+def _cmd_import_recruits(pool, args):
+    fmt = args.input_format or recruit_import.detect_format(args.file)
+    if args.file == '-':
+        stream = sys.stdin
+    else:
+        stream = open(args.file, encoding='utf-8', newline='')
+    counts = {}
+    try:
+        results = recruit_import.import_recruits(pool, recruit_import.read_records(stream, fmt), args.batch_size,
+                                                 skip_invalid=args.skip_invalid, validate_only=args.validate_only)
+        for row in results:
+            counts[row['Status']] = counts.get(row['Status'], 0) + 1
+            yield row
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    summary = ', '.join(f"{count} {status}" for status, count in sorted(counts.items())) or "no records"
+    print(f"[INFO] Import finished: {summary}.", file=sys.stderr)
+    if counts.get('invalid') and not (args.skip_invalid or args.validate_only):
+        raise CommandError("Invalid records found; nothing was imported (use --skip-invalid to import the rest).")
+    if counts.get('invalid') or counts.get('failed'):
+        raise CommandError(f"{counts.get('invalid', 0) + counts.get('failed', 0)} record(s) were not imported.")
+
+def _cmd_ingest_experiments(pool, args):
+    if args.files.count('-') > 1:
+        raise CommandError("stdin ('-') can only be read once.")
+    ingest = experiment_ingest.ExperimentIngest(
+        pool, batch_size=args.batch_size, writers=args.writers, block_size=args.block_size,
+        max_pending=args.max_pending, flush_interval=args.flush_interval, progress_interval=args.progress_interval)
+    sources = []
+    try:
+        for path in args.files:
+            sources.append((path, sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')))
+        yield from ingest.run(sources, args.input_format)
+    finally:
+        for _, stream in sources:
+            if stream is not sys.stdin:
+                stream.close()
+
+    summary = ingest.summary()
+    print(f"[INFO] Ingest finished: {summary['Logs_Written']} logs and {summary['Events_Written']} events "
+          f"in {summary['Seconds']:.1f}s ({summary['Rows_Per_Sec'] or 0:,.0f} rows/s), "
+          f"{summary['Stalled_Seconds']:.1f}s waiting on writers.", file=sys.stderr)
+    yield summary
+    if summary['Invalid'] or summary['Failed']:
+        raise CommandError(f"{summary['Invalid'] + summary['Failed']} record(s) were not ingested.")
+
+def _cmd_summary_rebuild(pool, args):
+    return summaries.rebuild(pool)
+
+def _cmd_summary_check(pool, args):
+    drift = summaries.check(pool, args.limit)
+    yield from drift
+    if drift:
+        raise CommandError(f"{len(drift)} summary value(s) disagree with the fact tables; run summary-rebuild.")
+
+def _cmd_sqlite_init(pool, args):
+    if pool.dialect != 'sqlite':
+        raise CommandError("sqlite-init needs --sqlite PATH; MySQL databases are created from schema.sql.")
+    return sqlite_backend.init_database(pool, populate=args.populate)
+
+def _require_numpy():
+    if snapshot.np is None:
+        raise CommandError("Columnar snapshots need NumPy (pip install numpy).")
+
+def _cmd_snapshot_export(pool, args):
+    _require_numpy()
+    return snapshot.export_snapshot(pool, args.out, args.batch_rows)
+
+def _cmd_analytics(pool, args):
+    _require_numpy()
+    snap = snapshot.Snapshot(args.snapshot)
+    started = time.perf_counter()
+    rows = snapshot.run_report(snap, args.report, limit=args.limit, base_id=args.base_id,
+                               started_after=args.started_after, started_before=args.started_before)
+    print(f"[INFO] {args.report}: {len(rows)} rows in {time.perf_counter() - started:.3f}s "
+          f"(snapshot of {snap.created_at})", file=sys.stderr)
+    return rows
+
+def _cmd_graph(pool, args):
+    started = time.perf_counter()
+    graph = engagement_graph.graph_for(pool, full_check=args.full_check or None)
+    loaded = time.perf_counter() - started
+    with graph.lock:
+        if args.query == 'stats':
+            rows = [graph.stats()]
+        elif args.query == 'neighbors':
+            kind, node_id = _graph_node(args.node, '--node')
+            rows = [{'Kind': k, 'ID': i, 'Hops': d}
+                    for k, i, d in graph.neighborhood(kind, node_id, args.hops, args.kind)][:args.limit]
+        elif args.query == 'path':
+            source, target = _graph_node(args.source, '--from'), _graph_node(args.target, '--to')
+            path = graph.shortest_path(source, target)
+            if path is None:
+                raise CommandError(f"No path between {args.source} and {args.target}.")
+            rows = [{'Step': step, 'Kind': k, 'ID': i} for step, (k, i) in enumerate(path)]
+        else:
+            kind = args.kind or 'trainer'
+            rows = [{'Kind': kind, 'ID': i, 'Degree': degree, 'Distinct_Neighbors': distinct}
+                    for i, degree, distinct in graph.top_degree(kind, args.limit or 10)]
+    print(f"[INFO] graph {args.query}: {len(rows)} rows; {graph.stats()['Edges']} edges, "
+          f"refreshed in {loaded:.3f}s, queried in {time.perf_counter() - started - loaded:.3f}s", file=sys.stderr)
+    return rows
+
+def _graph_node(text, flag):
+    if text is None:
+        raise CommandError(f"This query needs {flag} KIND:ID.")
+    return engagement_graph.parse_node(text)
+
+def _cmd_benchmark(pool, args):
+    scales = [s.strip() for s in args.scales.split(',') if s.strip()] if args.scales else None
+    if args.load and not scales:
+        raise CommandError("--load requires --scales.")
+    report = benchmark.run_suite(pool, scales, args.load, args.seed, args.iterations, args.warmup,
+                                 args.only, args.method)
+    if args.output:
+        benchmark.write_report(report, args.output)
+        print(f"[INFO] Benchmark results written to {args.output}", file=sys.stderr)
+    if not args.baseline:
+        yield from report['results']
+        return
+
+    comparison = benchmark.compare(report, benchmark.read_report(args.baseline), args.metric, args.threshold)
+    yield from comparison
+    regressed = [row for row in comparison if row['regressed']]
+    if regressed:
+        raise CommandError(f"{len(regressed)} operation(s) regressed by more than {args.threshold:.0%} on {args.metric}.")
+
+def _add_paging_arguments(sub):
+    sub.add_argument('--page-size', type=int, help="Return one keyset page of this many rows instead of streaming")
+    sub.add_argument('--page-token', help="Resume after the page that printed this token")
+
+
+def _add_operation_commands(subparsers):
+    """Registers one subcommand per operation on `subparsers`."""
+    sub = subparsers.add_parser('active-missions', help="READ 1: active missions and assigned personnel")
+    _add_paging_arguments(sub)
+    sub.set_defaults(handler=_cmd_active_missions)
+
+    sub = subparsers.add_parser('pending-risk', help="READ 2: total notoriety targeted by pending missions")
+    sub.set_defaults(handler=_cmd_pending_risk)
+
+    sub = subparsers.add_parser('top-personnel', help="READ 3: personnel with the most completed missions")
+    sub.add_argument('--limit', type=int, default=5)
+    sub.set_defaults(handler=_cmd_top_personnel)
+
+    sub = subparsers.add_parser('unassigned-assets', help="READ 4: assets not on an active mission")
+    _add_paging_arguments(sub)
+    sub.set_defaults(handler=_cmd_unassigned_assets)
+
+    sub = subparsers.add_parser('pokemon-type-stats', help="READ 5: average stats per Pokemon type")
+    sub.set_defaults(handler=_cmd_pokemon_type_stats)
+
+    sub = subparsers.add_parser('untargeted-trainers', help="READ 6: high-notoriety trainers no mission targets")
+    sub.add_argument('--min-score', type=int, required=True)
+    sub.add_argument('--rank-by', choices=('notoriety', 'centrality'), default='notoriety',
+                     help="Order by notoriety, or by engagement centrality from the engagement graph (default notoriety)")
+    _add_paging_arguments(sub)
+    sub.set_defaults(handler=_cmd_untargeted_trainers)
+
+    sub = subparsers.add_parser('base-success-rate', help="READ 7: mission success rate per base")
+    sub.set_defaults(handler=_cmd_base_success_rate)
+
+    sub = subparsers.add_parser('search', help="Ranked full-text search over mission objectives or experiment logs")
+    sub.add_argument('query', help="Words to look for; hits are ranked by relevance")
+    sub.add_argument('--in', dest='target', choices=list(search.TARGETS), default='missions',
+                     help="Search mission objectives (with status and personnel) or experiment logs (default missions)")
+    _add_paging_arguments(sub)
+    sub.set_defaults(handler=_cmd_search)
+
+    sub = subparsers.add_parser('recruit', help="WRITE 8: recruit a Boss, Grunt or Scientist")
+    sub.add_argument('--first-name', required=True)
+    sub.add_argument('--last-name', required=True)
+    sub.add_argument('--rank', required=True, choices=operations.VALID_RANKS, type=str.capitalize)
+    sub.add_argument('--base-id', type=int)
+    sub.add_argument('--specialization', help="Scientists only")
+    sub.add_argument('--region', help="Bosses only (Region_Managed)")
+    sub.set_defaults(handler=_cmd_recruit)
+
+    sub = subparsers.add_parser('assign-pokemon', help="WRITE 9: assign a Pokemon to personnel")
+    sub.add_argument('--personnel-id', type=int, required=True)
+    sub.add_argument('--pokemon-id', type=int, required=True)
+    sub.set_defaults(handler=_cmd_assign_pokemon)
+
+    sub = subparsers.add_parser('set-mission-status', help="WRITE 10: update a mission's status")
+    sub.add_argument('--mission-id', type=int, required=True)
+    sub.add_argument('--status', required=True, choices=operations.VALID_MISSION_STATUSES, type=str.capitalize)
+    sub.set_defaults(handler=_cmd_set_mission_status)
+
+    sub = subparsers.add_parser('bulk-set-mission-status',
+                                help="Bulk WRITE 10: update every matching mission, one committed chunk at a time")
+    sub.add_argument('--status', required=True, choices=operations.VALID_MISSION_STATUSES, type=str.capitalize)
+    sub.add_argument('--from-status', action='append', choices=operations.VALID_MISSION_STATUSES, type=str.capitalize,
+                     help="Only missions currently in this status (repeatable)")
+    sub.add_argument('--trainer-id', type=int, help="Only missions targeting this trainer")
+    sub.add_argument('--base-id', type=int, help="Only missions with personnel from this base assigned")
+    sub.add_argument('--started-before', type=datetime.date.fromisoformat, help="Only missions starting before YYYY-MM-DD")
+    sub.add_argument('--started-after', type=datetime.date.fromisoformat, help="Only missions starting on or after YYYY-MM-DD")
+    sub.add_argument('--chunk-size', type=int, default=bulk_status.DEFAULT_CHUNK_SIZE,
+                     help=f"Missions per transaction (default {bulk_status.DEFAULT_CHUNK_SIZE})")
+    sub.add_argument('--pause-ms', type=int, default=0, help="Sleep between chunks to give other writers room (default 0)")
+    sub.add_argument('--after-id', type=int, default=0, help="Resume: skip missions up to and including this Mission_ID")
+    sub.add_argument('--checkpoint', help="Record progress in this file and resume from it on the next run")
+    sub.add_argument('--dry-run', action='store_true', help="Only count the matching missions")
+    sub.set_defaults(handler=_cmd_bulk_set_mission_status)
+
+    sub = subparsers.add_parser('set-pokemon-stats', help="WRITE 11: update a Pokemon's stats")
+    sub.add_argument('--pokemon-id', type=int, required=True)
+    sub.add_argument('--hp', type=int, required=True)
+    sub.add_argument('--attack', type=int, required=True)
+    sub.add_argument('--defense', type=int, required=True)
+    sub.set_defaults(handler=_cmd_set_pokemon_stats)
+
+    sub = subparsers.add_parser('fire', help="WRITE 12: delete a personnel member (cascades)")
+    sub.add_argument('--personnel-id', type=int, required=True)
+    sub.add_argument('--yes', action='store_true', help="Confirm the deletion")
+    sub.set_defaults(handler=_cmd_fire)
+
+    sub = subparsers.add_parser('retire', help="Archive a person's history in batches, then delete them (lock-friendly WRITE 12)")
+    sub.add_argument('--personnel-id', type=int, required=True, action='append', help="Person to retire (repeatable)")
+    sub.add_argument('--report', action='store_true', help="Only count the rows a delete would touch, per table")
+    sub.add_argument('--soft', action='store_true', help="Only set RetiredDate; keep the person and their history")
+    sub.add_argument('--batch-size', type=int, default=personnel_archive.DEFAULT_BATCH_SIZE,
+                     help=f"History rows moved per transaction (default {personnel_archive.DEFAULT_BATCH_SIZE})")
+    sub.add_argument('--pause-ms', type=int, default=0, help="Sleep between batches to give other writers room (default 0)")
+    sub.add_argument('--yes', action='store_true', help="Confirm the retirement")
+    sub.set_defaults(handler=_cmd_retire)
+
+    sub = subparsers.add_parser('archive-missions', help="Move closed missions and their junction rows to the history tables")
+    sub.add_argument('--older-than', type=int, default=mission_archive.DEFAULT_OLDER_THAN_DAYS,
+                     help=f"Archive missions that ended more than this many days ago (default {mission_archive.DEFAULT_OLDER_THAN_DAYS})")
+    sub.add_argument('--report', action='store_true', help="Only count live and archivable rows, per table")
+    sub.add_argument('--batch-size', type=int, default=mission_archive.DEFAULT_BATCH_SIZE,
+                     help=f"Missions moved per transaction (default {mission_archive.DEFAULT_BATCH_SIZE})")
+    sub.add_argument('--pause-ms', type=int, default=0, help="Sleep between batches to give other writers room (default 0)")
+    sub.add_argument('--yes', action='store_true', help="Confirm the archival")
+    sub.set_defaults(handler=_cmd_archive_missions)
+
+    sub = subparsers.add_parser('plan-audit', help="EXPLAIN every report query and flag scans, filesorts and temp tables")
+    sub.add_argument('--query', action='append', choices=list(operations.REPORT_QUERIES),
+                     help="Audit only this query (repeatable)")
+    sub.add_argument('--min-rows', type=int, default=0,
+                     help="Ignore scans the optimizer estimates below this many rows (default 0)")
+    sub.add_argument('--all', action='store_true', help="Also list findings that are expected for the query")
+    sub.set_defaults(handler=_cmd_plan_audit)
+
+    sub = subparsers.add_parser('generate-data', help="Generate (and optionally bulk load) a synthetic dataset")
+    sub.add_argument('--personnel', default='10k', help="Scale factor as a personnel count, e.g. 10k, 1M, 10M (default 10k)")
+    sub.add_argument('--seed', type=int, default=42, help="Random seed; same seed and scale give identical data (default 42)")
+    sub.add_argument('--out-dir', help="Directory for the generated .tsv files (default chimera_data/personnel_<N>_seed_<S>)")
+    sub.add_argument('--load', action='store_true', help="Load the files into the database after generating them")
+    sub.add_argument('--method', choices=('infile', 'insert'), default='infile',
+                     help="LOAD DATA LOCAL INFILE (needs local_infile=ON on the server) or multi-row INSERTs")
+    sub.add_argument('--truncate', action='store_true', help="Empty every table before loading")
+    sub.set_defaults(handler=_cmd_generate_data)
+
+    sub = subparsers.add_parser('dashboard', help="Run the read reports concurrently on one consistent snapshot")
+    sub.add_argument('--report', action='append', choices=list(dashboard.REPORTS), help="Run only this report (repeatable)")
+    sub.add_argument('--timeout', type=float, default=dashboard.DEFAULT_TIMEOUT,
+                     help=f"Seconds each report may take before its query is killed (default {dashboard.DEFAULT_TIMEOUT:g})")
+    sub.add_argument('--report-timeout', action='append', metavar='REPORT=SECONDS', help="Per-report timeout override (repeatable)")
+    sub.add_argument('--min-score', type=int, default=dashboard.DEFAULT_MIN_SCORE,
+                     help=f"Notoriety threshold for untargeted-trainers (default {dashboard.DEFAULT_MIN_SCORE})")
+    sub.add_argument('--limit', type=int, default=dashboard.DEFAULT_LIMIT, help="Rows for top-personnel")
+    sub.add_argument('--max-rows', type=int, help="Stop the list reports after this many rows each")
+    sub.add_argument('--lock-snapshot', action='store_true',
+                     help="Hold FLUSH TABLES WITH READ LOCK while the snapshots open so they are identical (needs RELOAD)")
+    sub.set_defaults(handler=_cmd_dashboard)
+
+    sub = subparsers.add_parser('import-recruits', help="Bulk WRITE 8: recruit many personnel from a CSV or JSON lines file")
+    sub.add_argument('file', help="Input file, or '-' for stdin")
+    sub.add_argument('--input-format', choices=recruit_import.INPUT_FORMATS,
+                     help="Input format (default from the file extension; csv for stdin)")
+    sub.add_argument('--batch-size', type=int, default=recruit_import.DEFAULT_BATCH_SIZE,
+                     help=f"Recruits per transaction (default {recruit_import.DEFAULT_BATCH_SIZE}, max {recruit_import.MAX_BATCH_SIZE})")
+    sub.add_argument('--skip-invalid', action='store_true', help="Import the valid records even if some are invalid")
+    sub.add_argument('--validate-only', action='store_true', help="Check every record (including base IDs) without writing")
+    sub.set_defaults(handler=_cmd_import_recruits)
+
+    sub = subparsers.add_parser('ingest-experiments', help="Stream experiment logs and events from files or stdin into the database")
+    sub.add_argument('files', nargs='+', metavar='FILE', help="Input files, or '-' for stdin")
+    sub.add_argument('--input-format', choices=recruit_import.INPUT_FORMATS,
+                     help="Input format (default from each file's extension; csv for stdin)")
+    sub.add_argument('--batch-size', type=int, default=experiment_ingest.DEFAULT_BATCH_SIZE,
+                     help=f"Rows per INSERT and transaction (default {experiment_ingest.DEFAULT_BATCH_SIZE}, max {experiment_ingest.MAX_BATCH_SIZE})")
+    sub.add_argument('--writers', type=int, default=experiment_ingest.DEFAULT_WRITERS,
+                     help=f"Writer threads, each with its own connection (default {experiment_ingest.DEFAULT_WRITERS})")
+    sub.add_argument('--block-size', type=int, default=experiment_ingest.DEFAULT_BLOCK_SIZE,
+                     help=f"Log_IDs reserved per project at a time (default {experiment_ingest.DEFAULT_BLOCK_SIZE})")
+    sub.add_argument('--max-pending', type=int, default=experiment_ingest.DEFAULT_MAX_PENDING,
+                     help=f"Batches queued for the writers before reading pauses (default {experiment_ingest.DEFAULT_MAX_PENDING})")
+    sub.add_argument('--flush-interval', type=float, default=experiment_ingest.DEFAULT_FLUSH_INTERVAL,
+                     help=f"Seconds a partial batch waits for more records (default {experiment_ingest.DEFAULT_FLUSH_INTERVAL:g})")
+    sub.add_argument('--progress-interval', type=float, default=experiment_ingest.DEFAULT_PROGRESS_INTERVAL,
+                     help=f"Seconds between rows/s lines on stderr, 0 for none (default {experiment_ingest.DEFAULT_PROGRESS_INTERVAL:g})")
+    sub.set_defaults(handler=_cmd_ingest_experiments)
+
+    sub = subparsers.add_parser('summary-rebuild', help="Recompute the summary tables behind READ 5 and READ 7 from scratch")
+    sub.set_defaults(handler=_cmd_summary_rebuild)
+
+    sub = subparsers.add_parser('summary-check', help="Compare the summary tables with the fact tables (exit 1 on drift)")
+    sub.add_argument('--limit', type=int, default=summaries.DEFAULT_DRIFT_LIMIT,
+                     help=f"List at most this many drifted BASE_MISSION_LINK rows (default {summaries.DEFAULT_DRIFT_LIMIT})")
+    sub.set_defaults(handler=_cmd_summary_check)
+
+    sub = subparsers.add_parser('sqlite-init', help="Create the schema in the empty --sqlite database")
+    sub.add_argument('--populate', action='store_true', help="Also load the populate.sql sample data")
+    sub.set_defaults(handler=_cmd_sqlite_init)
+
+    sub = subparsers.add_parser('snapshot-export', help="Export the aggregate reports' tables to a columnar NumPy snapshot")
+    sub.add_argument('--out', required=True, help="Snapshot directory (created if missing, overwritten if present)")
+    sub.add_argument('--batch-rows', type=int, default=snapshot.EXPORT_BATCH_ROWS,
+                     help=f"Rows fetched per batch while streaming (default {snapshot.EXPORT_BATCH_ROWS})")
+    sub.set_defaults(handler=_cmd_snapshot_export)
+
+    sub = subparsers.add_parser('analytics', help="Run an aggregate report on a columnar snapshot instead of the database")
+    sub.add_argument('report', choices=snapshot.REPORTS, help="Report to compute")
+    sub.add_argument('--snapshot', required=True, help="Directory written by snapshot-export")
+    sub.add_argument('--limit', type=int, help="Rows for top-personnel (default 5)")
+    sub.add_argument('--base-id', type=int, help="Only this base (pending-risk: missions with personnel from it)")
+    sub.add_argument('--started-after', type=datetime.date.fromisoformat, help="Only missions starting on or after YYYY-MM-DD")
+    sub.add_argument('--started-before', type=datetime.date.fromisoformat, help="Only missions starting before YYYY-MM-DD")
+    sub.set_defaults(handler=_cmd_analytics)
+
+    sub = subparsers.add_parser('graph', help="Neighborhood, shortest-path and top-degree queries on the in-memory engagement graph")
+    sub.add_argument('query', choices=('neighbors', 'path', 'top-degree', 'stats'), help="Query to run")
+    sub.add_argument('--node', help="neighbors: start node as KIND:ID, e.g. trainer:12")
+    sub.add_argument('--hops', type=int, default=1, help="neighbors: maximum distance in edges (default 1)")
+    sub.add_argument('--kind', choices=engagement_graph.KINDS,
+                     help="neighbors: only list this kind; top-degree: rank this kind (default trainer)")
+    sub.add_argument('--from', dest='source', help="path: start node as KIND:ID")
+    sub.add_argument('--to', dest='target', help="path: end node as KIND:ID")
+    sub.add_argument('--limit', type=int, default=None, help="Maximum rows (top-degree default 10)")
+    sub.add_argument('--full-check', action='store_true', help="Also compare row counts now and reload if rows were deleted")
+    sub.set_defaults(handler=_cmd_graph)
+
+    sub = subparsers.add_parser('benchmark', help="Time all twelve operations and compare against a baseline run")
+    sub.add_argument('--scales', help="Comma-separated personnel counts to benchmark, e.g. 10k,100k,1M (default: the data already loaded)")
+    sub.add_argument('--load', action='store_true', help="Generate and load each scale first (replaces the database contents)")
+    sub.add_argument('--method', choices=('infile', 'insert'), default='infile', help="Bulk load method used with --load")
+    sub.add_argument('--seed', type=int, default=42, help="Seed for the data and the write parameters (default 42)")
+    sub.add_argument('--iterations', type=int, default=benchmark.DEFAULT_ITERATIONS,
+                     help=f"Timed calls per operation (default {benchmark.DEFAULT_ITERATIONS})")
+    sub.add_argument('--warmup', type=int, default=benchmark.DEFAULT_WARMUP,
+                     help=f"Untimed calls per operation first (default {benchmark.DEFAULT_WARMUP})")
+    sub.add_argument('--only', action='append', help="Benchmark only this operation (repeatable)")
+    sub.add_argument('--output', help="Write the full results (with run metadata) to this JSON file")
+    sub.add_argument('--baseline', help="Results file from an earlier run to compare against")
+    sub.add_argument('--metric', choices=benchmark.COMPARABLE_METRICS, default=benchmark.DEFAULT_METRIC,
+                     help=f"Metric compared against the baseline (default {benchmark.DEFAULT_METRIC})")
+    sub.add_argument('--threshold', type=float, default=benchmark.DEFAULT_THRESHOLD,
+                     help=f"Allowed slowdown as a fraction before failing (default {benchmark.DEFAULT_THRESHOLD})")
+    sub.set_defaults(handler=_cmd_benchmark)
+
+    sub = subparsers.add_parser('cache-stats', help="Show result cache hit/miss counters (useful at the end of a batch)")
+    sub.set_defaults(handler=_cmd_cache_stats)
+
+
+# --- Batch Mode ---
+
+class _HelpShown(Exception):
+    """A batch line or daemon request asked for -h/--help; the text is already on stderr."""
+
+
+class _BatchArgumentParser(argparse.ArgumentParser):
+    """
+    Argument parser that raises instead of exiting, so one bad line does not
+    end a batch. Help and usage go to stderr, never stdout: stdout carries the
+    batch's rows, and in the daemon it is the server log, while stderr is
+    captured per request and returned to the client.
+    """
+
+    def error(self, message):
+        raise CommandError(message)
+
+    def exit(self, status=0, message=None):
+        if status == 0 and not message:
+            raise _HelpShown()
+        raise CommandError(message.strip() if message else f"exited with status {status}")
+
+    def print_help(self, file=None):
+        super().print_help(file or sys.stderr)
+
+    def print_usage(self, file=None):
+        super().print_usage(file or sys.stderr)
+
+
+def _build_batch_parser():
+    parser = _BatchArgumentParser(prog='batch', add_help=False)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    _add_operation_commands(subparsers)
+    return parser
+
+
+def run_batch(pool, lines, writer, stop_on_error=False):
+    """
+    Runs one command per line over the shared pool. Blank lines and lines
+    starting with '#' are skipped. Returns the number of failed commands.
+    """
+    parser = _build_batch_parser()
+    failures = 0
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            args = parser.parse_args(shlex.split(line))
+            with metrics.command(args.command):
+                for row in args.handler(pool, args):
+                    writer.write({'_line': line_no, '_command': args.command, **row})
+        except _HelpShown:
+            continue
+        except (CommandError, ValueError, OSError, pymysql.Error) as e:
+            failures += 1
+            print(f"[ERROR] Line {line_no} ({line}): {e}", file=sys.stderr)
+            if stop_on_error:
+                break
+    writer.stream.flush()
+    return failures
+
+
+# --- Daemon Mode ---
+
+def _serve_dispatcher(pool):
+    """
+    Parses daemon requests with the batch parser (built once, then shared by
+    the worker threads) and binds each to the daemon's warm pool.
+    """
+    parser = _build_batch_parser()
+
+    def dispatch(argv):
+        try:
+            args = parser.parse_args(argv)
+        except _HelpShown:
+            return 'help', lambda: iter(())
+        if getattr(args, 'file', None) == '-' or '-' in (getattr(args, 'files', None) or ()):
+            raise CommandError("The daemon has no stdin; pass a file path instead of '-'.")
+        return args.command, lambda: args.handler(pool, args)
+    return dispatch
+
+
+def _encode_row(row):
+    return {key: _to_plain(value) for key, value in row.items()}
+
+
+def run_server(pool, args):
+    """Serves the operation commands until interrupted. Returns the exit status."""
+    service = server.Service(pool, _serve_dispatcher(pool), _encode_row, (CommandError, ValueError, OSError, pymysql.Error),
+                             workers=args.workers, queue_timeout=args.queue_timeout)
+    daemon = server.make_server(service, socket_path=args.socket, host=args.host_address, port=args.port)
+    warmed = service.warm_up()
+    print(f"[INFO] Serving {pool.dsn} on {server.address_of(daemon)} "
+          f"({args.workers} workers, {warmed} warm connections). Ctrl+C or SIGTERM stops.", file=sys.stderr)
+    counters = server.serve(service, daemon)
+    print(f"[SUCCESS] Stopped after {counters['requests']} request(s), {counters['failed']} failed, "
+          f"{counters['rejected']} rejected.", file=sys.stderr)
+    return 0
+
+
+# --- Connection Settings ---
+
+def _default_option_file():
+    path = os.path.expanduser('~/.my.cnf')
+    return path if os.path.exists(path) else None
+
+
+def build_pool(args):
+    """
+    Builds the connection pool from flags, then environment variables, then a
+    MySQL option file ([client] group) for anything still unset. With
+    --sqlite (or CHIMERA_SQLITE_PATH) it opens that SQLite database instead.
+    """
+    sqlite_path = args.sqlite or os.environ.get(ENV_SQLITE_PATH)
+    if sqlite_path:
+        return sqlite_backend.SQLitePool(sqlite_path, max_size=args.pool_size)
+
+    defaults_file = args.defaults_file or os.environ.get(ENV_DEFAULTS_FILE) or _default_option_file()
+    connect_kwargs = {}
+    if defaults_file:
+        connect_kwargs['read_default_file'] = defaults_file
+        connect_kwargs['read_default_group'] = 'client'
+
+    host = args.host or os.environ.get(ENV_HOST) or (None if defaults_file else DEFAULT_HOST)
+    database = args.database or os.environ.get(ENV_DATABASE) or DEFAULT_DATABASE
+    user = args.user or os.environ.get(ENV_USER)
+    password = os.environ.get(ENV_PASSWORD)
+
+    return ConnectionPool(user, password, host, database, max_size=args.pool_size, **connect_kwargs)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='main_app.py',
+        description="Chimera DB headless interface. Run without arguments for the interactive menu.")
+    parser.add_argument('--host', help=f"MySQL host (env {ENV_HOST}, default {DEFAULT_HOST})")
+    parser.add_argument('--database', help=f"Database name (env {ENV_DATABASE}, default {DEFAULT_DATABASE})")
+    parser.add_argument('--user', help=f"MySQL user (env {ENV_USER})")
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help=f"Use this embedded SQLite database (or :memory:) instead of MySQL (env {ENV_SQLITE_PATH})")
+    parser.add_argument('--defaults-file', help=f"MySQL option file with a [client] group (env {ENV_DEFAULTS_FILE}, default ~/.my.cnf)")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='jsonl', help="Output format (default jsonl)")
+    parser.add_argument('--pool-size', type=int, default=2, help="Maximum pooled connections (default 2)")
+    parser.add_argument('--no-cache', action='store_true', help="Bypass the read-report result cache")
+    parser.add_argument('--cache-ttl', type=float, help=f"Seconds a cached report stays valid (default {result_cache.ttl:g})")
+    parser.add_argument('--profile', action='store_true', help="Print a per-query time/rows/bytes breakdown after each command")
+    parser.add_argument('--slow-query-ms', type=float,
+                        help=f"Log queries slower than this many milliseconds (env {ENV_SLOW_QUERY_MS})")
+    parser.add_argument('--slow-log', help="Append slow-query entries to this file as JSON lines (default stderr)")
+    parser.add_argument('--metrics-out', help="Write the collected metrics to this file on exit")
+    parser.add_argument('--metrics-format', choices=('json', 'prometheus'),
+                        help="Format for --metrics-out (default from the extension: .prom/.txt are Prometheus text)")
+
+    subparsers = parser.add_subparsers(dest='command', required=True, metavar='COMMAND')
+    _add_operation_commands(subparsers)
+
+    sub = subparsers.add_parser('batch', help="Run a file of commands (one per line) over one connection pool")
+    sub.add_argument('file', help="Command file, or '-' for stdin")
+    sub.add_argument('--stop-on-error', action='store_true', help="Stop at the first failing command")
+    sub.set_defaults(handler=None)  # run by main(), which owns the writer and exit status
+
+    sub = subparsers.add_parser('serve', help="Run as a warm daemon answering commands over a Unix socket or loopback HTTP")
+    listen = sub.add_mutually_exclusive_group()
+    listen.add_argument('--socket', help=f"Unix socket path (default {server.DEFAULT_SOCKET})")
+    listen.add_argument('--port', type=int, help="Listen on this loopback TCP port instead of a Unix socket")
+    sub.add_argument('--bind', dest='host_address', default='127.0.0.1', help="Loopback address for --port (default 127.0.0.1)")
+    sub.add_argument('--workers', type=int, default=server.DEFAULT_WORKERS,
+                     help=f"Commands run at once; the pool gets one more connection for health checks (default {server.DEFAULT_WORKERS})")
+    sub.add_argument('--queue-timeout', type=float, default=server.DEFAULT_QUEUE_TIMEOUT,
+                     help=f"Seconds a request waits for a free worker before a 503 (default {server.DEFAULT_QUEUE_TIMEOUT:g})")
+    sub.set_defaults(handler=None)  # run by main(), which owns the pool for the daemon's lifetime
+    return parser
+
+
+def main(argv=None):
+    """
+    Headless entry point. Exit status: 0 on success, 1 on a database or
+    command error, 2 on invalid usage.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    writer = RowWriter(sys.stdout, args.format)
+    result_cache.enabled = not args.no_cache
+    if args.cache_ttl is not None:
+        result_cache.ttl = args.cache_ttl
+
+    slow_query_ms = args.slow_query_ms
+    if slow_query_ms is None and os.environ.get(ENV_SLOW_QUERY_MS):
+        try:
+            slow_query_ms = float(os.environ[ENV_SLOW_QUERY_MS])
+        except ValueError:
+            print(f"[ERROR] {ENV_SLOW_QUERY_MS} must be a number of milliseconds.", file=sys.stderr)
+            return 2
+
+    if args.command == 'serve':
+        args.pool_size = max(args.pool_size, args.workers + 1)
+
+    try:
+        pool = build_pool(args)
+        slow_log = open(args.slow_log, 'a', encoding='utf-8') if args.slow_log else None
+    except (ValueError, OSError, pymysql.Error) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 2
+    metrics.registry.configure(slow_query_ms=slow_query_ms, slow_log=slow_log, profile=args.profile)
+
+    try:
+        if args.command == 'batch':
+            if args.file == '-':
+                failures = run_batch(pool, sys.stdin, writer, args.stop_on_error)
+            else:
+                with open(args.file, encoding='utf-8') as f:
+                    failures = run_batch(pool, f, writer, args.stop_on_error)
+            return 1 if failures else 0
+        if args.command == 'serve':
+            return run_server(pool, args)
+
+        with metrics.command(args.command):
+            writer.write_all(args.handler(pool, args))
+        return 0
+    except (CommandError, ValueError, OSError, pymysql.Error) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    finally:
+        pool.close()
+        if slow_log:
+            slow_log.close()
+        if args.metrics_out:
+            try:
+                metrics.registry.dump(args.metrics_out, args.metrics_format)
+            except OSError as e:
+                print(f"[ERROR] Could not write metrics: {e}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
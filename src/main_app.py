@@ -4,188 +4,154 @@ This script provides a clean, professional command-line interface (CLI)
 to interact with the 'chimera_db' database.
 """
 
+import os
 import sys
+import time
 import pymysql
 from getpass import getpass
 
+import metrics
+import dashboard
+import operations
+import personnel_archive
+from cache import result_cache
+from db import create_pool
+
 # --- Database Connection ---
 
-def get_db_connection(db_user, db_pass, db_host, db_name):
+def get_db_pool(db_user, db_pass, db_host, db_name):
     """
-    Establishes a connection to the MySQL database.
+    Creates the shared connection pool that every command borrows from.
     """
-    try:
-        connection = pymysql.connect(
-            host=db_host,
-            user=db_user,
-            password=db_pass,
-            database=db_name,
-            cursorclass=pymysql.cursors.DictCursor,
-            autocommit=False
-        )
+    pool = create_pool(db_user, db_pass, db_host, db_name)
+    if pool:
         print("[SUCCESS] Database connection established.")
-        return connection
-    except pymysql.Error as e:
-        print(f"\n[ERROR] Failed to connect to MySQL Database: {e}", file=sys.stderr)
-        return None
+    return pool
 
 # --- READ (QUERY) OPERATIONS ---
 
-def show_active_missions(connection):
+PAGE_SIZE = 50  # rows shown per page by the list reports
+
+def _pages(fetch_page):
+    """
+    Yields keyset pages from fetch_page(token) until the report runs out or the
+    operator stops paging. Only one page is ever held in memory.
+    """
+    token = None
+    while True:
+        rows, token = fetch_page(token)
+        yield rows
+        if not token:
+            return
+        more = input("\n  > Press Enter for the next page, or 'q' to stop: ").strip().lower()
+        if more == 'q':
+            return
+
+def show_active_missions(pool):
     """
     READ 1: Shows all 'Active' missions and their assigned personnel (multi-JOIN).
     """
     print("\n--- 1. Show Active Missions and Assignments ---")
     try:
-        with connection.cursor() as cursor:
-            sql = """
-                SELECT m.Mission_ID, m.Objective, p.FName, p.LName, ma.Role
-                FROM MISSION m
-                JOIN MISSION_ASSIGNMENT ma ON m.Mission_ID = ma.Mission_ID
-                JOIN PERSONNEL p ON ma.Personnel_ID = p.Personnel_ID
-                WHERE m.Status = 'Active'
-                ORDER BY m.Mission_ID, p.LName
-            """
-            cursor.execute(sql)
-            results = cursor.fetchall()
-
-            if not results:
-                print("\n[INFO] No active missions with assigned personnel found.")
-            else:
+        current_mission_id = None
+        pages = _pages(lambda token: operations.fetch_active_missions_page(pool, PAGE_SIZE, token))
+        for page_no, results in enumerate(pages):
+            if page_no == 0:
+                if not results:
+                    print("\n[INFO] No active missions with assigned personnel found.")
+                    break
                 print("\nCurrent Active Missions:")
-                current_mission_id = None
-                for row in results:
-                    if row['Mission_ID'] != current_mission_id:
-                        print(f"\n  [Mission {row['Mission_ID']}] {row['Objective']}")
-                        current_mission_id = row['Mission_ID']
-                    print(f"    - {row['FName']} {row['LName']} (Role: {row['Role']})")
+            for row in results:
+                if row['Mission_ID'] != current_mission_id:
+                    print(f"\n  [Mission {row['Mission_ID']}] {row['Objective']}")
+                    current_mission_id = row['Mission_ID']
+                print(f"    - {row['FName']} {row['LName']} (Role: {row['Role']})")
 
     except pymysql.Error as e:
         print(f"\n[ERROR] Error during query: {e}", file=sys.stderr)
 
-def calculate_pending_mission_risk(connection):
+def calculate_pending_mission_risk(pool):
     """
     READ 2: Calculates total notoriety of trainers targeted in 'Pending' missions (Aggregate).
     """
     print("\n--- 2. Calculate Pending Mission Risk ---")
     try:
-        with connection.cursor() as cursor:
-            sql = """
-                SELECT COUNT(m.Mission_ID) as Mission_Count, SUM(t.NotorietyScore) AS Total_Risk
-                FROM MISSION m
-                JOIN TRAINER t ON t.Trainer_ID = m.Target_Trainer_ID
-                WHERE m.Status = 'Pending' AND t.NotorietyScore > 0
-            """
-            cursor.execute(sql)
-            result = cursor.fetchone()
-
-            if not result or result['Total_Risk'] is None:
-                print("\n[INFO] No pending missions are targeting trainers with a notoriety score.")
-            else:
-                print(f"\n[RESULT] Total Notoriety Risk for {result['Mission_Count']} pending mission(s): {result['Total_Risk']}")
+        result = operations.fetch_pending_mission_risk(pool)
+
+        if not result or result['Total_Risk'] is None:
+            print("\n[INFO] No pending missions are targeting trainers with a notoriety score.")
+        else:
+            print(f"\n[RESULT] Total Notoriety Risk for {result['Mission_Count']} pending mission(s): {result['Total_Risk']}")
 
     except pymysql.Error as e:
         print(f"\n[ERROR] Error during query: {e}", file=sys.stderr)
 
-def find_top_performing_personnel(connection):
+def find_top_performing_personnel(pool):
     """
     READ 3: Find personnel who have participated in the most 'Completed' missions.
     Uses JOIN, GROUP BY, ORDER BY, LIMIT.
     """
     print("\n--- 3. Top Performing Personnel ---")
     try:
-        with connection.cursor() as cursor:
-            sql = """
-                SELECT p.FName, p.LName, COUNT(ma.Mission_ID) as Mission_Count
-                FROM PERSONNEL p
-                JOIN MISSION_ASSIGNMENT ma ON p.Personnel_ID = ma.Personnel_ID
-                JOIN MISSION m ON ma.Mission_ID = m.Mission_ID
-                WHERE m.Status = 'Completed'
-                GROUP BY p.Personnel_ID, p.FName, p.LName
-                ORDER BY Mission_Count DESC
-                LIMIT 5
-            """
-            cursor.execute(sql)
-            results = cursor.fetchall()
-
-            if not results:
-                print("\n[INFO] No completed missions found.")
-            else:
-                print("\nTop 5 Personnel by Completed Missions:")
-                print(f"  {'Name':<30} | {'Missions Completed':<20}")
-                print("  " + "-"*53)
-                for row in results:
-                    full_name = f"{row['FName']} {row['LName']}"
-                    print(f"  {full_name:<30} | {row['Mission_Count']:<20}")
+        results = operations.fetch_top_performing_personnel(pool, limit=5)
+
+        if not results:
+            print("\n[INFO] No completed missions found.")
+        else:
+            print("\nTop 5 Personnel by Completed Missions:")
+            print(f"  {'Name':<30} | {'Missions Completed':<20}")
+            print("  " + "-"*53)
+            for row in results:
+                full_name = f"{row['FName']} {row['LName']}"
+                print(f"  {full_name:<30} | {row['Mission_Count']:<20}")
 
     except pymysql.Error as e:
         print(f"\n[ERROR] Error during query: {e}", file=sys.stderr)
 
-def list_unassigned_assets(connection):
+def list_unassigned_assets(pool):
     """
     READ 4: List assets that are not currently assigned to any active mission.
     Uses Nested Query (NOT IN).
     """
     print("\n--- 4. List Unassigned Assets ---")
     try:
-        with connection.cursor() as cursor:
-            sql = """
-                SELECT a.Asset_Code, a.Asset_Type, a.Value_Estimate
-                FROM ASSET a
-                WHERE a.Asset_Code NOT IN (
-                    SELECT ma.Asset_Code 
-                    FROM MISSION_ASSETS ma
-                    JOIN MISSION m ON ma.Mission_ID = m.Mission_ID
-                    WHERE m.Status = 'Active'
-                )
-                ORDER BY a.Value_Estimate DESC
-            """
-            cursor.execute(sql)
-            results = cursor.fetchall()
-
-            if not results:
-                print("\n[INFO] All assets are currently assigned to active missions.")
-            else:
+        pages = _pages(lambda token: operations.fetch_unassigned_assets_page(pool, PAGE_SIZE, token))
+        for page_no, results in enumerate(pages):
+            if page_no == 0:
+                if not results:
+                    print("\n[INFO] All assets are currently assigned to active missions.")
+                    break
                 print("\n All Unassigned Assets:")
                 print(f"  {'Code':<15} | {'Type':<20} | {'Value':<15}")
                 print("  " + "-"*54)
-                for row in results:
-                    print(f"  {row['Asset_Code']:<15} | {row['Asset_Type']:<20} | {row['Value_Estimate']:<15}")
+            for row in results:
+                print(f"  {row['Asset_Code']:<15} | {row['Asset_Type']:<20} | {row['Value_Estimate']:<15}")
 
     except pymysql.Error as e:
         print(f"\n[ERROR] Error during query: {e}", file=sys.stderr)
 
-def analyze_pokemon_stats_by_type(connection):
+def analyze_pokemon_stats_by_type(pool):
     """
     READ 5: Average HP, Attack, Defense for each Pokemon type.
     Uses JOIN, GROUP BY, AVG.
     """
     print("\n--- 5. Analyze Pokemon Stats by Type ---")
     try:
-        with connection.cursor() as cursor:
-            sql = """
-                SELECT pt.Type, AVG(p.HP) as Avg_HP, AVG(p.Attack) as Avg_Atk, AVG(p.Defense) as Avg_Def
-                FROM POKEMON p
-                JOIN POKEMON_TYPE pt ON p.Pokemon_ID = pt.Pokemon_ID
-                GROUP BY pt.Type
-                ORDER BY Avg_Atk DESC
-            """
-            cursor.execute(sql)
-            results = cursor.fetchall()
-
-            if not results:
-                print("\n[INFO] No Pokemon data available.")
-            else:
-                print("\nAverage Stats by Pokemon Type:")
-                print(f"  {'Type':<15} | {'Avg HP':<10} | {'Avg Atk':<10} | {'Avg Def':<10}")
-                print("  " + "-"*53)
-                for row in results:
-                    print(f"  {row['Type']:<15} | {row['Avg_HP']:<10.2f} | {row['Avg_Atk']:<10.2f} | {row['Avg_Def']:<10.2f}")
+        results = operations.fetch_pokemon_stats_by_type(pool)
+
+        if not results:
+            print("\n[INFO] No Pokemon data available.")
+        else:
+            print("\nAverage Stats by Pokemon Type:")
+            print(f"  {'Type':<15} | {'Avg HP':<10} | {'Avg Atk':<10} | {'Avg Def':<10}")
+            print("  " + "-"*53)
+            for row in results:
+                print(f"  {row['Type']:<15} | {row['Avg_HP']:<10.2f} | {row['Avg_Atk']:<10.2f} | {row['Avg_Def']:<10.2f}")
 
     except pymysql.Error as e:
         print(f"\n[ERROR] Error during query: {e}", file=sys.stderr)
 
-def find_trainers_with_high_notoriety_no_mission(connection):
+def find_trainers_with_high_notoriety_no_mission(pool):
     """
     READ 6: Find trainers with NotorietyScore > X who are not targeted by any mission.
     Uses LEFT JOIN with NULL check.
@@ -196,63 +162,43 @@ def find_trainers_with_high_notoriety_no_mission(connection):
         if not score_threshold.isdigit():
             print("[ERROR] Please enter a valid number.")
             return
-        
-        with connection.cursor() as cursor:
-            sql = """
-                SELECT t.Name, t.Affiliation, t.NotorietyScore
-                FROM TRAINER t
-                LEFT JOIN MISSION m ON t.Trainer_ID = m.Target_Trainer_ID
-                WHERE t.NotorietyScore > %s AND m.Mission_ID IS NULL
-                ORDER BY t.NotorietyScore DESC
-            """
-            cursor.execute(sql, (int(score_threshold),))
-            results = cursor.fetchall()
-
-            if not results:
-                print(f"\n[INFO] No untargeted trainers found with score > {score_threshold}.")
-            else:
+
+        pages = _pages(lambda token: operations.fetch_untargeted_trainers_page(
+            pool, int(score_threshold), PAGE_SIZE, token))
+        for page_no, results in enumerate(pages):
+            if page_no == 0:
+                if not results:
+                    print(f"\n[INFO] No untargeted trainers found with score > {score_threshold}.")
+                    break
                 print(f"\nUntargeted Trainers with Notoriety > {score_threshold}:")
                 print(f"  {'Name':<25} | {'Affiliation':<20} | {'Score':<10}")
                 print("  " + "-"*60)
-                for row in results:
-                    print(f"  {row['Name']:<25} | {row['Affiliation']:<20} | {row['NotorietyScore']:<10}")
+            for row in results:
+                print(f"  {row['Name']:<25} | {row['Affiliation']:<20} | {row['NotorietyScore']:<10}")
 
     except pymysql.Error as e:
         print(f"\n[ERROR] Error during query: {e}", file=sys.stderr)
 
-def mission_success_rate_by_base(connection):
+def mission_success_rate_by_base(pool):
     """
     READ 7: Calculate the percentage of completed missions for personnel from each base.
     Uses Complex JOIN, GROUP BY, Conditional Aggregation.
     """
     print("\n--- 7. Mission Success Rate by Base ---")
     try:
-        with connection.cursor() as cursor:
-            sql = """
-                SELECT b.Name as Base_Name, 
-                       COUNT(DISTINCT m.Mission_ID) as Total_Missions,
-                       SUM(CASE WHEN m.Status = 'Completed' THEN 1 ELSE 0 END) as Completed_Missions
-                FROM BASE b
-                JOIN PERSONNEL p ON b.Base_ID = p.Base_ID
-                JOIN MISSION_ASSIGNMENT ma ON p.Personnel_ID = ma.Personnel_ID
-                JOIN MISSION m ON ma.Mission_ID = m.Mission_ID
-                GROUP BY b.Base_ID, b.Name
-                ORDER BY Total_Missions DESC
-            """
-            cursor.execute(sql)
-            results = cursor.fetchall()
-
-            if not results:
-                print("\n[INFO] No mission data available for bases.")
-            else:m.Mission_ID IS NULL
-                print("\nMission Statistics by Base:")
-                print(f"  {'Base Name':<25} | {'Total':<10} | {'Completed':<10} | {'Success Rate':<15}")
-                print("  " + "-"*68)
-                for row in results:
-                    total = row['Total_Missions']
-                    completed = row['Completed_Missions']
-                    rate = (completed / total * 100) if total > 0 else 0
-                    print(f"  {row['Base_Name']:<25} | {total:<10} | {completed:<10} | {rate:<6.2f}%")
+        results = operations.fetch_mission_success_rate_by_base(pool)
+
+        if not results:
+            print("\n[INFO] No mission data available for bases.")
+        else:
+            print("\nMission Statistics by Base:")
+            print(f"  {'Base Name':<25} | {'Total':<10} | {'Completed':<10} | {'Success Rate':<15}")
+            print("  " + "-"*68)
+            for row in results:
+                total = row['Total_Missions']
+                completed = row['Completed_Missions']
+                rate = row['Success_Rate']
+                print(f"  {row['Base_Name']:<25} | {total:<10} | {completed:<10} | {rate:<6.2f}%")
 
     except pymysql.Error as e:
         print(f"\n[ERROR] Error during query: {e}", file=sys.stderr)
@@ -260,7 +206,7 @@ def mission_success_rate_by_base(connection):
 
 # --- WRITE (C/U/D) OPERATIONS ---
 
-def recruit_new_personnel(connection):
+def recruit_new_personnel(pool):
     """
     WRITE 8 (INSERT): Recruits new personnel and assigns them a rank.
     """
@@ -270,7 +216,7 @@ def recruit_new_personnel(connection):
         lname = input("  > Last Name: ").strip()
         rank = input("  > Rank (Boss, Grunt, Scientist): ").strip().capitalize()
         
-        if rank not in ('Boss', 'Grunt', 'Scientist'):
+        if rank not in operations.VALID_RANKS:
             print("[ERROR] Invalid rank.")
             return
 
@@ -279,34 +225,22 @@ def recruit_new_personnel(connection):
         base_id = input("  > Base ID (Press Enter for keeping NULL): ").strip()
         base_id = int(base_id) if base_id else None
 
-        with connection.cursor() as cursor:
-            # 1. Insert into PERSONNEL
-            sql_personnel = "INSERT INTO PERSONNEL (FName, LName, `Rank`, StartDate, Base_ID) VALUES (%s, %s, %s, CURDATE(), %s)"
-            cursor.execute(sql_personnel, (fname, lname, rank, base_id))
-            personnel_id = cursor.lastrowid
-
-            # 2. Insert into Subclass Table
-            if rank == 'Grunt':
-                # Assign to a squad? Let's leave it NULL for now or ask.
-                cursor.execute("INSERT INTO GRUNT (Grunt_Personnel_ID) VALUES (%s)", (personnel_id,))
-            elif rank == 'Scientist':
-                spec = input("  > Specialization: ").strip()
-                cursor.execute("INSERT INTO SCIENTIST (Scientist_Personnel_ID, Specialization) VALUES (%s, %s)", (personnel_id, spec))
-            elif rank == 'Boss':
-                region = input("  > Region Managed: ").strip()
-                cursor.execute("INSERT INTO BOSS (Boss_Personnel_ID, Region_Managed) VALUES (%s, %s)", (personnel_id, region))
-        
-        connection.commit()
+        # Collect the subclass details before borrowing a connection, so no
+        # transaction is held open while waiting on the operator.
+        spec = input("  > Specialization: ").strip() if rank == 'Scientist' else None
+        region = input("  > Region Managed: ").strip() if rank == 'Boss' else None
+
+        personnel_id = operations.recruit_personnel(pool, fname, lname, rank, base_id,
+                                                    specialization=spec, region=region)
         print(f"\n[SUCCESS] Recruited {rank} {fname} {lname} (ID: {personnel_id}).")
 
     except pymysql.Error as e:
+        # The pool rolls back the borrowed connection before reusing it.
         print(f"\n[ERROR] Error during recruitment: {e}", file=sys.stderr)
-        connection.rollback()
     except ValueError:
         print("\n[ERROR] Invalid input.")
-        connection.rollback()
 
-def assign_pokemon_to_personnel(connection):
+def assign_pokemon_to_personnel(pool):
     """
     WRITE 9 (INSERT): Assigns a Pokemon to a personnel member.
     """
@@ -315,20 +249,17 @@ def assign_pokemon_to_personnel(connection):
         personnel_id = int(input("  > Personnel ID: "))
         pokemon_id = int(input("  > Pokemon ID: "))
 
-        with connection.cursor() as cursor:
-            sql = "INSERT INTO OWNERSHIP (Personnel_ID, Pokemon_ID) VALUES (%s, %s)"
-            cursor.execute(sql, (personnel_id, pokemon_id))
-        
-        connection.commit()
+        operations.assign_pokemon(pool, personnel_id, pokemon_id)
         print(f"\n[SUCCESS] Pokemon {pokemon_id} assigned to Personnel {personnel_id}.")
 
     except pymysql.Error as e:
         print(f"\n[ERROR] Error during assignment: {e}", file=sys.stderr)
-        connection.rollback()
+    except operations.RetiredPersonnelError as e:
+        print(f"\n[ERROR] {e}")
     except ValueError:
         print("\n[ERROR] Invalid ID.")
 
-def update_mission_status(connection):
+def update_mission_status(pool):
     """
     WRITE 10 (UPDATE): Updates the status of an existing mission.
     """
@@ -336,7 +267,7 @@ def update_mission_status(connection):
     try:
         mission_id = int(input("  > Enter Mission ID to update: "))
         
-        valid_statuses = ('Pending', 'Active', 'Completed', 'Failed', 'Aborted')
+        valid_statuses = operations.VALID_MISSION_STATUSES
         print(f"  Valid statuses are: {valid_statuses}")
         new_status = input("  > Enter new status: ").strip().capitalize()
 
@@ -344,29 +275,19 @@ def update_mission_status(connection):
             print(f"\n[ERROR] Invalid status '{new_status}'.")
             return
 
-        # If mission is ending, set EndDate.
-        end_date_sql = ", EndDate = CURDATE()" if new_status in ('Completed', 'Failed', 'Aborted') else ""
-        
-        with connection.cursor() as cursor:
-            # Note: f-string is safe here *only* because we are not using user input in it.
-            # The user input (new_status, mission_id) is still parameterized.
-            sql = f"UPDATE MISSION SET Status = %s{end_date_sql} WHERE Mission_ID = %s"
-            rows_affected = cursor.execute(sql, (new_status, mission_id))
+        rows_affected = operations.set_mission_status(pool, mission_id, new_status)
 
         if rows_affected == 0:
             print(f"\n[INFO] No mission found with ID {mission_id}. No updates made.")
         else:
-            connection.commit()
             print(f"\n[SUCCESS] Mission {mission_id} status updated to '{new_status}'.")
 
     except pymysql.Error as e:
         print(f"\n[ERROR] Error during update: {e}", file=sys.stderr)
-        connection.rollback()
     except ValueError:
         print("\n[ERROR] Invalid Mission ID. Please enter a number.")
-        connection.rollback()
 
-def update_pokemon_stats(connection):
+def update_pokemon_stats(pool):
     """
     WRITE 11 (UPDATE): Updates a Pokemon's stats.
     """
@@ -381,23 +302,19 @@ def update_pokemon_stats(connection):
             print("[ERROR] Stats must be positive.")
             return
 
-        with connection.cursor() as cursor:
-            sql = "UPDATE POKEMON SET HP = %s, Attack = %s, Defense = %s WHERE Pokemon_ID = %s"
-            rows = cursor.execute(sql, (new_hp, new_atk, new_def, pokemon_id))
-        
+        rows = operations.set_pokemon_stats(pool, pokemon_id, new_hp, new_atk, new_def)
+
         if rows == 0:
             print(f"\n[INFO] No Pokemon found with ID {pokemon_id}.")
         else:
-            connection.commit()
             print(f"\n[SUCCESS] Pokemon {pokemon_id} stats updated.")
 
     except pymysql.Error as e:
         print(f"\n[ERROR] Error during update: {e}", file=sys.stderr)
-        connection.rollback()
     except ValueError:
         print("\n[ERROR] Invalid input.")
 
-def fire_personnel(connection):
+def fire_personnel(pool):
     """
     WRITE 12 (DELETE): Fires (deletes) a personnel member.
     """
@@ -410,26 +327,145 @@ def fire_personnel(connection):
             print("[INFO] Operation cancelled.")
             return
 
-        with connection.cursor() as cursor:
-            # ON DELETE CASCADE should handle the subclass tables
-            sql = "DELETE FROM PERSONNEL WHERE Personnel_ID = %s"
-            rows = cursor.execute(sql, (personnel_id,))
-        
+        # ON DELETE CASCADE should handle the subclass tables
+        rows = operations.delete_personnel(pool, personnel_id)
+
         if rows == 0:
             print(f"\n[INFO] No personnel found with ID {personnel_id}.")
         else:
-            connection.commit()
             print(f"\n[SUCCESS] Personnel {personnel_id} has been fired.")
 
     except pymysql.Error as e:
         print(f"\n[ERROR] Error during deletion: {e}", file=sys.stderr)
-        connection.rollback()
     except ValueError:
         print("\n[ERROR] Invalid ID.")
 
+def retire_personnel(pool):
+    """
+    Alternative to WRITE 12 for personnel with long histories: their history
+    is moved to the archive tables in small batches first, so the final
+    delete has nothing left to cascade (see personnel_archive.py).
+    """
+    print("\n--- 13. (DELETE) Retire Personnel (archive history first) ---")
+    try:
+        personnel_id = int(input("  > Personnel ID to Retire: "))
+        report = personnel_archive.preflight(pool, personnel_id)
+        if not report:
+            print(f"\n[INFO] No personnel found with ID {personnel_id}.")
+            return
+
+        print("  This will archive and remove:")
+        for row in report:
+            if row['Rows']:
+                print(f"    {row['Table']:<22} {row['Rows']:>8}  ({row['On_Delete']})")
+        confirm = input(f"  > Are you sure you want to retire ID {personnel_id}? (y/n): ").lower()
+
+        if confirm != 'y':
+            print("[INFO] Operation cancelled.")
+            return
+
+        archived = deleted = 0
+        for step in personnel_archive.retire(pool, personnel_id):
+            if step['Step'] == 'archive':
+                archived += step['Rows']
+                print(f"  ... archived {archived} history rows", end='\r')
+            else:
+                deleted += step['Rows']
+
+        if deleted == 0:
+            print(f"\n[INFO] No personnel found with ID {personnel_id}.")
+        else:
+            print(f"\n[SUCCESS] Personnel {personnel_id} has been retired ({archived} history rows archived).")
+
+    except pymysql.Error as e:
+        print(f"\n[ERROR] Error during retirement: {e}", file=sys.stderr)
+    except ValueError:
+        print("\n[ERROR] Invalid ID.")
+
+# --- SYSTEM ---
+
+def show_cache_stats():
+    """
+    Shows the read-report result cache counters.
+    """
+    print("\n--- Result Cache Statistics ---")
+    stats = result_cache.stats()
+    for key, value in stats.items():
+        print(f"  {key:<15} : {value}")
+
+def _print_table(rows, max_width=30):
+    """Prints dict rows as a plain aligned table (columns from the first row)."""
+    columns = list(rows[0])
+    cells = [[str(row[c])[:max_width] for c in columns] for row in rows]
+    widths = [max(len(c), *(len(line[i]) for line in cells)) for i, c in enumerate(columns)]
+    print("  " + " | ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    print("  " + "-+-".join("-" * w for w in widths))
+    for line in cells:
+        print("  " + " | ".join(v.ljust(w) for v, w in zip(line, widths)))
+
+def show_dashboard(pool):
+    """
+    Runs every read report at once on a consistent snapshot and prints each
+    one as soon as it finishes.
+    """
+    print("\n--- Operations Dashboard ---")
+    started = time.perf_counter()
+    try:
+        for result in dashboard.run_dashboard(pool, max_rows=PAGE_SIZE):
+            print(f"\n[{result['Report']}] {result['Status']} in {result['Seconds']:.2f}s")
+            if result['Status'] != 'ok':
+                print(f"  [ERROR] {result['Error']}")
+            elif result['Rows']:
+                _print_table(result['Rows'])
+            else:
+                print("  (no rows)")
+    except pymysql.Error as e:
+        print(f"\n[ERROR] Dashboard failed: {e}", file=sys.stderr)
+        return
+    print(f"\n[INFO] Dashboard finished in {time.perf_counter() - started:.2f}s "
+          f"(list reports show at most {PAGE_SIZE} rows).")
+
+def show_metrics():
+    """
+    Shows per-command latency and the slowest query fingerprints recorded so far.
+    """
+    print("\n--- Query Metrics ---")
+    snapshot = metrics.registry.to_dict()
+    print(f"  commits: {snapshot['commits']}   rollbacks: {snapshot['rollbacks']}   "
+          f"received: {snapshot['bytes_received'] / 1024:.1f} KB   sent: {snapshot['bytes_sent'] / 1024:.1f} KB")
+
+    print(f"\n  {'Command':<45} | {'Calls':>5} | {'p50 ms':>7} | {'Max ms':>9} | {'Rows':>8}")
+    print("  " + "-" * 85)
+    for name, stats in sorted(snapshot['commands'].items()):
+        latency = stats['latency']
+        print(f"  {name:<45} | {latency['count']:>5} | {latency['p50_ms']:>7} | {latency['max_ms']:>9.1f} | {stats['rows']:>8}")
+
+    print(f"\n  {'Query (slowest total first)':<58} | {'Calls':>5} | {'Total ms':>9} | {'Rows':>8}")
+    print("  " + "-" * 90)
+    queries = sorted(snapshot['queries'].values(), key=lambda q: -q['latency']['sum_ms'])[:10]
+    for query in queries:
+        sql = query['sql'][:55] + '...' if len(query['sql']) > 58 else query['sql']
+        print(f"  {sql:<58} | {query['latency']['count']:>5} | {query['latency']['sum_ms']:>9.1f} | {query['rows']:>8}")
+
 # --- Main Application Loop ---
 
-def main_cli(connection):
+MENU_COMMANDS = {
+    '1': show_active_missions,
+    '2': calculate_pending_mission_risk,
+    '3': find_top_performing_personnel,
+    '4': list_unassigned_assets,
+    '5': analyze_pokemon_stats_by_type,
+    '6': find_trainers_with_high_notoriety_no_mission,
+    '7': mission_success_rate_by_base,
+    '8': recruit_new_personnel,
+    '9': assign_pokemon_to_personnel,
+    '10': update_mission_status,
+    '11': update_pokemon_stats,
+    '12': fire_personnel,
+    '13': retire_personnel,
+}
+
+def main_cli(pool):
     """
     The main command-line interface loop.
     """
@@ -452,36 +488,27 @@ def main_cli(connection):
             print("   10. (UPDATE) Update Mission Status")
             print("   11. (UPDATE) Update Pokemon Stats")
             print("   12. (DELETE) Fire Personnel")
+            print("   13. (DELETE) Retire Personnel (archive history first)")
             print("\n [SYSTEM]")
+            print("   d. Operations Dashboard (all reports at once)")
+            print("   s. Result Cache Statistics")
+            print("   m. Query Metrics")
             print("   q. Quit")
             print("="*42)
             
             choice = input("  > Enter choice: ").strip().lower()
 
-            if choice == '1':
-                show_active_missions(connection)
-            elif choice == '2':
-                calculate_pending_mission_risk(connection)
-            elif choice == '3':
-                find_top_performing_personnel(connection)
-            elif choice == '4':
-                list_unassigned_assets(connection)
-            elif choice == '5':
-                analyze_pokemon_stats_by_type(connection)
-            elif choice == '6':
-                find_trainers_with_high_notoriety_no_mission(connection)
-            elif choice == '7':
-                mission_success_rate_by_base(connection)
-            elif choice == '8':
-                recruit_new_personnel(connection)
-            elif choice == '9':
-                assign_pokemon_to_personnel(connection)
-            elif choice == '10':
-                update_mission_status(connection)
-            elif choice == '11':
-                update_pokemon_stats(connection)
-            elif choice == '12':
-                fire_personnel(connection)
+            command = MENU_COMMANDS.get(choice)
+            if command:
+                with metrics.command(command.__name__):
+                    command(pool)
+            elif choice == 'd':
+                with metrics.command('show_dashboard'):
+                    show_dashboard(pool)
+            elif choice == 's':
+                show_cache_stats()
+            elif choice == 'm':
+                show_metrics()
             elif choice == 'q':
                 print("\n[INFO] Exiting application...")
                 break
@@ -489,8 +516,8 @@ def main_cli(connection):
                 print("\n[ERROR] Invalid choice. Please try again.")
     
     finally:
-        if connection:
-            connection.close()
+        if pool:
+            pool.close()
             print("[INFO] Database connection closed.")
 
 
@@ -498,8 +525,25 @@ def main_cli(connection):
 
 if __name__ == "__main__":
     """
-    Main entry point for the application.
+    Main entry point for the application. Any command-line arguments switch
+    to the headless interface (see headless.py); none starts the menu.
     """
+    if len(sys.argv) > 1:
+        import headless
+        sys.exit(headless.main(sys.argv[1:]))
+
+    sqlite_path = os.environ.get('CHIMERA_SQLITE_PATH')
+    if sqlite_path:
+        # Embedded database: no server, so no login (see sqlite_backend.py).
+        import sqlite_backend
+        try:
+            db_pool = sqlite_backend.SQLitePool(sqlite_path)
+        except pymysql.Error as e:
+            print(f"\n[FATAL] Cannot open SQLite database '{sqlite_path}': {e}")
+            sys.exit(1)
+        main_cli(db_pool)
+        sys.exit(0)
+
     DB_HOST = 'localhost'
     DB_NAME = 'chimera_db'
     
@@ -507,10 +551,10 @@ if __name__ == "__main__":
     DB_USER = input("  > Username: ").strip()
     DB_PASS = getpass("  > Password: ")
 
-    db_conn = get_db_connection(DB_USER, DB_PASS, DB_HOST, DB_NAME)
+    db_pool = get_db_pool(DB_USER, DB_PASS, DB_HOST, DB_NAME)
 
-    if db_conn:
-        main_cli(db_conn)
+    if db_pool:
+        main_cli(db_pool)
     else:
         print("\n[FATAL] Application cannot start without a database connection.")
         sys.exit(1)
\ No newline at end of file
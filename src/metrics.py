@@ -0,0 +1,472 @@
+"""
+Instrumentation (metrics.py)
+Records latency histograms, rows, bytes on the wire and commit/rollback counts
+for every query and command, logs slow queries, and exports everything as
+JSON or Prometheus text. The connection pool opens InstrumentedConnection
+objects with instrumented cursors, so every operation is covered without
+changes at the call sites; commands are attributed with `with command(name):`.
+
+    python3 main_app.py --profile base-success-rate
+    python3 main_app.py --slow-query-ms 200 --slow-log slow.jsonl batch nightly.txt
+    python3 main_app.py --metrics-out metrics.prom batch nightly.txt
+"""
+
+import re
+import sys
+import json
+import time
+import hashlib
+import datetime
+import threading
+from contextlib import contextmanager
+
+import pymysql
+from pymysql.constants import SERVER_STATUS
+
+# Upper bounds in milliseconds; the last bucket is +Inf.
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+SLOW_LOG_PARAMS_MAX = 500   # characters of parameters kept per slow-log entry
+PROFILE_SQL_WIDTH = 70
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (not thread-safe; the registry locks around it)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, pct):
+        """Upper bound of the bucket holding the pct-th percentile (max for the +Inf bucket)."""
+        if not self.count:
+            return None
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum_ms': round(self.sum, 3),
+            'max_ms': round(self.max, 3),
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'buckets_ms': {str(b): n for b, n in zip(list(self.buckets) + ['+Inf'], self.counts)},
+        }
+
+
+# --- Query Fingerprints ---
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+
+
+def fingerprint(sql):
+    """
+    Normalizes a statement so executions that differ only in literals or in
+    the length of an IN (...) list share one entry. Returns (query_id, text).
+    """
+    text = _WHITESPACE.sub(' ', sql).strip()
+    text = _STRING_LITERAL.sub('?', text)
+    text = _NUMBER_LITERAL.sub('?', text)
+    text = _PLACEHOLDER_LIST.sub('(...)', text)
+    return hashlib.md5(text.encode()).hexdigest()[:12], text
+
+
+# --- Registry ---
+
+class _QueryStats:
+    def __init__(self, text):
+        self.text = text
+        self.latency = Histogram()
+        self.rows = 0
+        self.errors = 0
+
+
+class _CommandStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.queries = 0
+        self.rows = 0
+        self.errors = 0
+
+
+class _Invocation:
+    """What one running command did; kept per thread for --profile."""
+
+    def __init__(self, name):
+        self.name = name
+        self.queries = {}   # query_id -> [text, executions, ms, rows]
+        self.rows = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+class MetricsRegistry:
+    """Process-wide, thread-safe store for every metric this module records."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.slow_query_ms = None
+        self.slow_log = None        # stream for slow-query entries (stderr when None)
+        self.profile = False
+        self.profile_stream = sys.stderr
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.queries = {}
+            self.commands = {}
+            self.commits = 0
+            self.rollbacks = 0
+            self.bytes_sent = 0
+            self.bytes_received = 0
+            self.started_at = datetime.datetime.now()
+
+    def configure(self, slow_query_ms=None, slow_log=None, profile=None):
+        if slow_query_ms is not None:
+            self.slow_query_ms = slow_query_ms if slow_query_ms > 0 else None
+        if slow_log is not None:
+            self.slow_log = slow_log
+        if profile is not None:
+            self.profile = profile
+
+    def _current(self):
+        return getattr(self._local, 'invocation', None)
+
+    # --- Recording (called by the instrumented connection and cursors) ---
+
+    def record_query(self, sql, params, ms, rows, error=None):
+        query_id, text = fingerprint(sql)
+        invocation = self._current()
+        with self._lock:
+            stats = self.queries.get(query_id)
+            if stats is None:
+                stats = self.queries[query_id] = _QueryStats(text)
+            stats.latency.observe(ms)
+            stats.rows += rows
+            if error is not None:
+                stats.errors += 1
+        if invocation is not None:
+            entry = invocation.queries.setdefault(query_id, [text, 0, 0.0, 0])
+            entry[1] += 1
+            entry[2] += ms
+            entry[3] += rows
+            invocation.rows += rows
+        if self.slow_query_ms is not None and ms >= self.slow_query_ms:
+            self._log_slow(text, params, ms, rows, invocation, error)
+        return query_id
+
+    def record_rows(self, query_id, rows):
+        """Rows fetched after execute() returned (unbuffered cursors)."""
+        invocation = self._current()
+        with self._lock:
+            stats = self.queries.get(query_id)
+            if stats is not None:
+                stats.rows += rows
+        if invocation is not None:
+            entry = invocation.queries.get(query_id)
+            if entry is not None:
+                entry[3] += rows
+            invocation.rows += rows
+
+    def record_bytes(self, sent=0, received=0):
+        invocation = self._current()
+        with self._lock:
+            self.bytes_sent += sent
+            self.bytes_received += received
+        if invocation is not None:
+            invocation.bytes_sent += sent
+            invocation.bytes_received += received
+
+    def record_transaction(self, committed):
+        invocation = self._current()
+        with self._lock:
+            if committed:
+                self.commits += 1
+            else:
+                self.rollbacks += 1
+        if invocation is not None:
+            if committed:
+                invocation.commits += 1
+            else:
+                invocation.rollbacks += 1
+
+    def _log_slow(self, text, params, ms, rows, invocation, error):
+        entry = {
+            'ts': datetime.datetime.now().isoformat(timespec='milliseconds'),
+            'command': invocation.name if invocation else None,
+            'ms': round(ms, 3),
+            'rows': rows,
+            'sql': text,
+            'params': repr(params)[:SLOW_LOG_PARAMS_MAX] if params is not None else None,
+            'error': str(error) if error is not None else None,
+        }
+        if self.slow_log is None:
+            print(f"[SLOW] {entry['ms']} ms ({entry['command'] or '-'}) {text} -- params: {entry['params']}",
+                  file=sys.stderr)
+        else:
+            self.slow_log.write(json.dumps(entry) + "\n")
+            self.slow_log.flush()
+
+    # --- Commands ---
+
+    @contextmanager
+    def command(self, name):
+        """
+        Attributes every query run by this thread inside the block to `name`
+        and records the command's own latency. Nested blocks count once, under
+        the outermost command.
+        """
+        if self._current() is not None:
+            yield
+            return
+        invocation = self._local.invocation = _Invocation(name)
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            self._local.invocation = None
+            with self._lock:
+                stats = self.commands.setdefault(name, _CommandStats())
+                stats.latency.observe(ms)
+                stats.queries += sum(entry[1] for entry in invocation.queries.values())
+                stats.rows += invocation.rows
+                if failed:
+                    stats.errors += 1
+            if self.profile:
+                self._print_profile(invocation, ms, failed)
+
+    def _print_profile(self, invocation, ms, failed):
+        out = self.profile_stream
+        executions = sum(entry[1] for entry in invocation.queries.values())
+        print(f"[PROFILE] {invocation.name}: {ms:.1f} ms{' (failed)' if failed else ''}, "
+              f"{executions} queries, {invocation.rows} rows, "
+              f"{invocation.bytes_received / 1024:.1f} KB in / {invocation.bytes_sent / 1024:.1f} KB out, "
+              f"{invocation.commits} commits, {invocation.rollbacks} rollbacks", file=out)
+        for text, count, query_ms, rows in sorted(invocation.queries.values(), key=lambda e: -e[2]):
+            sql = text if len(text) <= PROFILE_SQL_WIDTH else text[:PROFILE_SQL_WIDTH - 3] + '...'
+            print(f"  {query_ms:9.1f} ms {count:5}x {rows:8} rows  {sql}", file=out)
+        out.flush()
+
+    # --- Export ---
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'commits': self.commits,
+                'rollbacks': self.rollbacks,
+                'bytes_sent': self.bytes_sent,
+                'bytes_received': self.bytes_received,
+                'commands': {
+                    name: {'latency': s.latency.to_dict(), 'queries': s.queries, 'rows': s.rows, 'errors': s.errors}
+                    for name, s in self.commands.items()
+                },
+                'queries': {
+                    query_id: {'sql': s.text, 'latency': s.latency.to_dict(), 'rows': s.rows, 'errors': s.errors}
+                    for query_id, s in self.queries.items()
+                },
+            }
+
+    def to_prometheus(self):
+        lines = []
+
+        def histogram(metric, help_text, label, series):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for value, hist in series:
+                cumulative = 0
+                for bound, n in zip(list(hist.buckets) + [None], hist.counts):
+                    cumulative += n
+                    le = '+Inf' if bound is None else repr(bound / 1000)
+                    lines.append(f'{metric}_bucket{{{label}="{_escape(value)}",le="{le}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{{label}="{_escape(value)}"}} {hist.sum / 1000:.6f}')
+                lines.append(f'{metric}_count{{{label}="{_escape(value)}"}} {hist.count}')
+
+        def counter(metric, help_text, samples):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for labels, value in samples:
+                lines.append(f"{metric}{labels} {value}")
+
+        with self._lock:
+            commands = sorted(self.commands.items())
+            queries = sorted(self.queries.items())
+            histogram('chimera_command_duration_seconds', "Wall time per command.", 'command',
+                      [(name, s.latency) for name, s in commands])
+            counter('chimera_command_errors_total', "Commands that raised.",
+                    [(f'{{command="{_escape(name)}"}}', s.errors) for name, s in commands])
+            histogram('chimera_query_duration_seconds', "Execution time per query fingerprint.", 'query',
+                      [(query_id, s.latency) for query_id, s in queries])
+            counter('chimera_query_rows_total', "Rows returned or affected per query fingerprint.",
+                    [(f'{{query="{query_id}"}}', s.rows) for query_id, s in queries])
+            counter('chimera_query_errors_total', "Failed executions per query fingerprint.",
+                    [(f'{{query="{query_id}"}}', s.errors) for query_id, s in queries])
+            lines.append("# HELP chimera_query_info Normalized SQL text of each query fingerprint.")
+            lines.append("# TYPE chimera_query_info gauge")
+            for query_id, s in queries:
+                lines.append(f'chimera_query_info{{query="{query_id}",sql="{_escape(s.text)}"}} 1')
+            counter('chimera_commits_total', "Transactions committed.", [('', self.commits)])
+            counter('chimera_rollbacks_total', "Open transactions rolled back.", [('', self.rollbacks)])
+            counter('chimera_bytes_sent_total', "Bytes written to the MySQL server.", [('', self.bytes_sent)])
+            counter('chimera_bytes_received_total', "Bytes read from the MySQL server.", [('', self.bytes_received)])
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path, fmt=None):
+        """Writes the metrics to `path` as 'json' or 'prometheus' (default: from the extension)."""
+        fmt = fmt or ('prometheus' if path.endswith(('.prom', '.txt')) else 'json')
+        with open(path, 'w', encoding='utf-8') as f:
+            if fmt == 'prometheus':
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, indent=2)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
+command = registry.command
+
+
+# --- Instrumented Driver Classes ---
+
+class InstrumentedConnection(pymysql.connections.Connection):
+    """
+    Counts bytes on the wire and transaction outcomes. Only rollbacks the
+    application asks for are counted; the pool ends every checkout with
+    reset(), which rolls back without counting, so reads do not show up
+    as rolled-back transactions.
+    """
+
+    def _write_bytes(self, data):
+        super()._write_bytes(data)
+        registry.record_bytes(sent=len(data))
+
+    def _read_bytes(self, num_bytes):
+        data = super()._read_bytes(num_bytes)
+        registry.record_bytes(received=len(data))
+        return data
+
+    def commit(self):
+        super().commit()
+        registry.record_transaction(committed=True)
+
+    def rollback(self):
+        in_transaction = bool(self.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS)
+        super().rollback()
+        if in_transaction:
+            registry.record_transaction(committed=False)
+
+    def reset(self):
+        """Rolls back whatever the last borrower left open, without counting it."""
+        super().rollback()
+
+
+class InstrumentedCursorMixin:
+    """
+    Times execute()/executemany() and counts the rows they return or affect.
+    Works on any cursor class with a pymysql-style execute() (see sqlite_backend.py).
+    """
+
+    _instrument_depth = 0
+    _query_id = None
+
+    def _timed(self, method, query, args):
+        # executemany() calls execute() per row or per folded statement; only
+        # the outermost call is recorded, under the statement as written.
+        self._instrument_depth += 1
+        started = time.perf_counter()
+        try:
+            result = method(query, args)
+        except pymysql.Error as e:
+            self._instrument_depth -= 1
+            if not self._instrument_depth:
+                registry.record_query(query, args, (time.perf_counter() - started) * 1000, 0, error=e)
+            raise
+        self._instrument_depth -= 1
+        if not self._instrument_depth:
+            self._query_id = registry.record_query(query, args, (time.perf_counter() - started) * 1000,
+                                                   self._rows_after_execute())
+        return result
+
+    def _rows_after_execute(self):
+        rows = getattr(self, '_rows', None)
+        if rows is not None:
+            return len(rows)
+        return max(self.rowcount, 0) if self.description is None else 0
+
+    def execute(self, query, args=None):
+        return self._timed(super().execute, query, args)
+
+    def executemany(self, query, args):
+        return self._timed(super().executemany, query, args)
+
+
+class InstrumentedUnbufferedMixin(InstrumentedCursorMixin):
+    """
+    For unbuffered cursors: latency covers execute() only (time to first row);
+    rows are counted as they are fetched.
+    """
+
+    def _rows_after_execute(self):
+        return 0
+
+    def _count(self, rows):
+        if self._query_id is not None and rows:
+            registry.record_rows(self._query_id, rows)
+
+    def fetchone(self):
+        row = super().fetchone()
+        self._count(1 if row is not None else 0)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(size)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._count(len(rows))
+        return rows
+
+
+class InstrumentedDictCursor(InstrumentedCursorMixin, pymysql.cursors.DictCursor):
+    """The pool's default cursor."""
+
+
+class InstrumentedSSDictCursor(InstrumentedUnbufferedMixin, pymysql.cursors.SSDictCursor):
+    """Unbuffered variant for streamed reports."""
@@ -0,0 +1,28 @@
+-- Migration 001: Secondary indexes for the report queries.
+-- Applies the GROUP 6 indexes from schema.sql to a database created before they existed.
+-- Run once:  mysql -u your_username -p chimera_db < migrations/001_report_indexes.sql
+-- Verify with:  python3 main_app.py plan-audit
+
+USE chimera_db;
+
+-- MISSION: every report filters on Status; risk and untargeted-trainer checks
+-- combine it with the target trainer (this also serves the Target_Trainer_ID FK).
+CREATE INDEX idx_mission_status_target ON MISSION (`Status`, Target_Trainer_ID);
+CREATE INDEX idx_mission_target_status ON MISSION (Target_Trainer_ID, `Status`);
+
+-- TRAINER: High Notoriety Trainers filters and sorts on the score.
+CREATE INDEX idx_trainer_notoriety ON TRAINER (NotorietyScore, Trainer_ID);
+
+-- ASSET: Unassigned Assets pages by (Value_Estimate DESC, Asset_Code).
+CREATE INDEX idx_asset_value_code ON ASSET (Value_Estimate DESC, Asset_Code);
+
+-- MISSION_ASSIGNMENT: reverse lookup person -> missions (Top Personnel, Success Rate by Base).
+CREATE INDEX idx_assignment_personnel_mission ON MISSION_ASSIGNMENT (Personnel_ID, Mission_ID);
+
+-- MISSION_ASSETS: reverse lookup asset -> missions for the NOT IN anti-join.
+CREATE INDEX idx_mission_assets_asset_mission ON MISSION_ASSETS (Asset_Code, Mission_ID);
+
+-- POKEMON_TYPE: Stats by Type groups on Type.
+CREATE INDEX idx_pokemon_type_type ON POKEMON_TYPE (Type, Pokemon_ID);
+
+-- --- End of 001_report_indexes.sql ---
@@ -0,0 +1,289 @@
+-- Migration 002: Trigger-maintained summary tables for READ 5 and READ 7.
+-- Applies GROUP 7 from schema.sql to a database created before it existed.
+-- Run once, then fill the tables from the existing data:
+--   mysql -u your_username -p chimera_db < migrations/002_summary_tables.sql
+--   python3 main_app.py summary-rebuild
+-- Verify with:  python3 main_app.py summary-check
+
+USE chimera_db;
+
+-- BASE_MISSION_LINK: how many people from a base are assigned to a mission.
+-- A base counts a mission once however many of its people are on it, so the
+-- stats change only when a link appears or disappears.
+CREATE TABLE BASE_MISSION_LINK (
+    Base_ID INT NOT NULL,
+    Mission_ID INT NOT NULL,
+    Assignees INT NOT NULL,
+    PRIMARY KEY (Base_ID, Mission_ID),
+    KEY idx_base_mission_link_mission (Mission_ID, Base_ID)
+);
+
+-- BASE_MISSION_STATS: READ 7 (Mission Success Rate by Base) reads this.
+CREATE TABLE BASE_MISSION_STATS (
+    Base_ID INT PRIMARY KEY,
+    Total_Missions INT NOT NULL DEFAULT 0,
+    Completed_Missions INT NOT NULL DEFAULT 0
+);
+
+-- POKEMON_TYPE_STATS: READ 5 (Pokemon Stats by Type) reads this; averages are Sum / Pokemon_Count.
+CREATE TABLE POKEMON_TYPE_STATS (
+    Type VARCHAR(50) PRIMARY KEY,
+    Pokemon_Count INT NOT NULL DEFAULT 0,
+    HP_Sum BIGINT NOT NULL DEFAULT 0,
+    Attack_Sum BIGINT NOT NULL DEFAULT 0,
+    Defense_Sum BIGINT NOT NULL DEFAULT 0
+);
+
+-- Foreign key actions (e.g. deleting a person cascading to MISSION_ASSIGNMENT)
+-- do not fire triggers, so the deltas are applied at the parent row as well.
+-- Every trigger is a no-op while @skip_summary_triggers is set (bulk loads set
+-- it and rebuild afterwards with: python3 main_app.py summary-rebuild).
+
+DELIMITER //
+
+-- One person at p_base was assigned to p_mission.
+CREATE PROCEDURE summary_assignment_added(IN p_base INT, IN p_mission INT)
+BEGIN
+    DECLARE v_completed INT DEFAULT 0;
+    IF p_base IS NOT NULL THEN
+        INSERT INTO BASE_MISSION_LINK (Base_ID, Mission_ID, Assignees) VALUES (p_base, p_mission, 1)
+            ON DUPLICATE KEY UPDATE Assignees = Assignees + 1;
+        -- ROW_COUNT() is 1 for a new link, 2 when an existing one was incremented.
+        IF ROW_COUNT() = 1 THEN
+            SELECT COALESCE(MAX(`Status` = 'Completed'), 0) INTO v_completed FROM MISSION WHERE Mission_ID = p_mission;
+            INSERT INTO BASE_MISSION_STATS (Base_ID, Total_Missions, Completed_Missions) VALUES (p_base, 1, v_completed)
+                ON DUPLICATE KEY UPDATE Total_Missions = Total_Missions + 1,
+                                        Completed_Missions = Completed_Missions + v_completed;
+        END IF;
+    END IF;
+END //
+
+-- One person at p_base was taken off p_mission.
+CREATE PROCEDURE summary_assignment_removed(IN p_base INT, IN p_mission INT)
+BEGIN
+    DECLARE v_completed INT DEFAULT 0;
+    IF p_base IS NOT NULL THEN
+        UPDATE BASE_MISSION_LINK SET Assignees = Assignees - 1 WHERE Base_ID = p_base AND Mission_ID = p_mission;
+        IF ROW_COUNT() > 0 AND NOT EXISTS (SELECT 1 FROM BASE_MISSION_LINK
+                                           WHERE Base_ID = p_base AND Mission_ID = p_mission AND Assignees > 0) THEN
+            DELETE FROM BASE_MISSION_LINK WHERE Base_ID = p_base AND Mission_ID = p_mission;
+            SELECT COALESCE(MAX(`Status` = 'Completed'), 0) INTO v_completed FROM MISSION WHERE Mission_ID = p_mission;
+            UPDATE BASE_MISSION_STATS
+               SET Total_Missions = Total_Missions - 1, Completed_Missions = Completed_Missions - v_completed
+             WHERE Base_ID = p_base;
+        END IF;
+    END IF;
+END //
+
+-- Every assignment of p_personnel now counts for p_base (joined the base).
+CREATE PROCEDURE summary_personnel_added(IN p_personnel INT, IN p_base INT)
+BEGIN
+    DECLARE v_missions INT DEFAULT 0;
+    DECLARE v_completed INT DEFAULT 0;
+    IF p_base IS NOT NULL THEN
+        SELECT COUNT(*), COALESCE(SUM(m.`Status` = 'Completed'), 0) INTO v_missions, v_completed
+          FROM MISSION_ASSIGNMENT ma
+          JOIN MISSION m ON m.Mission_ID = ma.Mission_ID
+          LEFT JOIN BASE_MISSION_LINK l ON l.Base_ID = p_base AND l.Mission_ID = ma.Mission_ID
+         WHERE ma.Personnel_ID = p_personnel AND l.Base_ID IS NULL;
+        INSERT INTO BASE_MISSION_LINK (Base_ID, Mission_ID, Assignees)
+            SELECT p_base, ma.Mission_ID, 1 FROM MISSION_ASSIGNMENT ma WHERE ma.Personnel_ID = p_personnel
+            ON DUPLICATE KEY UPDATE Assignees = Assignees + 1;
+        IF v_missions > 0 THEN
+            INSERT INTO BASE_MISSION_STATS (Base_ID, Total_Missions, Completed_Missions) VALUES (p_base, v_missions, v_completed)
+                ON DUPLICATE KEY UPDATE Total_Missions = Total_Missions + v_missions,
+                                        Completed_Missions = Completed_Missions + v_completed;
+        END IF;
+    END IF;
+END //
+
+-- Every assignment of p_personnel stops counting for p_base (left the base or was deleted).
+CREATE PROCEDURE summary_personnel_removed(IN p_personnel INT, IN p_base INT)
+BEGIN
+    DECLARE v_missions INT DEFAULT 0;
+    DECLARE v_completed INT DEFAULT 0;
+    IF p_base IS NOT NULL THEN
+        UPDATE BASE_MISSION_LINK l
+          JOIN MISSION_ASSIGNMENT ma ON ma.Mission_ID = l.Mission_ID
+           SET l.Assignees = l.Assignees - 1
+         WHERE ma.Personnel_ID = p_personnel AND l.Base_ID = p_base;
+        SELECT COUNT(*), COALESCE(SUM(m.`Status` = 'Completed'), 0) INTO v_missions, v_completed
+          FROM MISSION_ASSIGNMENT ma
+          JOIN BASE_MISSION_LINK l ON l.Base_ID = p_base AND l.Mission_ID = ma.Mission_ID
+          JOIN MISSION m ON m.Mission_ID = ma.Mission_ID
+         WHERE ma.Personnel_ID = p_personnel AND l.Assignees <= 0;
+        DELETE l FROM BASE_MISSION_LINK l
+          JOIN MISSION_ASSIGNMENT ma ON ma.Mission_ID = l.Mission_ID
+         WHERE ma.Personnel_ID = p_personnel AND l.Base_ID = p_base AND l.Assignees <= 0;
+        UPDATE BASE_MISSION_STATS
+           SET Total_Missions = Total_Missions - v_missions, Completed_Missions = Completed_Missions - v_completed
+         WHERE Base_ID = p_base;
+    END IF;
+END //
+
+-- Adds (p_sign = 1) or removes (p_sign = -1) one Pokemon's stats under p_type.
+CREATE PROCEDURE summary_pokemon_type(IN p_type VARCHAR(50), IN p_pokemon INT, IN p_sign INT)
+BEGIN
+    DECLARE v_hp INT;
+    DECLARE v_attack INT;
+    DECLARE v_defense INT;
+    SELECT HP, Attack, Defense INTO v_hp, v_attack, v_defense FROM POKEMON WHERE Pokemon_ID = p_pokemon;
+    IF v_hp IS NOT NULL THEN
+        INSERT INTO POKEMON_TYPE_STATS (Type, Pokemon_Count, HP_Sum, Attack_Sum, Defense_Sum)
+            VALUES (p_type, p_sign, p_sign * v_hp, p_sign * v_attack, p_sign * v_defense)
+            ON DUPLICATE KEY UPDATE Pokemon_Count = Pokemon_Count + p_sign,
+                                    HP_Sum = HP_Sum + p_sign * v_hp,
+                                    Attack_Sum = Attack_Sum + p_sign * v_attack,
+                                    Defense_Sum = Defense_Sum + p_sign * v_defense;
+    END IF;
+END //
+
+CREATE TRIGGER trg_mission_assignment_after_insert AFTER INSERT ON MISSION_ASSIGNMENT
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        CALL summary_assignment_added((SELECT Base_ID FROM PERSONNEL WHERE Personnel_ID = NEW.Personnel_ID), NEW.Mission_ID);
+    END IF;
+END //
+
+CREATE TRIGGER trg_mission_assignment_after_update AFTER UPDATE ON MISSION_ASSIGNMENT
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL AND (OLD.Mission_ID <> NEW.Mission_ID OR OLD.Personnel_ID <> NEW.Personnel_ID) THEN
+        CALL summary_assignment_removed((SELECT Base_ID FROM PERSONNEL WHERE Personnel_ID = OLD.Personnel_ID), OLD.Mission_ID);
+        CALL summary_assignment_added((SELECT Base_ID FROM PERSONNEL WHERE Personnel_ID = NEW.Personnel_ID), NEW.Mission_ID);
+    END IF;
+END //
+
+CREATE TRIGGER trg_mission_assignment_after_delete AFTER DELETE ON MISSION_ASSIGNMENT
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        CALL summary_assignment_removed((SELECT Base_ID FROM PERSONNEL WHERE Personnel_ID = OLD.Personnel_ID), OLD.Mission_ID);
+    END IF;
+END //
+
+-- Moving a person between bases moves all of their assignments.
+CREATE TRIGGER trg_personnel_after_update AFTER UPDATE ON PERSONNEL
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL AND NOT (OLD.Base_ID <=> NEW.Base_ID) THEN
+        CALL summary_personnel_removed(NEW.Personnel_ID, OLD.Base_ID);
+        CALL summary_personnel_added(NEW.Personnel_ID, NEW.Base_ID);
+    END IF;
+END //
+
+-- Runs before ON DELETE CASCADE removes the person's MISSION_ASSIGNMENT rows.
+CREATE TRIGGER trg_personnel_before_delete BEFORE DELETE ON PERSONNEL
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        CALL summary_personnel_removed(OLD.Personnel_ID, OLD.Base_ID);
+    END IF;
+END //
+
+CREATE TRIGGER trg_mission_after_update AFTER UPDATE ON MISSION
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        IF OLD.Mission_ID <> NEW.Mission_ID THEN
+            UPDATE BASE_MISSION_LINK SET Mission_ID = NEW.Mission_ID WHERE Mission_ID = OLD.Mission_ID;
+        END IF;
+        IF (OLD.`Status` = 'Completed') <> (NEW.`Status` = 'Completed') THEN
+            UPDATE BASE_MISSION_STATS s
+              JOIN BASE_MISSION_LINK l ON l.Base_ID = s.Base_ID
+               SET s.Completed_Missions = s.Completed_Missions + IF(NEW.`Status` = 'Completed', 1, -1)
+             WHERE l.Mission_ID = NEW.Mission_ID;
+        END IF;
+    END IF;
+END //
+
+CREATE TRIGGER trg_mission_before_delete BEFORE DELETE ON MISSION
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        UPDATE BASE_MISSION_STATS s
+          JOIN BASE_MISSION_LINK l ON l.Base_ID = s.Base_ID
+           SET s.Total_Missions = s.Total_Missions - 1,
+               s.Completed_Missions = s.Completed_Missions - (OLD.`Status` = 'Completed')
+         WHERE l.Mission_ID = OLD.Mission_ID;
+        DELETE FROM BASE_MISSION_LINK WHERE Mission_ID = OLD.Mission_ID;
+    END IF;
+END //
+
+CREATE TRIGGER trg_base_after_update AFTER UPDATE ON BASE
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL AND OLD.Base_ID <> NEW.Base_ID THEN
+        UPDATE BASE_MISSION_LINK SET Base_ID = NEW.Base_ID WHERE Base_ID = OLD.Base_ID;
+        UPDATE BASE_MISSION_STATS SET Base_ID = NEW.Base_ID WHERE Base_ID = OLD.Base_ID;
+    END IF;
+END //
+
+-- ON DELETE SET NULL unassigns the base's personnel, so its missions stop counting.
+CREATE TRIGGER trg_base_after_delete AFTER DELETE ON BASE
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        DELETE FROM BASE_MISSION_LINK WHERE Base_ID = OLD.Base_ID;
+        DELETE FROM BASE_MISSION_STATS WHERE Base_ID = OLD.Base_ID;
+    END IF;
+END //
+
+CREATE TRIGGER trg_pokemon_type_after_insert AFTER INSERT ON POKEMON_TYPE
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        CALL summary_pokemon_type(NEW.Type, NEW.Pokemon_ID, 1);
+    END IF;
+END //
+
+CREATE TRIGGER trg_pokemon_type_after_update AFTER UPDATE ON POKEMON_TYPE
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL AND (OLD.Type <> NEW.Type OR OLD.Pokemon_ID <> NEW.Pokemon_ID) THEN
+        CALL summary_pokemon_type(OLD.Type, OLD.Pokemon_ID, -1);
+        CALL summary_pokemon_type(NEW.Type, NEW.Pokemon_ID, 1);
+    END IF;
+END //
+
+CREATE TRIGGER trg_pokemon_type_after_delete AFTER DELETE ON POKEMON_TYPE
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        CALL summary_pokemon_type(OLD.Type, OLD.Pokemon_ID, -1);
+    END IF;
+END //
+
+CREATE TRIGGER trg_pokemon_after_update AFTER UPDATE ON POKEMON
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL
+       AND (OLD.HP <> NEW.HP OR OLD.Attack <> NEW.Attack OR OLD.Defense <> NEW.Defense) THEN
+        UPDATE POKEMON_TYPE_STATS ts
+          JOIN POKEMON_TYPE pt ON pt.Type = ts.Type
+           SET ts.HP_Sum = ts.HP_Sum + NEW.HP - OLD.HP,
+               ts.Attack_Sum = ts.Attack_Sum + NEW.Attack - OLD.Attack,
+               ts.Defense_Sum = ts.Defense_Sum + NEW.Defense - OLD.Defense
+         WHERE pt.Pokemon_ID = NEW.Pokemon_ID;
+    END IF;
+END //
+
+-- Runs before ON DELETE CASCADE removes the Pokemon's POKEMON_TYPE rows.
+CREATE TRIGGER trg_pokemon_before_delete BEFORE DELETE ON POKEMON
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        UPDATE POKEMON_TYPE_STATS ts
+          JOIN POKEMON_TYPE pt ON pt.Type = ts.Type
+           SET ts.Pokemon_Count = ts.Pokemon_Count - 1,
+               ts.HP_Sum = ts.HP_Sum - OLD.HP,
+               ts.Attack_Sum = ts.Attack_Sum - OLD.Attack,
+               ts.Defense_Sum = ts.Defense_Sum - OLD.Defense
+         WHERE pt.Pokemon_ID = OLD.Pokemon_ID;
+    END IF;
+END //
+
+DELIMITER ;
+
+-- --- End of 002_summary_tables.sql ---
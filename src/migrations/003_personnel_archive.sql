@@ -0,0 +1,71 @@
+-- Migration 003: Archive tables and soft retirement for personnel.
+-- Applies GROUP 8 from schema.sql (and PERSONNEL.RetiredDate) to a database created before they existed.
+-- Run once:  mysql -u your_username -p chimera_db < migrations/003_personnel_archive.sql
+-- Verify with:  python3 main_app.py retire --personnel-id <ID> --report
+
+USE chimera_db;
+
+ALTER TABLE PERSONNEL ADD COLUMN RetiredDate DATE NULL;
+
+-- personnel_archive.py moves a person's history here in small batches before
+-- deleting them. Same columns as the live tables plus Archived_At; no foreign
+-- keys, so the history outlives the rows it named.
+
+CREATE TABLE PERSONNEL_ARCHIVE (
+    Personnel_ID INT PRIMARY KEY,
+    FName VARCHAR(50) NOT NULL,
+    LName VARCHAR(50) NOT NULL,
+    `Rank` ENUM('Boss', 'Grunt', 'Scientist') NOT NULL,
+    StartDate DATE,
+    Base_ID INT,
+    RetiredDate DATE NOT NULL,
+    Region_Managed VARCHAR(100), -- Bosses
+    Squad_ID INT, -- Grunts
+    Specialization VARCHAR(100), -- Scientists
+    Project_ID INT, -- Scientists
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE MISSION_ASSIGNMENT_ARCHIVE (
+    Mission_ID INT,
+    Personnel_ID INT,
+    Role VARCHAR(100),
+    AssignedDate DATE,
+    `Status` ENUM('Assigned', 'Engaged', 'Battle Lost', 'Travelling'),
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Personnel_ID, Mission_ID)
+);
+
+CREATE TABLE ASSIGNED_TO_ARCHIVE (
+    Personnel_ID INT,
+    Mission_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Personnel_ID, Mission_ID)
+);
+
+CREATE TABLE OWNERSHIP_ARCHIVE (
+    Personnel_ID INT,
+    Pokemon_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Personnel_ID, Pokemon_ID)
+);
+
+CREATE TABLE FIELD_ENGAGEMENT_ARCHIVE (
+    Grunt_Personnel_ID INT,
+    Trainer_ID INT,
+    Mission_ID INT,
+    Pokemon_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Grunt_Personnel_ID, Trainer_ID, Mission_ID)
+);
+
+CREATE TABLE EXPERIMENTATION_EVENT_ARCHIVE (
+    Scientist_Personnel_ID INT,
+    Serum_ID INT,
+    Pokemon_ID INT,
+    Project_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Scientist_Personnel_ID, Serum_ID, Pokemon_ID, Project_ID)
+);
+
+-- --- End of 003_personnel_archive.sql ---
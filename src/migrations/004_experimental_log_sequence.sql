@@ -0,0 +1,15 @@
+-- Migration 004: Log ID sequences for the experiment ingest.
+-- Applies GROUP 9 from schema.sql to a database created before it existed.
+-- Run once:  mysql -u your_username -p chimera_db < migrations/004_experimental_log_sequence.sql
+-- No backfill is needed: each project's row is created on its first ingest and
+-- starts past the project's highest existing Log_ID.
+
+USE chimera_db;
+
+CREATE TABLE EXPERIMENTAL_LOG_SEQUENCE (
+    Project_ID INT PRIMARY KEY,
+    Next_Log_ID INT NOT NULL,
+    FOREIGN KEY (Project_ID) REFERENCES RESEARCH_PROJECT(Project_ID)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
@@ -0,0 +1,64 @@
+-- Migration 005: History tables for closed missions.
+-- Applies GROUP 10 from schema.sql to a database created before it existed.
+-- Run once:  mysql -u your_username -p chimera_db < migrations/005_mission_history.sql
+-- Nothing is moved until the first archive run:
+--   python3 main_app.py archive-missions --older-than 90 --report
+
+USE chimera_db;
+
+CREATE TABLE MISSION_HISTORY (
+    Mission_ID INT PRIMARY KEY,
+    Objective TEXT NOT NULL,
+    `Status` ENUM('Completed', 'Failed', 'Aborted') NOT NULL,
+    StartDate DATE,
+    EndDate DATE,
+    Target_Trainer_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_mission_history_trainer (Target_Trainer_ID)
+);
+
+-- Base_ID is the assignee's base when the mission was archived; READ 7 credits
+-- archived missions to that base from then on.
+CREATE TABLE MISSION_ASSIGNMENT_HISTORY (
+    Mission_ID INT,
+    Personnel_ID INT,
+    Role VARCHAR(100),
+    AssignedDate DATE,
+    `Status` ENUM('Assigned', 'Engaged', 'Battle Lost', 'Travelling'),
+    Base_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Mission_ID, Personnel_ID),
+    KEY idx_mission_assignment_history_personnel (Personnel_ID, Mission_ID)
+);
+
+CREATE TABLE MISSION_ASSETS_HISTORY (
+    Mission_ID INT,
+    Asset_Code VARCHAR(50),
+    Acquisition_Status ENUM('Pending', 'Acquired', 'Lost', 'Returned'),
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Mission_ID, Asset_Code)
+);
+
+CREATE TABLE ASSIGNED_TO_HISTORY (
+    Personnel_ID INT,
+    Mission_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Personnel_ID, Mission_ID)
+);
+
+CREATE TABLE FIELD_ENGAGEMENT_HISTORY (
+    Grunt_Personnel_ID INT,
+    Trainer_ID INT,
+    Mission_ID INT,
+    Pokemon_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Grunt_Personnel_ID, Trainer_ID, Mission_ID)
+);
+
+-- BASE_MISSION_HISTORY_STATS: the archived half of BASE_MISSION_STATS. Written
+-- only by the archive job (history never changes), and READ 7 adds the two.
+CREATE TABLE BASE_MISSION_HISTORY_STATS (
+    Base_ID INT PRIMARY KEY,
+    Total_Missions INT NOT NULL DEFAULT 0,
+    Completed_Missions INT NOT NULL DEFAULT 0
+);
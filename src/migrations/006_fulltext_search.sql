@@ -0,0 +1,11 @@
+-- Migration 006: FULLTEXT indexes for the search command.
+-- Applies GROUP 11 from schema.sql to a database created before it existed.
+-- Run once:  mysql -u your_username -p chimera_db < migrations/006_fulltext_search.sql
+-- Each index is built in place with a full pass over its table; until then,
+-- search falls back to its in-process inverted index.
+
+USE chimera_db;
+
+CREATE FULLTEXT INDEX ft_mission_objective ON MISSION (Objective);
+CREATE FULLTEXT INDEX ft_mission_history_objective ON MISSION_HISTORY (Objective);
+CREATE FULLTEXT INDEX ft_experimental_log_objective ON EXPERIMENTAL_LOG (Objective);
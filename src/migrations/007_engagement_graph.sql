@@ -0,0 +1,21 @@
+-- Migration 007: Insertion order for the engagement graph's junction tables.
+-- Adds the Seq columns that schema.sql now creates with MISSION_ASSIGNMENT,
+-- OWNERSHIP and FIELD_ENGAGEMENT. engagement_graph.py reloads only the rows
+-- past the highest Seq it has seen. Existing rows are numbered in primary key
+-- order.
+-- Run once:  mysql -u your_username -p chimera_db < migrations/007_engagement_graph.sql
+-- Each ALTER rebuilds its table, so run it off-peak on large databases.
+
+USE chimera_db;
+
+ALTER TABLE MISSION_ASSIGNMENT
+    ADD COLUMN Seq BIGINT NOT NULL AUTO_INCREMENT,
+    ADD UNIQUE KEY uq_mission_assignment_seq (Seq);
+
+ALTER TABLE OWNERSHIP
+    ADD COLUMN Seq BIGINT NOT NULL AUTO_INCREMENT,
+    ADD UNIQUE KEY uq_ownership_seq (Seq);
+
+ALTER TABLE FIELD_ENGAGEMENT
+    ADD COLUMN Seq BIGINT NOT NULL AUTO_INCREMENT,
+    ADD UNIQUE KEY uq_field_engagement_seq (Seq);
@@ -0,0 +1,184 @@
+"""
+Mission Archival (mission_archive.py)
+Hot/cold split for missions. Completed, Failed and Aborted missions otherwise
+stay in MISSION forever, next to the handful of Active and Pending ones, with
+all of their MISSION_ASSIGNMENT and MISSION_ASSETS rows, and every
+active-mission report scans past them. Archiving moves closed missions older
+than a cutoff, together with their junction rows, into the *_HISTORY tables
+(schema.sql GROUP 10) in small committed batches. READ 3, READ 6 and READ 7
+read both sides, so their results do not change; READ 1, READ 2 and READ 4
+only ever see the live tables.
+
+    python3 main_app.py archive-missions --older-than 90 --report
+    python3 main_app.py archive-missions --older-than 90 --yes
+    python3 main_app.py archive-missions --older-than 365 --yes --batch-size 100 --pause-ms 50
+
+Archived missions are read-only: set-mission-status no longer finds them.
+Missions closed without an EndDate (rows from before it was recorded) count
+as older than any cutoff.
+"""
+
+import time
+import datetime
+
+from cache import result_cache
+from operations import CLOSED_MISSION_STATUSES
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_OLDER_THAN_DAYS = 90
+
+# Live table -> its columns, copied into <TABLE>_HISTORY. MISSION_ASSIGNMENT is
+# handled separately because its history row also records the assignee's base.
+CHILD_TABLES = {
+    'MISSION_ASSETS': ('Mission_ID', 'Asset_Code', 'Acquisition_Status'),
+    'ASSIGNED_TO': ('Personnel_ID', 'Mission_ID'),
+    'FIELD_ENGAGEMENT': ('Grunt_Personnel_ID', 'Trainer_ID', 'Mission_ID', 'Pokemon_ID'),
+}
+MISSION_COLUMNS = ('Mission_ID', 'Objective', '`Status`', 'StartDate', 'EndDate', 'Target_Trainer_ID')
+
+HISTORY_TABLES = ('MISSION_HISTORY', 'MISSION_ASSIGNMENT_HISTORY',
+                  *(f"{table}_HISTORY" for table in CHILD_TABLES))
+
+# Tables whose cached report results change when a batch is archived.
+ARCHIVE_TABLES = ('MISSION', 'MISSION_ASSIGNMENT', *CHILD_TABLES,
+                  'BASE_MISSION_LINK', 'BASE_MISSION_STATS', 'BASE_MISSION_HISTORY_STATS', *HISTORY_TABLES)
+
+_CLOSED = f"`Status` IN ({', '.join(repr(status) for status in CLOSED_MISSION_STATUSES)})"
+ARCHIVABLE_WHERE = f"{_CLOSED} AND (EndDate IS NULL OR EndDate < %s)"
+
+SELECT_BATCH_SQL = f"""
+    SELECT Mission_ID FROM MISSION
+    WHERE {ARCHIVABLE_WHERE}
+    ORDER BY Mission_ID
+    LIMIT %s
+    FOR UPDATE
+"""
+ARCHIVE_ASSIGNMENTS_SQL = """
+    INSERT INTO MISSION_ASSIGNMENT_HISTORY (Mission_ID, Personnel_ID, Role, AssignedDate, `Status`, Base_ID)
+    SELECT ma.Mission_ID, ma.Personnel_ID, ma.Role, ma.AssignedDate, ma.`Status`, p.Base_ID
+    FROM MISSION_ASSIGNMENT ma
+    LEFT JOIN PERSONNEL p ON p.Personnel_ID = ma.Personnel_ID
+    WHERE ma.Mission_ID IN ({ids})
+"""
+# The (base, mission) pairs the batch adds to READ 7's archived half; a base
+# counts a mission once however many of its people were on it.
+ARCHIVED_BASE_MISSIONS_SQL = """
+    SELECT DISTINCT mah.Base_ID, mah.Mission_ID, mh.`Status`
+    FROM MISSION_ASSIGNMENT_HISTORY mah
+    JOIN MISSION_HISTORY mh ON mh.Mission_ID = mah.Mission_ID
+    WHERE mah.Mission_ID IN ({ids}) AND mah.Base_ID IS NOT NULL
+"""
+ENSURE_HISTORY_STATS_SQL = "INSERT IGNORE INTO BASE_MISSION_HISTORY_STATS (Base_ID) VALUES (%s)"
+ADD_HISTORY_STATS_SQL = """
+    UPDATE BASE_MISSION_HISTORY_STATS
+    SET Total_Missions = Total_Missions + %s, Completed_Missions = Completed_Missions + %s
+    WHERE Base_ID = %s
+"""
+
+
+def cutoff_date(older_than_days, today=None):
+    """The EndDate before which a closed mission is archived."""
+    older_than_days = int(older_than_days)
+    if older_than_days < 0:
+        raise ValueError("--older-than must be zero or more days.")
+    return (today or datetime.date.today()) - datetime.timedelta(days=older_than_days)
+
+
+# --- Pre-flight ---
+
+def report(pool, older_than_days=DEFAULT_OLDER_THAN_DAYS):
+    """
+    Counts what an archive run with this cutoff would move. Returns one
+    {'Table', 'Live_Rows', 'Archivable'} dict per live table, MISSION first.
+    """
+    cutoff = cutoff_date(older_than_days)
+    archivable = f"SELECT Mission_ID FROM MISSION WHERE {ARCHIVABLE_WHERE}"
+    rows = []
+    with pool.connection() as connection, connection.cursor() as cursor:
+        for table in ('MISSION', 'MISSION_ASSIGNMENT', *CHILD_TABLES):
+            cursor.execute(f"SELECT COUNT(*) AS N FROM {table}")
+            live = cursor.fetchone()['N']
+            cursor.execute(f"SELECT COUNT(*) AS N FROM {table} WHERE Mission_ID IN ({archivable})", (cutoff,))
+            rows.append({'Table': table, 'Live_Rows': live, 'Archivable': cursor.fetchone()['N']})
+    return rows
+
+
+# --- Archival ---
+
+def _add_history_stats(cursor, placeholders, mission_ids):
+    """Adds the batch's (base, mission) pairs to BASE_MISSION_HISTORY_STATS."""
+    cursor.execute(ARCHIVED_BASE_MISSIONS_SQL.format(ids=placeholders), mission_ids)
+    totals = {}
+    for row in cursor.fetchall():
+        total, completed = totals.get(row['Base_ID'], (0, 0))
+        totals[row['Base_ID']] = (total + 1, completed + (row['Status'] == 'Completed'))
+    if totals:
+        # INSERT IGNORE + UPDATE rather than ON DUPLICATE KEY, which the SQLite backend lacks.
+        cursor.executemany(ENSURE_HISTORY_STATS_SQL, [(base_id,) for base_id in totals])
+        cursor.executemany(ADD_HISTORY_STATS_SQL,
+                           [(total, completed, base_id) for base_id, (total, completed) in totals.items()])
+
+
+def _archive_batch(cursor, cutoff, limit):
+    """
+    Moves up to `limit` archivable missions and their junction rows into the
+    history tables on an open transaction. Returns {table: rows moved}.
+    """
+    cursor.execute(SELECT_BATCH_SQL, (cutoff, limit))
+    mission_ids = [row['Mission_ID'] for row in cursor.fetchall()]
+    if not mission_ids:
+        return {}
+    ids = ', '.join(['%s'] * len(mission_ids))
+
+    moved = {}
+    column_list = ', '.join(MISSION_COLUMNS)
+    moved['MISSION'] = cursor.execute(
+        f"INSERT INTO MISSION_HISTORY ({column_list}) SELECT {column_list} FROM MISSION WHERE Mission_ID IN ({ids})",
+        mission_ids)
+    moved['MISSION_ASSIGNMENT'] = cursor.execute(ARCHIVE_ASSIGNMENTS_SQL.format(ids=ids), mission_ids)
+    for table, columns in CHILD_TABLES.items():
+        column_list = ', '.join(columns)
+        moved[table] = cursor.execute(
+            f"INSERT INTO {table}_HISTORY ({column_list}) SELECT {column_list} FROM {table} WHERE Mission_ID IN ({ids})",
+            mission_ids)
+    _add_history_stats(cursor, ids, mission_ids)
+
+    # ON DELETE CASCADE removes the junction rows; trg_mission_before_delete
+    # takes the missions out of BASE_MISSION_LINK / BASE_MISSION_STATS first.
+    cursor.execute(f"DELETE FROM MISSION WHERE Mission_ID IN ({ids})", mission_ids)
+    return moved
+
+
+def archive(pool, older_than_days=DEFAULT_OLDER_THAN_DAYS, batch_size=DEFAULT_BATCH_SIZE, pause=0.0):
+    """
+    Archives closed missions whose EndDate is more than `older_than_days` days
+    ago, `batch_size` missions per transaction, oldest Mission_ID first. Yields
+    one progress dict per committed batch: Missions, Assignments, Assets,
+    Assigned_To, Engagements, Seconds.
+
+    Each batch locks its MISSION rows before copying, so a status change or a
+    new assignment either lands before the copy or waits and then finds the
+    mission gone. Interrupted runs are safe to repeat.
+    """
+    cutoff = cutoff_date(older_than_days)
+    batch_size = int(batch_size)
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1.")
+
+    with pool.connection() as connection:
+        while True:
+            started = time.monotonic()
+            with connection.cursor() as cursor:
+                moved = _archive_batch(cursor, cutoff, batch_size)
+            if not moved:
+                connection.rollback()  # release the (empty) FOR UPDATE read
+                break
+            connection.commit()
+            result_cache.invalidate(*ARCHIVE_TABLES)
+            yield {'Missions': moved['MISSION'], 'Assignments': moved['MISSION_ASSIGNMENT'],
+                   'Assets': moved['MISSION_ASSETS'], 'Assigned_To': moved['ASSIGNED_TO'],
+                   'Engagements': moved['FIELD_ENGAGEMENT'], 'Seconds': round(time.monotonic() - started, 3)}
+            if moved['MISSION'] < batch_size:
+                break
+            if pause:
+                time.sleep(pause)  # let writers queued behind these row locks through
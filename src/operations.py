@@ -0,0 +1,489 @@
+"""
+Operations Layer (operations.py)
+The twelve Chimera DB operations as plain functions. Reads return rows,
+writes take explicit parameters and return what they changed. The interactive
+menu (main_app.py) and the headless CLI (headless.py) both call into here.
+"""
+
+import json
+import base64
+import decimal
+
+from cache import cached_query, invalidates
+from metrics import InstrumentedSSDictCursor
+
+VALID_RANKS = ('Boss', 'Grunt', 'Scientist')
+VALID_MISSION_STATUSES = ('Pending', 'Active', 'Completed', 'Failed', 'Aborted')
+CLOSED_MISSION_STATUSES = ('Completed', 'Failed', 'Aborted')
+
+# Tables whose rows change when a PERSONNEL row is deleted (ON DELETE CASCADE / SET NULL).
+PERSONNEL_CASCADE_TABLES = ('PERSONNEL', 'BOSS', 'GRUNT', 'SCIENTIST', 'BASE', 'SQUADS',
+                            'MISSION_ASSIGNMENT', 'ASSIGNED_TO', 'OWNERSHIP', 'FIELD_ENGAGEMENT')
+
+STREAM_BATCH_SIZE = 500       # rows pulled per fetchmany() from an unbuffered cursor
+DEFAULT_PAGE_SIZE = 50
+
+# --- SQL ---
+
+# Soft-retired personnel (personnel_archive.py) keep their PERSONNEL row and
+# history but are no longer live: READ 1 and READ 3 skip them (RetiredDate IS
+# NULL) and WRITE 9 refuses them.
+
+ACTIVE_MISSIONS_SQL = """
+    SELECT m.Mission_ID, m.Objective, p.FName, p.LName, ma.Role
+    FROM MISSION m
+    JOIN MISSION_ASSIGNMENT ma ON m.Mission_ID = ma.Mission_ID
+    JOIN PERSONNEL p ON ma.Personnel_ID = p.Personnel_ID
+    WHERE m.Status = 'Active' AND p.RetiredDate IS NULL
+    ORDER BY m.Mission_ID, p.LName
+"""
+
+PENDING_MISSION_RISK_SQL = """
+    SELECT COUNT(m.Mission_ID) as Mission_Count, SUM(t.NotorietyScore) AS Total_Risk
+    FROM MISSION m
+    JOIN TRAINER t ON t.Trainer_ID = m.Target_Trainer_ID
+    WHERE m.Status = 'Pending' AND t.NotorietyScore > 0
+"""
+
+# Completed missions live in MISSION until archived and in MISSION_HISTORY after
+# (mission_archive.py), so READ 3, READ 6 and READ 7 read both.
+TOP_PERFORMING_PERSONNEL_SQL = """
+    SELECT p.FName, p.LName, COUNT(c.Mission_ID) as Mission_Count
+    FROM PERSONNEL p
+    JOIN (
+        SELECT ma.Personnel_ID, ma.Mission_ID
+        FROM MISSION_ASSIGNMENT ma
+        JOIN MISSION m ON ma.Mission_ID = m.Mission_ID
+        WHERE m.Status = 'Completed'
+        UNION ALL
+        SELECT mah.Personnel_ID, mah.Mission_ID
+        FROM MISSION_ASSIGNMENT_HISTORY mah
+        JOIN MISSION_HISTORY mh ON mah.Mission_ID = mh.Mission_ID
+        WHERE mh.Status = 'Completed'
+    ) c ON p.Personnel_ID = c.Personnel_ID
+    WHERE p.RetiredDate IS NULL
+    GROUP BY p.Personnel_ID, p.FName, p.LName
+    ORDER BY Mission_Count DESC
+    LIMIT %s
+"""
+
+UNASSIGNED_ASSETS_SQL = """
+    SELECT a.Asset_Code, a.Asset_Type, a.Value_Estimate
+    FROM ASSET a
+    WHERE a.Asset_Code NOT IN (
+        SELECT ma.Asset_Code
+        FROM MISSION_ASSETS ma
+        JOIN MISSION m ON ma.Mission_ID = m.Mission_ID
+        WHERE m.Status = 'Active'
+    )
+    ORDER BY a.Value_Estimate DESC
+"""
+
+# Reads the trigger-maintained POKEMON_TYPE_STATS (schema.sql GROUP 7): one row per type.
+POKEMON_STATS_BY_TYPE_SQL = """
+    SELECT ts.Type, ts.HP_Sum / ts.Pokemon_Count as Avg_HP,
+           ts.Attack_Sum / ts.Pokemon_Count as Avg_Atk,
+           ts.Defense_Sum / ts.Pokemon_Count as Avg_Def
+    FROM POKEMON_TYPE_STATS ts
+    WHERE ts.Pokemon_Count > 0
+    ORDER BY Avg_Atk DESC
+"""
+
+UNTARGETED_TRAINERS_SQL = """
+    SELECT t.Trainer_ID, t.Name, t.Affiliation, t.NotorietyScore
+    FROM TRAINER t
+    LEFT JOIN MISSION m ON t.Trainer_ID = m.Target_Trainer_ID
+    WHERE t.NotorietyScore > %s AND m.Mission_ID IS NULL
+      AND NOT EXISTS (SELECT 1 FROM MISSION_HISTORY mh WHERE mh.Target_Trainer_ID = t.Trainer_ID)
+    ORDER BY t.NotorietyScore DESC
+"""
+
+# Reads the trigger-maintained BASE_MISSION_STATS (schema.sql GROUP 7) plus its
+# archived half, BASE_MISSION_HISTORY_STATS (GROUP 10): at most two rows per base.
+MISSION_SUCCESS_RATE_BY_BASE_SQL = """
+    SELECT b.Name as Base_Name, SUM(s.Total_Missions) AS Total_Missions,
+           SUM(s.Completed_Missions) AS Completed_Missions
+    FROM (
+        SELECT Base_ID, Total_Missions, Completed_Missions FROM BASE_MISSION_STATS
+        UNION ALL
+        SELECT Base_ID, Total_Missions, Completed_Missions FROM BASE_MISSION_HISTORY_STATS
+    ) s
+    JOIN BASE b ON b.Base_ID = s.Base_ID
+    GROUP BY b.Base_ID, b.Name
+    HAVING SUM(s.Total_Missions) > 0
+    ORDER BY Total_Missions DESC
+"""
+
+# Write statements, shared with the benchmark harness and bulk tools.
+INSERT_PERSONNEL_SQL = "INSERT INTO PERSONNEL (FName, LName, `Rank`, StartDate, Base_ID) VALUES (%s, %s, %s, CURDATE(), %s)"
+INSERT_GRUNT_SQL = "INSERT INTO GRUNT (Grunt_Personnel_ID) VALUES (%s)"
+INSERT_SCIENTIST_SQL = "INSERT INTO SCIENTIST (Scientist_Personnel_ID, Specialization) VALUES (%s, %s)"
+INSERT_BOSS_SQL = "INSERT INTO BOSS (Boss_Personnel_ID, Region_Managed) VALUES (%s, %s)"
+INSERT_OWNERSHIP_SQL = "INSERT INTO OWNERSHIP (Personnel_ID, Pokemon_ID) VALUES (%s, %s)"
+# Note: the f-string below is safe *only* because no user input goes into it.
+# The user input (new_status, mission_id) is still parameterized.
+UPDATE_MISSION_STATUS_SQL = "UPDATE MISSION SET Status = %s{end_date_sql} WHERE Mission_ID = %s"
+UPDATE_POKEMON_STATS_SQL = "UPDATE POKEMON SET HP = %s, Attack = %s, Defense = %s WHERE Pokemon_ID = %s"
+DELETE_PERSONNEL_SQL = "DELETE FROM PERSONNEL WHERE Personnel_ID = %s"
+LOCK_PERSONNEL_SQL = "SELECT RetiredDate FROM PERSONNEL WHERE Personnel_ID = %s FOR UPDATE"
+
+# Keyset (seek) variants of the list reports. Each orders by a unique key and
+# resumes strictly after the last key seen, so no page pays for an OFFSET scan.
+
+ACTIVE_MISSIONS_PAGE_SQL = """
+    SELECT m.Mission_ID, m.Objective, p.Personnel_ID, p.FName, p.LName, ma.Role
+    FROM MISSION m
+    JOIN MISSION_ASSIGNMENT ma ON m.Mission_ID = ma.Mission_ID
+    JOIN PERSONNEL p ON ma.Personnel_ID = p.Personnel_ID
+    WHERE m.Status = 'Active' AND p.RetiredDate IS NULL
+      AND (m.Mission_ID > %s
+           OR (m.Mission_ID = %s AND (p.LName > %s OR (p.LName = %s AND p.Personnel_ID > %s))))
+    ORDER BY m.Mission_ID, p.LName, p.Personnel_ID
+    LIMIT %s
+"""
+
+UNASSIGNED_ASSETS_PAGE_SQL = """
+    SELECT a.Asset_Code, a.Asset_Type, a.Value_Estimate
+    FROM ASSET a
+    WHERE a.Asset_Code NOT IN (
+        SELECT ma.Asset_Code
+        FROM MISSION_ASSETS ma
+        JOIN MISSION m ON ma.Mission_ID = m.Mission_ID
+        WHERE m.Status = 'Active'
+    )
+      AND {seek}
+    ORDER BY a.Value_Estimate DESC, a.Asset_Code
+    LIMIT %s
+"""
+
+# NULL estimates sort last under DESC, so the seek predicate depends on whether
+# the previous page ended inside the NULL tail.
+_ASSET_SEEK_VALUE = "(a.Value_Estimate < %s OR a.Value_Estimate IS NULL OR (a.Value_Estimate = %s AND a.Asset_Code > %s))"
+_ASSET_SEEK_NULL = "(a.Value_Estimate IS NULL AND a.Asset_Code > %s)"
+
+UNTARGETED_TRAINERS_PAGE_SQL = """
+    SELECT t.Trainer_ID, t.Name, t.Affiliation, t.NotorietyScore
+    FROM TRAINER t
+    LEFT JOIN MISSION m ON t.Trainer_ID = m.Target_Trainer_ID
+    WHERE t.NotorietyScore > %s AND m.Mission_ID IS NULL
+      AND NOT EXISTS (SELECT 1 FROM MISSION_HISTORY mh WHERE mh.Target_Trainer_ID = t.Trainer_ID)
+      AND (t.NotorietyScore < %s OR (t.NotorietyScore = %s AND t.Trainer_ID > %s))
+    ORDER BY t.NotorietyScore DESC, t.Trainer_ID
+    LIMIT %s
+"""
+
+# Every report query with representative parameters, keyed by a stable name.
+# The plan audit (plan_audit.py) EXPLAINs each of these.
+REPORT_QUERIES = {
+    'active_missions': (ACTIVE_MISSIONS_SQL, ()),
+    'active_missions_page': (ACTIVE_MISSIONS_PAGE_SQL, (0, 0, '', '', 0, DEFAULT_PAGE_SIZE + 1)),
+    'pending_mission_risk': (PENDING_MISSION_RISK_SQL, ()),
+    'top_performing_personnel': (TOP_PERFORMING_PERSONNEL_SQL, (5,)),
+    'unassigned_assets': (UNASSIGNED_ASSETS_SQL, ()),
+    'unassigned_assets_page': (UNASSIGNED_ASSETS_PAGE_SQL.format(seek="TRUE"), (DEFAULT_PAGE_SIZE + 1,)),
+    'pokemon_stats_by_type': (POKEMON_STATS_BY_TYPE_SQL, ()),
+    'untargeted_trainers': (UNTARGETED_TRAINERS_SQL, (50,)),
+    'untargeted_trainers_page': (UNTARGETED_TRAINERS_PAGE_SQL, (50, 2**31, 2**31, 0, DEFAULT_PAGE_SIZE + 1)),
+    'mission_success_rate_by_base': (MISSION_SUCCESS_RATE_BY_BASE_SQL, ()),
+}
+
+# --- Streaming & Pagination Helpers ---
+
+def stream_rows(pool, sql, params=None, batch_size=STREAM_BATCH_SIZE):
+    """
+    Yields rows from an unbuffered server-side cursor (SSDictCursor) as they
+    arrive, instead of materialising the whole result set first.
+    """
+    connection = pool.acquire()
+    finished = False
+    try:
+        cursor = connection.cursor(InstrumentedSSDictCursor)
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+        cursor.close()
+        finished = True
+    finally:
+        # An abandoned unbuffered result would have to be drained before the
+        # connection could be reused; dropping the socket is cheaper.
+        pool.release(connection, discard=not finished)
+
+def encode_page_token(key):
+    """Packs the last row's sort key into an opaque, URL-safe resume token."""
+    raw = json.dumps([str(v) if isinstance(v, decimal.Decimal) else v for v in key])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_page_token(token):
+    """Inverse of encode_page_token. Raises ValueError for a malformed token."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page token '{token}'.") from e
+    if not isinstance(key, list):
+        raise ValueError(f"Invalid page token '{token}'.")
+    return key
+
+def _fetch_page(pool, sql, params, page_size, key_of):
+    """
+    Runs a keyset query for page_size + 1 rows. Returns (rows, next_token),
+    where next_token is None once the last page has been reached.
+    """
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute(sql, (*params, page_size + 1))
+        rows = cursor.fetchall()
+
+    rows = list(rows)
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode_page_token(key_of(rows[-1]))
+
+def _check_page_size(page_size):
+    page_size = int(page_size)
+    if page_size < 1:
+        raise ValueError("Page size must be at least 1.")
+    return page_size
+
+# --- READ (QUERY) OPERATIONS ---
+
+@cached_query('MISSION', 'MISSION_ASSIGNMENT', 'PERSONNEL')
+def fetch_active_missions(pool):
+    """READ 1: 'Active' missions, one row per assigned personnel member."""
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute(ACTIVE_MISSIONS_SQL)
+        return cursor.fetchall()
+
+def iter_active_missions(pool):
+    """READ 1, streamed: yields rows one at a time from a server-side cursor."""
+    return stream_rows(pool, ACTIVE_MISSIONS_SQL)
+
+def fetch_active_missions_page(pool, page_size=DEFAULT_PAGE_SIZE, token=None):
+    """
+    READ 1, one keyset page ordered by (Mission_ID, LName, Personnel_ID).
+    Returns (rows, next_token).
+    """
+    page_size = _check_page_size(page_size)
+    mission_id, lname, personnel_id = decode_page_token(token) if token else (0, '', 0)
+    params = (mission_id, mission_id, lname, lname, personnel_id)
+    return _fetch_page(pool, ACTIVE_MISSIONS_PAGE_SQL, params, page_size,
+                       lambda row: (row['Mission_ID'], row['LName'], row['Personnel_ID']))
+
+@cached_query('MISSION', 'TRAINER')
+def fetch_pending_mission_risk(pool):
+    """READ 2: Mission count and total notoriety targeted by 'Pending' missions."""
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute(PENDING_MISSION_RISK_SQL)
+        return cursor.fetchone()
+
+@cached_query('PERSONNEL', 'MISSION_ASSIGNMENT', 'MISSION', 'MISSION_ASSIGNMENT_HISTORY', 'MISSION_HISTORY')
+def fetch_top_performing_personnel(pool, limit=5):
+    """READ 3: Personnel with the most 'Completed' missions."""
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute(TOP_PERFORMING_PERSONNEL_SQL, (int(limit),))
+        return cursor.fetchall()
+
+@cached_query('ASSET', 'MISSION_ASSETS', 'MISSION')
+def fetch_unassigned_assets(pool):
+    """READ 4: Assets not assigned to any 'Active' mission, most valuable first."""
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute(UNASSIGNED_ASSETS_SQL)
+        return cursor.fetchall()
+
+def iter_unassigned_assets(pool):
+    """READ 4, streamed: yields rows one at a time from a server-side cursor."""
+    return stream_rows(pool, UNASSIGNED_ASSETS_SQL)
+
+def fetch_unassigned_assets_page(pool, page_size=DEFAULT_PAGE_SIZE, token=None):
+    """
+    READ 4, one keyset page ordered by (Value_Estimate DESC, Asset_Code).
+    Returns (rows, next_token).
+    """
+    page_size = _check_page_size(page_size)
+    if token is None:
+        seek, params = "TRUE", ()
+    else:
+        value, code = decode_page_token(token)
+        if value is None:
+            seek, params = _ASSET_SEEK_NULL, (code,)
+        else:
+            value = decimal.Decimal(value)
+            seek, params = _ASSET_SEEK_VALUE, (value, value, code)
+    return _fetch_page(pool, UNASSIGNED_ASSETS_PAGE_SQL.format(seek=seek), params, page_size,
+                       lambda row: (row['Value_Estimate'], row['Asset_Code']))
+
+@cached_query('POKEMON', 'POKEMON_TYPE', 'POKEMON_TYPE_STATS')
+def fetch_pokemon_stats_by_type(pool):
+    """READ 5: Average HP, Attack and Defense per Pokemon type."""
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute(POKEMON_STATS_BY_TYPE_SQL)
+        return cursor.fetchall()
+
+@cached_query('TRAINER', 'MISSION', 'MISSION_HISTORY')
+def fetch_untargeted_trainers(pool, min_score):
+    """READ 6: Trainers above `min_score` notoriety that no mission targets."""
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute(UNTARGETED_TRAINERS_SQL, (int(min_score),))
+        return cursor.fetchall()
+
+def iter_untargeted_trainers(pool, min_score):
+    """READ 6, streamed: yields rows one at a time from a server-side cursor."""
+    return stream_rows(pool, UNTARGETED_TRAINERS_SQL, (int(min_score),))
+
+def fetch_untargeted_trainers_page(pool, min_score, page_size=DEFAULT_PAGE_SIZE, token=None):
+    """
+    READ 6, one keyset page ordered by (NotorietyScore DESC, Trainer_ID).
+    Returns (rows, next_token).
+    """
+    page_size = _check_page_size(page_size)
+    if token is None:
+        # NotorietyScore is an INT with CHECK >= 0, so this bound admits every row.
+        score, trainer_id = 2**31, 0
+    else:
+        score, trainer_id = decode_page_token(token)
+    params = (int(min_score), int(score), int(score), int(trainer_id))
+    return _fetch_page(pool, UNTARGETED_TRAINERS_PAGE_SQL, params, page_size,
+                       lambda row: (row['NotorietyScore'], row['Trainer_ID']))
+
+@cached_query('BASE', 'PERSONNEL', 'MISSION_ASSIGNMENT', 'MISSION', 'BASE_MISSION_STATS',
+              'BASE_MISSION_HISTORY_STATS')
+def fetch_mission_success_rate_by_base(pool):
+    """READ 7: Total and completed missions per base, with the success rate in percent."""
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute(MISSION_SUCCESS_RATE_BY_BASE_SQL)
+        results = cursor.fetchall()
+
+    for row in results:
+        # SUM() over the live and archived halves comes back as DECIMAL on MySQL.
+        total = row['Total_Missions'] = int(row['Total_Missions'])
+        completed = row['Completed_Missions'] = int(row['Completed_Missions'])
+        row['Success_Rate'] = (completed / total * 100) if total > 0 else 0
+    return results
+
+# --- WRITE (C/U/D) OPERATIONS ---
+
+class RetiredPersonnelError(ValueError):
+    """A write targeted a personnel member who has been soft-retired."""
+
+def lock_serving_personnel(cursor, personnel_id):
+    """
+    Locks a PERSONNEL row on an open transaction, so a soft retirement cannot
+    land between this check and the write that follows. Raises
+    RetiredPersonnelError if the person has retired; a missing person is left
+    to the foreign key.
+    """
+    cursor.execute(LOCK_PERSONNEL_SQL, (int(personnel_id),))
+    person = cursor.fetchone()
+    if person and person['RetiredDate'] is not None:
+        raise RetiredPersonnelError(f"Personnel {personnel_id} retired on {person['RetiredDate']}.")
+
+def normalize_mission_status(status):
+    """Canonical spelling of a mission status. Raises ValueError if it is not valid."""
+    normalized = str(status).strip().capitalize()
+    if normalized not in VALID_MISSION_STATUSES:
+        raise ValueError(f"Invalid status '{normalized}'.")
+    return normalized
+
+def mission_end_date_sql(new_status):
+    """The extra SET clause for a status change: closing statuses also set EndDate."""
+    return ", EndDate = CURDATE()" if new_status in CLOSED_MISSION_STATUSES else ""
+
+def mission_status_sql(new_status):
+    """The UPDATE for a status change; closing statuses also set EndDate."""
+    return UPDATE_MISSION_STATUS_SQL.format(end_date_sql=mission_end_date_sql(new_status))
+
+def insert_personnel(cursor, fname, lname, rank, base_id=None, specialization=None, region=None):
+    """
+    Inserts one PERSONNEL row and its subclass row on an open cursor, without
+    committing. Returns the new Personnel_ID.
+    """
+    cursor.execute(INSERT_PERSONNEL_SQL, (fname, lname, rank, base_id))
+    personnel_id = cursor.lastrowid
+
+    if rank == 'Grunt':
+        cursor.execute(INSERT_GRUNT_SQL, (personnel_id,))
+    elif rank == 'Scientist':
+        cursor.execute(INSERT_SCIENTIST_SQL, (personnel_id, specialization))
+    elif rank == 'Boss':
+        cursor.execute(INSERT_BOSS_SQL, (personnel_id, region))
+    return personnel_id
+
+@invalidates('PERSONNEL', 'BOSS', 'GRUNT', 'SCIENTIST')
+def recruit_personnel(pool, fname, lname, rank, base_id=None, specialization=None, region=None):
+    """
+    WRITE 8: Inserts a PERSONNEL row plus its BOSS, GRUNT or SCIENTIST subclass row.
+    Returns the new Personnel_ID. Raises ValueError for an invalid rank.
+    """
+    rank = rank.strip().capitalize()
+    if rank not in VALID_RANKS:
+        raise ValueError(f"Invalid rank '{rank}'.")
+
+    with pool.connection() as connection:
+        with connection.cursor() as cursor:
+            personnel_id = insert_personnel(cursor, fname, lname, rank, base_id, specialization, region)
+
+        connection.commit()
+    return personnel_id
+
+@invalidates('OWNERSHIP')
+def assign_pokemon(pool, personnel_id, pokemon_id):
+    """
+    WRITE 9: Records that a personnel member owns a Pokemon.
+    Raises RetiredPersonnelError if they have retired.
+    """
+    with pool.connection() as connection:
+        with connection.cursor() as cursor:
+            lock_serving_personnel(cursor, personnel_id)
+            cursor.execute(INSERT_OWNERSHIP_SQL, (int(personnel_id), int(pokemon_id)))
+        connection.commit()
+
+@invalidates('MISSION')
+def set_mission_status(pool, mission_id, new_status):
+    """
+    WRITE 10: Changes a mission's status; closing statuses also set EndDate.
+    Returns the number of missions updated (0 if the ID does not exist).
+    """
+    new_status = normalize_mission_status(new_status)
+
+    with pool.connection() as connection:
+        with connection.cursor() as cursor:
+            rows_affected = cursor.execute(mission_status_sql(new_status), (new_status, int(mission_id)))
+
+        if rows_affected:
+            connection.commit()
+    return rows_affected
+
+@invalidates('POKEMON')
+def set_pokemon_stats(pool, pokemon_id, hp, attack, defense):
+    """
+    WRITE 11: Overwrites a Pokemon's HP, Attack and Defense.
+    Returns the number of Pokemon updated. Raises ValueError for non-positive stats.
+    """
+    hp, attack, defense = int(hp), int(attack), int(defense)
+    if hp <= 0 or attack <= 0 or defense <= 0:
+        raise ValueError("Stats must be positive.")
+
+    with pool.connection() as connection:
+        with connection.cursor() as cursor:
+            rows = cursor.execute(UPDATE_POKEMON_STATS_SQL, (hp, attack, defense, int(pokemon_id)))
+
+        if rows:
+            connection.commit()
+    return rows
+
+@invalidates(*PERSONNEL_CASCADE_TABLES)
+def delete_personnel(pool, personnel_id):
+    """
+    WRITE 12: Deletes a personnel member; ON DELETE CASCADE removes the dependants.
+    Returns the number of personnel deleted.
+    """
+    with pool.connection() as connection:
+        with connection.cursor() as cursor:
+            rows = cursor.execute(DELETE_PERSONNEL_SQL, (int(personnel_id),))
+
+        if rows:
+            connection.commit()
+    return rows
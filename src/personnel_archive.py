@@ -0,0 +1,195 @@
+"""
+Personnel Retirement and Archival (personnel_archive.py)
+Alternative to WRITE 12 for personnel with long histories. A plain DELETE
+cascades through every assignment, ownership and engagement row in one
+statement, holding locks across all of those tables, and can still fail at the
+end on EXPERIMENTATION_EVENT's ON DELETE RESTRICT. Retiring instead moves the
+history into the *_ARCHIVE tables in small committed batches, then deletes the
+person with nothing left to cascade (or, with --soft, only marks them retired).
+
+    python3 main_app.py retire --personnel-id 42 --report
+    python3 main_app.py retire --personnel-id 42 --personnel-id 43 --yes --batch-size 200
+    python3 main_app.py retire --personnel-id 42 --soft --yes
+"""
+
+import time
+
+from cache import result_cache
+
+DEFAULT_BATCH_SIZE = 500
+
+# History tables moved into <TABLE>_ARCHIVE before the final delete:
+# table -> (column holding the Personnel_ID, remaining key columns, all columns).
+HISTORY_TABLES = {
+    'FIELD_ENGAGEMENT': ('Grunt_Personnel_ID', ('Trainer_ID', 'Mission_ID'),
+                         ('Grunt_Personnel_ID', 'Trainer_ID', 'Mission_ID', 'Pokemon_ID')),
+    'EXPERIMENTATION_EVENT': ('Scientist_Personnel_ID', ('Serum_ID', 'Pokemon_ID', 'Project_ID'),
+                              ('Scientist_Personnel_ID', 'Serum_ID', 'Pokemon_ID', 'Project_ID')),
+    'MISSION_ASSIGNMENT': ('Personnel_ID', ('Mission_ID',),
+                           ('Mission_ID', 'Personnel_ID', 'Role', 'AssignedDate', '`Status`')),
+    'ASSIGNED_TO': ('Personnel_ID', ('Mission_ID',), ('Personnel_ID', 'Mission_ID')),
+    'OWNERSHIP': ('Personnel_ID', ('Pokemon_ID',), ('Personnel_ID', 'Pokemon_ID')),
+}
+
+ARCHIVE_TABLES = ('PERSONNEL_ARCHIVE', *(f"{table}_ARCHIVE" for table in HISTORY_TABLES))
+
+# Everything a DELETE FROM PERSONNEL touches, for the pre-flight report:
+# (table, column referencing the person, what the foreign key does).
+DEPENDANTS = (
+    ('BOSS', 'Boss_Personnel_ID', 'CASCADE'),
+    ('GRUNT', 'Grunt_Personnel_ID', 'CASCADE'),
+    ('SCIENTIST', 'Scientist_Personnel_ID', 'CASCADE'),
+    ('BASE', 'Boss_ID', 'SET NULL'),
+    ('SQUADS', 'Boss_ID', 'SET NULL'),
+    ('MISSION_ASSIGNMENT', 'Personnel_ID', 'CASCADE'),
+    ('ASSIGNED_TO', 'Personnel_ID', 'CASCADE'),
+    ('OWNERSHIP', 'Personnel_ID', 'CASCADE'),
+    ('FIELD_ENGAGEMENT', 'Grunt_Personnel_ID', 'CASCADE'),
+    ('EXPERIMENTATION_EVENT', 'Scientist_Personnel_ID', 'RESTRICT'),
+)
+
+# Tables whose cached report results change when someone retires.
+RETIRE_TABLES = ('PERSONNEL', 'BOSS', 'GRUNT', 'SCIENTIST', 'BASE', 'SQUADS', *HISTORY_TABLES)
+
+LOCK_PERSON_SQL = "SELECT Personnel_ID, RetiredDate FROM PERSONNEL WHERE Personnel_ID = %s FOR UPDATE"
+ARCHIVE_PERSON_SQL = """
+    INSERT INTO PERSONNEL_ARCHIVE
+        (Personnel_ID, FName, LName, `Rank`, StartDate, Base_ID, RetiredDate,
+         Region_Managed, Squad_ID, Specialization, Project_ID)
+    SELECT p.Personnel_ID, p.FName, p.LName, p.`Rank`, p.StartDate, p.Base_ID, COALESCE(p.RetiredDate, CURDATE()),
+           b.Region_Managed, g.Squad_ID, s.Specialization, s.Project_ID
+    FROM PERSONNEL p
+    LEFT JOIN BOSS b ON b.Boss_Personnel_ID = p.Personnel_ID
+    LEFT JOIN GRUNT g ON g.Grunt_Personnel_ID = p.Personnel_ID
+    LEFT JOIN SCIENTIST s ON s.Scientist_Personnel_ID = p.Personnel_ID
+    WHERE p.Personnel_ID = %s
+"""
+SOFT_RETIRE_SQL = "UPDATE PERSONNEL SET RetiredDate = CURDATE() WHERE Personnel_ID = %s AND RetiredDate IS NULL"
+
+
+# --- Pre-flight ---
+
+def preflight(pool, personnel_id):
+    """
+    Counts the rows a delete of `personnel_id` would touch, one index lookup per
+    table. Returns [{'Table', 'Rows', 'On_Delete'}] (PERSONNEL first), or an
+    empty list if the person does not exist.
+    """
+    personnel_id = int(personnel_id)
+    report = []
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute("SELECT RetiredDate FROM PERSONNEL WHERE Personnel_ID = %s", (personnel_id,))
+        person = cursor.fetchone()
+        if person is None:
+            return report
+        report.append({'Table': 'PERSONNEL', 'Rows': 1,
+                       'On_Delete': f"retired {person['RetiredDate']}" if person['RetiredDate'] else 'DELETE'})
+        for table, column, action in DEPENDANTS:
+            cursor.execute(f"SELECT COUNT(*) AS N FROM {table} WHERE {column} = %s", (personnel_id,))
+            report.append({'Table': table, 'Rows': cursor.fetchone()['N'], 'On_Delete': action})
+    return report
+
+
+def blocks_delete(report):
+    """True if a plain DELETE (WRITE 12) would fail on an ON DELETE RESTRICT row."""
+    return any(row['On_Delete'] == 'RESTRICT' and row['Rows'] for row in report)
+
+
+# --- Archival ---
+
+def _key_condition(keys, count):
+    """`k IN (...)`, or a row constructor `(k1, k2) IN ((...), ...)` for composite keys."""
+    if len(keys) == 1:
+        return f"{keys[0]} IN ({', '.join(['%s'] * count)})"
+    row = f"({', '.join(['%s'] * len(keys))})"
+    return f"({', '.join(keys)}) IN ({', '.join([row] * count)})"
+
+
+def _move_batch(cursor, table, personnel_id, limit=None):
+    """
+    Copies up to `limit` of the person's rows in `table` into its archive table
+    and deletes them, on an open transaction. Returns the number of rows moved.
+    """
+    person_column, keys, columns = HISTORY_TABLES[table]
+    sql = f"SELECT {', '.join(keys)} FROM {table} WHERE {person_column} = %s ORDER BY {', '.join(keys)}"
+    params = [personnel_id]
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+    cursor.execute(sql + " FOR UPDATE", params)
+    key_values = [value for row in cursor.fetchall() for value in (row[k] for k in keys)]
+    count = len(key_values) // len(keys)
+    if not count:
+        return 0
+
+    where = f"{person_column} = %s AND {_key_condition(keys, count)}"
+    column_list = ', '.join(columns)
+    cursor.execute(f"INSERT INTO {table}_ARCHIVE ({column_list}) SELECT {column_list} FROM {table} WHERE {where}",
+                   (personnel_id, *key_values))
+    return cursor.execute(f"DELETE FROM {table} WHERE {where}", (personnel_id, *key_values))
+
+
+def _progress(personnel_id, step, table, rows, started):
+    return {'Personnel_ID': personnel_id, 'Step': step, 'Table': table, 'Rows': rows,
+            'Seconds': round(time.monotonic() - started, 3)}
+
+
+def soft_retire(pool, personnel_id):
+    """Marks the person retired (RetiredDate = today) without touching any other row."""
+    with pool.connection() as connection:
+        with connection.cursor() as cursor:
+            rows = cursor.execute(SOFT_RETIRE_SQL, (int(personnel_id),))
+        if rows:
+            connection.commit()
+    result_cache.invalidate('PERSONNEL')
+    return rows
+
+
+def retire(pool, personnel_id, batch_size=DEFAULT_BATCH_SIZE, pause=0.0):
+    """
+    Archives the person's history `batch_size` rows at a time, one transaction
+    per batch, then archives and deletes the person. Yields one progress dict
+    per committed step: Personnel_ID, Step ('archive' or 'delete'), Table,
+    Rows, Seconds.
+
+    Interrupted runs are safe to repeat: archived rows are already gone from
+    the live tables. Rows added while the batches run are swept up under the
+    lock on the PERSONNEL row just before the delete.
+    """
+    personnel_id = int(personnel_id)
+    batch_size = int(batch_size)
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1.")
+
+    with pool.connection() as connection:
+        for table in HISTORY_TABLES:
+            while True:
+                started = time.monotonic()
+                with connection.cursor() as cursor:
+                    moved = _move_batch(cursor, table, personnel_id, batch_size)
+                if not moved:
+                    connection.rollback()  # release the (empty) FOR UPDATE read
+                    break
+                connection.commit()
+                result_cache.invalidate(table)
+                yield _progress(personnel_id, 'archive', table, moved, started)
+                if moved < batch_size:
+                    break
+                if pause:
+                    time.sleep(pause)  # let writers queued behind these row locks through
+
+        # Locking the person blocks new child rows (their FK checks need a shared
+        # lock on it), so whatever the sweep finds is all that is left.
+        started = time.monotonic()
+        with connection.cursor() as cursor:
+            if not cursor.execute(LOCK_PERSON_SQL, (personnel_id,)):
+                connection.rollback()
+                return
+            swept = sum(_move_batch(cursor, table, personnel_id) for table in HISTORY_TABLES)
+            cursor.execute(ARCHIVE_PERSON_SQL, (personnel_id,))
+            deleted = cursor.execute("DELETE FROM PERSONNEL WHERE Personnel_ID = %s", (personnel_id,))
+        connection.commit()
+    result_cache.invalidate(*RETIRE_TABLES)
+    if swept:
+        yield _progress(personnel_id, 'archive', 'late rows', swept, started)
+    yield _progress(personnel_id, 'delete', 'PERSONNEL', deleted, started)
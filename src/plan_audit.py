@@ -0,0 +1,101 @@
+"""
+Query Plan Audit (plan_audit.py)
+Runs EXPLAIN FORMAT=JSON on every registered report query and flags full
+table scans, full index scans, filesorts and temporary tables, so plan
+regressions surface before they reach production.
+
+    python3 main_app.py plan-audit
+    python3 main_app.py plan-audit --min-rows 1000 --query unassigned_assets
+"""
+
+import json
+
+import operations
+
+# Findings that are inherent to a query's shape and therefore expected.
+# Scans are qualified by the table alias as written in the query.
+ALLOWED_FINDINGS = {
+    # Sorting by personnel name within each mission needs a sort step.
+    'active_missions': {'filesort', 'temporary'},
+    'active_missions_page': {'filesort', 'temporary'},
+    # Grouped counts ordered by the aggregate cannot come out of an index.
+    'top_performing_personnel': {'filesort', 'temporary'},
+    # The anti-join has to look at every asset; it should do so in index order.
+    'unassigned_assets': {'full_index_scan:a'},
+    'unassigned_assets_page': {'full_index_scan:a'},
+    # One summary row per type / base is read in full and sorted by a derived value.
+    'pokemon_stats_by_type': {'full_scan:ts', 'filesort'},
+    'mission_success_rate_by_base': {'full_scan:s', 'full_scan:b', 'filesort'},
+}
+
+
+def _walk_plan(node, findings, min_rows):
+    """
+    Collects (finding, estimated_rows) pairs from an EXPLAIN JSON tree. Handles
+    both MySQL ('using_filesort', 'using_temporary_table') and MariaDB
+    ('filesort', 'temporary_table') spellings.
+    """
+    if isinstance(node, list):
+        for child in node:
+            _walk_plan(child, findings, min_rows)
+        return
+    if not isinstance(node, dict):
+        return
+
+    table = node.get('table_name')
+    access = node.get('access_type')
+    # '<subqueryN>' / '<derivedN>' are the server's own materialisations.
+    if table and not table.startswith('<') and access in ('ALL', 'index'):
+        rows = node.get('rows_examined_per_scan', node.get('rows', 0)) or 0
+        if rows >= min_rows:
+            issue = 'full_scan' if access == 'ALL' else 'full_index_scan'
+            findings.append((f"{issue}:{table}", rows))
+    if node.get('using_filesort') is True or 'filesort' in node:
+        findings.append(('filesort', None))
+    if node.get('using_temporary_table') is True or 'temporary_table' in node:
+        findings.append(('temporary', None))
+
+    for child in node.values():
+        if isinstance(child, (dict, list)):
+            _walk_plan(child, findings, min_rows)
+
+
+def explain_query(connection, sql, params):
+    """Returns the parsed EXPLAIN FORMAT=JSON plan for one query."""
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN FORMAT=JSON " + sql, params)
+        row = cursor.fetchone()
+    return json.loads(next(iter(row.values())))
+
+
+def audit_queries(pool, names=None, min_rows=0):
+    """
+    Audits the registered report queries (or just `names`). Returns one dict per
+    finding with Query, Finding, Est_Rows and Allowed. Duplicate findings within
+    a query are reported once.
+    """
+    names = names or list(operations.REPORT_QUERIES)
+    unknown = [name for name in names if name not in operations.REPORT_QUERIES]
+    if unknown:
+        raise ValueError(f"Unknown query name(s): {', '.join(unknown)}")
+
+    results = []
+    with pool.connection() as connection:
+        for name in names:
+            sql, params = operations.REPORT_QUERIES[name]
+            findings = []
+            _walk_plan(explain_query(connection, sql, params), findings, min_rows)
+
+            allowed = ALLOWED_FINDINGS.get(name, set())
+            seen = set()
+            for finding, rows in findings:
+                if finding in seen:
+                    continue
+                seen.add(finding)
+                results.append({
+                    'Query': name,
+                    'Finding': finding,
+                    'Est_Rows': rows,
+                    'Allowed': finding in allowed,
+                })
+    return results
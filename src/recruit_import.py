@@ -0,0 +1,297 @@
+"""
+Bulk Recruitment Import (recruit_import.py)
+Imports many recruits at once from CSV or JSON lines. Every record is
+validated before anything is written; valid records are then inserted in
+batches, with one multi-row INSERT per table and one transaction per batch.
+
+    python3 main_app.py import-recruits new_base.csv --batch-size 2000
+    cat recruits.jsonl | python3 main_app.py import-recruits - --input-format jsonl
+
+Accepted fields: first_name, last_name, rank, base_id, specialization (Scientists),
+region (Bosses, required), start_date (YYYY-MM-DD, default today).
+"""
+
+import os
+import csv
+import json
+import datetime
+
+import pymysql
+
+import operations
+from cache import result_cache
+
+DEFAULT_BATCH_SIZE = 1000
+# pymysql folds executemany() into one statement only while it stays under
+# max_stmt_length (1 MB); at ~150 bytes a row this keeps every batch in one
+# statement, which the lastrowid mapping below relies on.
+MAX_BATCH_SIZE = 5000
+
+INPUT_FORMATS = ('csv', 'jsonl')
+FIELDS = ('first_name', 'last_name', 'rank', 'base_id', 'specialization', 'region', 'start_date')
+
+# Column limits from schema.sql.
+NAME_MAX_LENGTH = 50
+SPECIALIZATION_MAX_LENGTH = 100
+REGION_MAX_LENGTH = 100
+
+# Only %s placeholders, so executemany() can fold the batch into one multi-row INSERT
+# (operations.INSERT_PERSONNEL_SQL uses CURDATE(), which forces one statement per row).
+BULK_INSERT_PERSONNEL_SQL = "INSERT INTO PERSONNEL (FName, LName, `Rank`, StartDate, Base_ID) VALUES (%s, %s, %s, %s, %s)"
+
+RECRUIT_TABLES = ('PERSONNEL', 'BOSS', 'GRUNT', 'SCIENTIST')
+
+
+# --- Reading ---
+
+def detect_format(path):
+    """Input format from the file extension; stdin and unknown extensions read as CSV."""
+    ext = os.path.splitext(path)[1].lower()
+    return 'jsonl' if ext in ('.jsonl', '.ndjson', '.json') else 'csv'
+
+
+def read_records(stream, fmt='csv'):
+    """
+    Yields (line_number, record) pairs. A record is a dict of raw field values,
+    or a string describing why the line could not be parsed.
+    """
+    if fmt not in INPUT_FORMATS:
+        raise ValueError(f"Unknown input format '{fmt}'")
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            if None in record:
+                yield reader.line_num, "More values than header columns."
+            else:
+                yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, f"Invalid JSON: {e}"
+            continue
+        yield line_number, record if isinstance(record, dict) else "Expected a JSON object."
+
+
+# --- Validation ---
+
+def _text(record, field):
+    value = record.get(field)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def validate_record(record, today=None):
+    """
+    Normalizes one raw record. Returns (recruit, None) or (None, error). Base
+    IDs are only checked for shape here; validate_bases() checks they exist.
+    """
+    if not isinstance(record, dict):
+        return None, record
+    unknown = sorted(set(record) - set(FIELDS))
+    if unknown:
+        return None, f"Unknown field(s): {', '.join(unknown)}."
+
+    fname, lname = _text(record, 'first_name'), _text(record, 'last_name')
+    if not fname or not lname:
+        return None, "first_name and last_name are required."
+    if len(fname) > NAME_MAX_LENGTH or len(lname) > NAME_MAX_LENGTH:
+        return None, f"Names are limited to {NAME_MAX_LENGTH} characters."
+
+    rank = (_text(record, 'rank') or '').capitalize()
+    if rank not in operations.VALID_RANKS:
+        return None, f"Invalid rank '{record.get('rank')}'."
+
+    base_id = _text(record, 'base_id')
+    if base_id is not None:
+        try:
+            base_id = int(base_id)
+        except ValueError:
+            return None, f"Invalid base_id '{base_id}'."
+
+    specialization = _text(record, 'specialization')
+    if specialization is not None and rank != 'Scientist':
+        return None, "specialization applies to Scientists only."
+    if specialization is not None and len(specialization) > SPECIALIZATION_MAX_LENGTH:
+        return None, f"specialization is limited to {SPECIALIZATION_MAX_LENGTH} characters."
+
+    region = _text(record, 'region')
+    if rank == 'Boss' and region is None:
+        return None, "region is required for Bosses."
+    if region is not None and rank != 'Boss':
+        return None, "region applies to Bosses only."
+    if region is not None and len(region) > REGION_MAX_LENGTH:
+        return None, f"region is limited to {REGION_MAX_LENGTH} characters."
+
+    start_date = _text(record, 'start_date')
+    try:
+        start_date = datetime.date.fromisoformat(start_date) if start_date else (today or datetime.date.today())
+    except ValueError:
+        return None, f"Invalid start_date '{start_date}' (expected YYYY-MM-DD)."
+
+    return {
+        'fname': fname,
+        'lname': lname,
+        'rank': rank,
+        'base_id': base_id,
+        'start_date': start_date,
+        'specialization': specialization,
+        'region': region,
+    }, None
+
+
+def validate_bases(pool, base_ids, chunk_size=1000):
+    """Returns the subset of `base_ids` that do not exist in BASE."""
+    missing = set(base_ids)
+    ids = sorted(missing)
+    with pool.connection() as connection, connection.cursor() as cursor:
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"SELECT Base_ID FROM BASE WHERE Base_ID IN ({placeholders})", chunk)
+            missing -= {row['Base_ID'] for row in cursor.fetchall()}
+    return missing
+
+
+# --- Writing ---
+
+class _IdMismatch(Exception):
+    """The IDs derived from lastrowid do not belong to this batch's rows."""
+
+
+def _personnel_row(recruit):
+    return (recruit['fname'], recruit['lname'], recruit['rank'], recruit['start_date'], recruit['base_id'])
+
+
+def _insert_subclasses(cursor, recruits, ids):
+    """One executemany per subclass table for the batch."""
+    grunts = [(pid,) for pid, r in zip(ids, recruits) if r['rank'] == 'Grunt']
+    scientists = [(pid, r['specialization']) for pid, r in zip(ids, recruits) if r['rank'] == 'Scientist']
+    bosses = [(pid, r['region']) for pid, r in zip(ids, recruits) if r['rank'] == 'Boss']
+    if grunts:
+        cursor.executemany(operations.INSERT_GRUNT_SQL, grunts)
+    if scientists:
+        cursor.executemany(operations.INSERT_SCIENTIST_SQL, scientists)
+    if bosses:
+        cursor.executemany(operations.INSERT_BOSS_SQL, bosses)
+
+
+def _insert_batch(cursor, recruits, step):
+    """
+    Inserts the batch with one multi-row INSERT into PERSONNEL. A multi-row
+    INSERT reports the first generated ID as lastrowid; the rest follow at
+    auto_increment_increment steps unless another session interleaved
+    (innodb_autoinc_lock_mode = 2), so the range is checked before use.
+    Returns the Personnel_IDs in batch order.
+    """
+    cursor.executemany(BULK_INSERT_PERSONNEL_SQL, [_personnel_row(r) for r in recruits])
+    first_id = cursor.lastrowid
+    ids = [first_id + i * step for i in range(len(recruits))]
+
+    cursor.execute("SELECT Personnel_ID, FName, LName, `Rank`, StartDate, Base_ID FROM PERSONNEL "
+                   "WHERE Personnel_ID BETWEEN %s AND %s ORDER BY Personnel_ID", (ids[0], ids[-1]))
+    stored = [(row['FName'], row['LName'], row['Rank'], row['StartDate'], row['Base_ID'])
+              for row in cursor.fetchall() if (row['Personnel_ID'] - first_id) % step == 0]
+    if stored != [_personnel_row(r) for r in recruits]:
+        raise _IdMismatch()
+
+    _insert_subclasses(cursor, recruits, ids)
+    return ids
+
+
+def _insert_one_by_one(cursor, recruits):
+    """
+    Slow path for a batch that failed as a whole: each recruit goes in under its
+    own savepoint, so one bad row does not take the rest of the batch with it.
+    Returns a (Personnel_ID or None, error or None) pair per recruit.
+    """
+    results = []
+    for recruit in recruits:
+        cursor.execute("SAVEPOINT recruit_row")
+        try:
+            cursor.execute(BULK_INSERT_PERSONNEL_SQL, _personnel_row(recruit))
+            personnel_id = cursor.lastrowid
+            _insert_subclasses(cursor, [recruit], [personnel_id])
+            results.append((personnel_id, None))
+        except pymysql.Error as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT recruit_row")
+            results.append((None, str(e)))
+    return results
+
+
+def _result(line, recruit, personnel_id=None, status='recruited', error=None):
+    return {
+        'Line': line,
+        'Personnel_ID': personnel_id,
+        'Rank': recruit['rank'] if recruit else None,
+        'Status': status,
+        'Error': error,
+    }
+
+
+def import_recruits(pool, records, batch_size=DEFAULT_BATCH_SIZE, skip_invalid=False, validate_only=False):
+    """
+    Validates every (line, record) pair first, then writes the valid ones in
+    batches of `batch_size`, one transaction per batch. Yields one result per
+    record: Status 'recruited', 'valid' (validate_only), 'invalid' or 'failed'.
+    Unless skip_invalid is set, any invalid record means nothing is written.
+    """
+    batch_size = int(batch_size)
+    if not 1 <= batch_size <= MAX_BATCH_SIZE:
+        raise ValueError(f"Batch size must be between 1 and {MAX_BATCH_SIZE}.")
+
+    today = datetime.date.today()
+    valid, invalid = [], []
+    for line, record in records:
+        recruit, error = validate_record(record, today)
+        if error:
+            invalid.append(_result(line, None, status='invalid', error=error))
+        else:
+            valid.append((line, recruit))
+
+    missing = validate_bases(pool, {r['base_id'] for _, r in valid if r['base_id'] is not None})
+    if missing:
+        still_valid = []
+        for line, recruit in valid:
+            if recruit['base_id'] in missing:
+                invalid.append(_result(line, recruit, status='invalid', error=f"Base {recruit['base_id']} does not exist."))
+            else:
+                still_valid.append((line, recruit))
+        valid = still_valid
+
+    invalid.sort(key=lambda row: row['Line'])
+    yield from invalid
+    if validate_only:
+        yield from (_result(line, recruit, status='valid') for line, recruit in valid)
+        return
+    if invalid and not skip_invalid:
+        return
+
+    with pool.connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT @@auto_increment_increment AS Step")
+            step = int(cursor.fetchone()['Step'])
+
+        for start in range(0, len(valid), batch_size):
+            lines = [line for line, _ in valid[start:start + batch_size]]
+            recruits = [recruit for _, recruit in valid[start:start + batch_size]]
+            with connection.cursor() as cursor:
+                try:
+                    outcomes = [(pid, None) for pid in _insert_batch(cursor, recruits, step)]
+                except (_IdMismatch, pymysql.err.IntegrityError, pymysql.err.DataError):
+                    connection.rollback()
+                    outcomes = _insert_one_by_one(cursor, recruits)
+            connection.commit()
+            result_cache.invalidate(*RECRUIT_TABLES)
+
+            for line, recruit, (personnel_id, error) in zip(lines, recruits, outcomes):
+                if error:
+                    yield _result(line, recruit, status='failed', error=error)
+                else:
+                    yield _result(line, recruit, personnel_id)
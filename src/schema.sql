@@ -73,7 +73,8 @@ CREATE TABLE PERSONNEL (
     LName VARCHAR(50) NOT NULL,
     `Rank` ENUM('Boss', 'Grunt', 'Scientist') NOT NULL,
     StartDate DATE,
-    Base_ID INT -- FK constraint added at the end
+    Base_ID INT, -- FK constraint added at the end
+    RetiredDate DATE -- Set by a soft retirement; NULL while serving
 );
 
 -- ====== GROUP 3: Specialization & Dependent Entities ======
@@ -184,7 +185,9 @@ CREATE TABLE MISSION_ASSIGNMENT (
     Role VARCHAR(100),
     AssignedDate DATE,
     `Status` ENUM('Assigned', 'Engaged', 'Battle Lost', 'Travelling') DEFAULT 'Assigned',
+    Seq BIGINT NOT NULL AUTO_INCREMENT, -- Insertion order, for engagement_graph.py's incremental refresh
     PRIMARY KEY (Mission_ID, Personnel_ID),
+    UNIQUE KEY uq_mission_assignment_seq (Seq),
     FOREIGN KEY (Mission_ID) REFERENCES MISSION(Mission_ID)
         ON DELETE CASCADE
         ON UPDATE CASCADE,
@@ -211,7 +214,9 @@ CREATE TABLE MISSION_ASSETS (
 CREATE TABLE OWNERSHIP (
     Personnel_ID INT,
     Pokemon_ID INT,
+    Seq BIGINT NOT NULL AUTO_INCREMENT, -- Insertion order, as in MISSION_ASSIGNMENT
     PRIMARY KEY (Personnel_ID, Pokemon_ID),
+    UNIQUE KEY uq_ownership_seq (Seq),
     FOREIGN KEY (Personnel_ID) REFERENCES PERSONNEL(Personnel_ID)
         ON DELETE CASCADE
         ON UPDATE CASCADE,
@@ -226,7 +231,9 @@ CREATE TABLE FIELD_ENGAGEMENT (
     Trainer_ID INT,
     Mission_ID INT,
     Pokemon_ID INT,
+    Seq BIGINT NOT NULL AUTO_INCREMENT, -- Insertion order, as in MISSION_ASSIGNMENT
     PRIMARY KEY (Grunt_Personnel_ID, Trainer_ID, Mission_ID),
+    UNIQUE KEY uq_field_engagement_seq (Seq),
     FOREIGN KEY (Grunt_Personnel_ID) REFERENCES GRUNT(Grunt_Personnel_ID)
         ON DELETE CASCADE
         ON UPDATE CASCADE,
@@ -273,4 +280,463 @@ ADD CONSTRAINT fk_personnel_base
     ON DELETE SET NULL -- If a base is destroyed, the personnel are unassigned
     ON UPDATE CASCADE;
 
+
+-- ====== GROUP 6: Secondary Indexes for the Report Queries ======
+-- Fresh installs get these here; existing databases apply
+-- migrations/001_report_indexes.sql instead.
+
+-- MISSION: every report filters on Status; risk and untargeted-trainer checks
+-- combine it with the target trainer (this also serves the Target_Trainer_ID FK).
+CREATE INDEX idx_mission_status_target ON MISSION (`Status`, Target_Trainer_ID);
+CREATE INDEX idx_mission_target_status ON MISSION (Target_Trainer_ID, `Status`);
+
+-- TRAINER: High Notoriety Trainers filters and sorts on the score.
+CREATE INDEX idx_trainer_notoriety ON TRAINER (NotorietyScore, Trainer_ID);
+
+-- ASSET: Unassigned Assets pages by (Value_Estimate DESC, Asset_Code).
+CREATE INDEX idx_asset_value_code ON ASSET (Value_Estimate DESC, Asset_Code);
+
+-- MISSION_ASSIGNMENT: reverse lookup person -> missions (Top Personnel, Success Rate by Base).
+CREATE INDEX idx_assignment_personnel_mission ON MISSION_ASSIGNMENT (Personnel_ID, Mission_ID);
+
+-- MISSION_ASSETS: reverse lookup asset -> missions for the NOT IN anti-join.
+CREATE INDEX idx_mission_assets_asset_mission ON MISSION_ASSETS (Asset_Code, Mission_ID);
+
+-- POKEMON_TYPE: Stats by Type groups on Type.
+CREATE INDEX idx_pokemon_type_type ON POKEMON_TYPE (Type, Pokemon_ID);
+
+-- ====== GROUP 7: Summary Tables for the Aggregate Reports ======
+-- Maintained by the triggers below as rows change, so READ 5 and READ 7 read
+-- one row per type / base instead of aggregating POKEMON and MISSION_ASSIGNMENT.
+-- Existing databases apply migrations/002_summary_tables.sql instead.
+
+-- BASE_MISSION_LINK: how many people from a base are assigned to a mission.
+-- A base counts a mission once however many of its people are on it, so the
+-- stats change only when a link appears or disappears.
+CREATE TABLE BASE_MISSION_LINK (
+    Base_ID INT NOT NULL,
+    Mission_ID INT NOT NULL,
+    Assignees INT NOT NULL,
+    PRIMARY KEY (Base_ID, Mission_ID),
+    KEY idx_base_mission_link_mission (Mission_ID, Base_ID)
+);
+
+-- BASE_MISSION_STATS: READ 7 (Mission Success Rate by Base) reads this.
+CREATE TABLE BASE_MISSION_STATS (
+    Base_ID INT PRIMARY KEY,
+    Total_Missions INT NOT NULL DEFAULT 0,
+    Completed_Missions INT NOT NULL DEFAULT 0
+);
+
+-- POKEMON_TYPE_STATS: READ 5 (Pokemon Stats by Type) reads this; averages are Sum / Pokemon_Count.
+CREATE TABLE POKEMON_TYPE_STATS (
+    Type VARCHAR(50) PRIMARY KEY,
+    Pokemon_Count INT NOT NULL DEFAULT 0,
+    HP_Sum BIGINT NOT NULL DEFAULT 0,
+    Attack_Sum BIGINT NOT NULL DEFAULT 0,
+    Defense_Sum BIGINT NOT NULL DEFAULT 0
+);
+
+-- Foreign key actions (e.g. deleting a person cascading to MISSION_ASSIGNMENT)
+-- do not fire triggers, so the deltas are applied at the parent row as well.
+-- Every trigger is a no-op while @skip_summary_triggers is set (bulk loads set
+-- it and rebuild afterwards with: python3 main_app.py summary-rebuild).
+
+DELIMITER //
+
+-- One person at p_base was assigned to p_mission.
+CREATE PROCEDURE summary_assignment_added(IN p_base INT, IN p_mission INT)
+BEGIN
+    DECLARE v_completed INT DEFAULT 0;
+    IF p_base IS NOT NULL THEN
+        INSERT INTO BASE_MISSION_LINK (Base_ID, Mission_ID, Assignees) VALUES (p_base, p_mission, 1)
+            ON DUPLICATE KEY UPDATE Assignees = Assignees + 1;
+        -- ROW_COUNT() is 1 for a new link, 2 when an existing one was incremented.
+        IF ROW_COUNT() = 1 THEN
+            SELECT COALESCE(MAX(`Status` = 'Completed'), 0) INTO v_completed FROM MISSION WHERE Mission_ID = p_mission;
+            INSERT INTO BASE_MISSION_STATS (Base_ID, Total_Missions, Completed_Missions) VALUES (p_base, 1, v_completed)
+                ON DUPLICATE KEY UPDATE Total_Missions = Total_Missions + 1,
+                                        Completed_Missions = Completed_Missions + v_completed;
+        END IF;
+    END IF;
+END //
+
+-- One person at p_base was taken off p_mission.
+CREATE PROCEDURE summary_assignment_removed(IN p_base INT, IN p_mission INT)
+BEGIN
+    DECLARE v_completed INT DEFAULT 0;
+    IF p_base IS NOT NULL THEN
+        UPDATE BASE_MISSION_LINK SET Assignees = Assignees - 1 WHERE Base_ID = p_base AND Mission_ID = p_mission;
+        IF ROW_COUNT() > 0 AND NOT EXISTS (SELECT 1 FROM BASE_MISSION_LINK
+                                           WHERE Base_ID = p_base AND Mission_ID = p_mission AND Assignees > 0) THEN
+            DELETE FROM BASE_MISSION_LINK WHERE Base_ID = p_base AND Mission_ID = p_mission;
+            SELECT COALESCE(MAX(`Status` = 'Completed'), 0) INTO v_completed FROM MISSION WHERE Mission_ID = p_mission;
+            UPDATE BASE_MISSION_STATS
+               SET Total_Missions = Total_Missions - 1, Completed_Missions = Completed_Missions - v_completed
+             WHERE Base_ID = p_base;
+        END IF;
+    END IF;
+END //
+
+-- Every assignment of p_personnel now counts for p_base (joined the base).
+CREATE PROCEDURE summary_personnel_added(IN p_personnel INT, IN p_base INT)
+BEGIN
+    DECLARE v_missions INT DEFAULT 0;
+    DECLARE v_completed INT DEFAULT 0;
+    IF p_base IS NOT NULL THEN
+        SELECT COUNT(*), COALESCE(SUM(m.`Status` = 'Completed'), 0) INTO v_missions, v_completed
+          FROM MISSION_ASSIGNMENT ma
+          JOIN MISSION m ON m.Mission_ID = ma.Mission_ID
+          LEFT JOIN BASE_MISSION_LINK l ON l.Base_ID = p_base AND l.Mission_ID = ma.Mission_ID
+         WHERE ma.Personnel_ID = p_personnel AND l.Base_ID IS NULL;
+        INSERT INTO BASE_MISSION_LINK (Base_ID, Mission_ID, Assignees)
+            SELECT p_base, ma.Mission_ID, 1 FROM MISSION_ASSIGNMENT ma WHERE ma.Personnel_ID = p_personnel
+            ON DUPLICATE KEY UPDATE Assignees = Assignees + 1;
+        IF v_missions > 0 THEN
+            INSERT INTO BASE_MISSION_STATS (Base_ID, Total_Missions, Completed_Missions) VALUES (p_base, v_missions, v_completed)
+                ON DUPLICATE KEY UPDATE Total_Missions = Total_Missions + v_missions,
+                                        Completed_Missions = Completed_Missions + v_completed;
+        END IF;
+    END IF;
+END //
+
+-- Every assignment of p_personnel stops counting for p_base (left the base or was deleted).
+CREATE PROCEDURE summary_personnel_removed(IN p_personnel INT, IN p_base INT)
+BEGIN
+    DECLARE v_missions INT DEFAULT 0;
+    DECLARE v_completed INT DEFAULT 0;
+    IF p_base IS NOT NULL THEN
+        UPDATE BASE_MISSION_LINK l
+          JOIN MISSION_ASSIGNMENT ma ON ma.Mission_ID = l.Mission_ID
+           SET l.Assignees = l.Assignees - 1
+         WHERE ma.Personnel_ID = p_personnel AND l.Base_ID = p_base;
+        SELECT COUNT(*), COALESCE(SUM(m.`Status` = 'Completed'), 0) INTO v_missions, v_completed
+          FROM MISSION_ASSIGNMENT ma
+          JOIN BASE_MISSION_LINK l ON l.Base_ID = p_base AND l.Mission_ID = ma.Mission_ID
+          JOIN MISSION m ON m.Mission_ID = ma.Mission_ID
+         WHERE ma.Personnel_ID = p_personnel AND l.Assignees <= 0;
+        DELETE l FROM BASE_MISSION_LINK l
+          JOIN MISSION_ASSIGNMENT ma ON ma.Mission_ID = l.Mission_ID
+         WHERE ma.Personnel_ID = p_personnel AND l.Base_ID = p_base AND l.Assignees <= 0;
+        UPDATE BASE_MISSION_STATS
+           SET Total_Missions = Total_Missions - v_missions, Completed_Missions = Completed_Missions - v_completed
+         WHERE Base_ID = p_base;
+    END IF;
+END //
+
+-- Adds (p_sign = 1) or removes (p_sign = -1) one Pokemon's stats under p_type.
+CREATE PROCEDURE summary_pokemon_type(IN p_type VARCHAR(50), IN p_pokemon INT, IN p_sign INT)
+BEGIN
+    DECLARE v_hp INT;
+    DECLARE v_attack INT;
+    DECLARE v_defense INT;
+    SELECT HP, Attack, Defense INTO v_hp, v_attack, v_defense FROM POKEMON WHERE Pokemon_ID = p_pokemon;
+    IF v_hp IS NOT NULL THEN
+        INSERT INTO POKEMON_TYPE_STATS (Type, Pokemon_Count, HP_Sum, Attack_Sum, Defense_Sum)
+            VALUES (p_type, p_sign, p_sign * v_hp, p_sign * v_attack, p_sign * v_defense)
+            ON DUPLICATE KEY UPDATE Pokemon_Count = Pokemon_Count + p_sign,
+                                    HP_Sum = HP_Sum + p_sign * v_hp,
+                                    Attack_Sum = Attack_Sum + p_sign * v_attack,
+                                    Defense_Sum = Defense_Sum + p_sign * v_defense;
+    END IF;
+END //
+
+CREATE TRIGGER trg_mission_assignment_after_insert AFTER INSERT ON MISSION_ASSIGNMENT
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        CALL summary_assignment_added((SELECT Base_ID FROM PERSONNEL WHERE Personnel_ID = NEW.Personnel_ID), NEW.Mission_ID);
+    END IF;
+END //
+
+CREATE TRIGGER trg_mission_assignment_after_update AFTER UPDATE ON MISSION_ASSIGNMENT
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL AND (OLD.Mission_ID <> NEW.Mission_ID OR OLD.Personnel_ID <> NEW.Personnel_ID) THEN
+        CALL summary_assignment_removed((SELECT Base_ID FROM PERSONNEL WHERE Personnel_ID = OLD.Personnel_ID), OLD.Mission_ID);
+        CALL summary_assignment_added((SELECT Base_ID FROM PERSONNEL WHERE Personnel_ID = NEW.Personnel_ID), NEW.Mission_ID);
+    END IF;
+END //
+
+CREATE TRIGGER trg_mission_assignment_after_delete AFTER DELETE ON MISSION_ASSIGNMENT
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        CALL summary_assignment_removed((SELECT Base_ID FROM PERSONNEL WHERE Personnel_ID = OLD.Personnel_ID), OLD.Mission_ID);
+    END IF;
+END //
+
+-- Moving a person between bases moves all of their assignments.
+CREATE TRIGGER trg_personnel_after_update AFTER UPDATE ON PERSONNEL
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL AND NOT (OLD.Base_ID <=> NEW.Base_ID) THEN
+        CALL summary_personnel_removed(NEW.Personnel_ID, OLD.Base_ID);
+        CALL summary_personnel_added(NEW.Personnel_ID, NEW.Base_ID);
+    END IF;
+END //
+
+-- Runs before ON DELETE CASCADE removes the person's MISSION_ASSIGNMENT rows.
+CREATE TRIGGER trg_personnel_before_delete BEFORE DELETE ON PERSONNEL
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        CALL summary_personnel_removed(OLD.Personnel_ID, OLD.Base_ID);
+    END IF;
+END //
+
+CREATE TRIGGER trg_mission_after_update AFTER UPDATE ON MISSION
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        IF OLD.Mission_ID <> NEW.Mission_ID THEN
+            UPDATE BASE_MISSION_LINK SET Mission_ID = NEW.Mission_ID WHERE Mission_ID = OLD.Mission_ID;
+        END IF;
+        IF (OLD.`Status` = 'Completed') <> (NEW.`Status` = 'Completed') THEN
+            UPDATE BASE_MISSION_STATS s
+              JOIN BASE_MISSION_LINK l ON l.Base_ID = s.Base_ID
+               SET s.Completed_Missions = s.Completed_Missions + IF(NEW.`Status` = 'Completed', 1, -1)
+             WHERE l.Mission_ID = NEW.Mission_ID;
+        END IF;
+    END IF;
+END //
+
+CREATE TRIGGER trg_mission_before_delete BEFORE DELETE ON MISSION
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        UPDATE BASE_MISSION_STATS s
+          JOIN BASE_MISSION_LINK l ON l.Base_ID = s.Base_ID
+           SET s.Total_Missions = s.Total_Missions - 1,
+               s.Completed_Missions = s.Completed_Missions - (OLD.`Status` = 'Completed')
+         WHERE l.Mission_ID = OLD.Mission_ID;
+        DELETE FROM BASE_MISSION_LINK WHERE Mission_ID = OLD.Mission_ID;
+    END IF;
+END //
+
+CREATE TRIGGER trg_base_after_update AFTER UPDATE ON BASE
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL AND OLD.Base_ID <> NEW.Base_ID THEN
+        UPDATE BASE_MISSION_LINK SET Base_ID = NEW.Base_ID WHERE Base_ID = OLD.Base_ID;
+        UPDATE BASE_MISSION_STATS SET Base_ID = NEW.Base_ID WHERE Base_ID = OLD.Base_ID;
+    END IF;
+END //
+
+-- ON DELETE SET NULL unassigns the base's personnel, so its missions stop counting.
+CREATE TRIGGER trg_base_after_delete AFTER DELETE ON BASE
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        DELETE FROM BASE_MISSION_LINK WHERE Base_ID = OLD.Base_ID;
+        DELETE FROM BASE_MISSION_STATS WHERE Base_ID = OLD.Base_ID;
+    END IF;
+END //
+
+CREATE TRIGGER trg_pokemon_type_after_insert AFTER INSERT ON POKEMON_TYPE
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        CALL summary_pokemon_type(NEW.Type, NEW.Pokemon_ID, 1);
+    END IF;
+END //
+
+CREATE TRIGGER trg_pokemon_type_after_update AFTER UPDATE ON POKEMON_TYPE
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL AND (OLD.Type <> NEW.Type OR OLD.Pokemon_ID <> NEW.Pokemon_ID) THEN
+        CALL summary_pokemon_type(OLD.Type, OLD.Pokemon_ID, -1);
+        CALL summary_pokemon_type(NEW.Type, NEW.Pokemon_ID, 1);
+    END IF;
+END //
+
+CREATE TRIGGER trg_pokemon_type_after_delete AFTER DELETE ON POKEMON_TYPE
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        CALL summary_pokemon_type(OLD.Type, OLD.Pokemon_ID, -1);
+    END IF;
+END //
+
+CREATE TRIGGER trg_pokemon_after_update AFTER UPDATE ON POKEMON
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL
+       AND (OLD.HP <> NEW.HP OR OLD.Attack <> NEW.Attack OR OLD.Defense <> NEW.Defense) THEN
+        UPDATE POKEMON_TYPE_STATS ts
+          JOIN POKEMON_TYPE pt ON pt.Type = ts.Type
+           SET ts.HP_Sum = ts.HP_Sum + NEW.HP - OLD.HP,
+               ts.Attack_Sum = ts.Attack_Sum + NEW.Attack - OLD.Attack,
+               ts.Defense_Sum = ts.Defense_Sum + NEW.Defense - OLD.Defense
+         WHERE pt.Pokemon_ID = NEW.Pokemon_ID;
+    END IF;
+END //
+
+-- Runs before ON DELETE CASCADE removes the Pokemon's POKEMON_TYPE rows.
+CREATE TRIGGER trg_pokemon_before_delete BEFORE DELETE ON POKEMON
+FOR EACH ROW
+BEGIN
+    IF @skip_summary_triggers IS NULL THEN
+        UPDATE POKEMON_TYPE_STATS ts
+          JOIN POKEMON_TYPE pt ON pt.Type = ts.Type
+           SET ts.Pokemon_Count = ts.Pokemon_Count - 1,
+               ts.HP_Sum = ts.HP_Sum - OLD.HP,
+               ts.Attack_Sum = ts.Attack_Sum - OLD.Attack,
+               ts.Defense_Sum = ts.Defense_Sum - OLD.Defense
+         WHERE pt.Pokemon_ID = OLD.Pokemon_ID;
+    END IF;
+END //
+
+DELIMITER ;
+
+-- ====== GROUP 8: Archive Tables for Retired Personnel ======
+-- personnel_archive.py moves a person's history here in small batches before
+-- deleting them (python3 main_app.py retire). Same columns as the live tables
+-- plus Archived_At; no foreign keys, so the history outlives the rows it named.
+-- Existing databases apply migrations/003_personnel_archive.sql instead.
+
+CREATE TABLE PERSONNEL_ARCHIVE (
+    Personnel_ID INT PRIMARY KEY,
+    FName VARCHAR(50) NOT NULL,
+    LName VARCHAR(50) NOT NULL,
+    `Rank` ENUM('Boss', 'Grunt', 'Scientist') NOT NULL,
+    StartDate DATE,
+    Base_ID INT,
+    RetiredDate DATE NOT NULL,
+    Region_Managed VARCHAR(100), -- Bosses
+    Squad_ID INT, -- Grunts
+    Specialization VARCHAR(100), -- Scientists
+    Project_ID INT, -- Scientists
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE MISSION_ASSIGNMENT_ARCHIVE (
+    Mission_ID INT,
+    Personnel_ID INT,
+    Role VARCHAR(100),
+    AssignedDate DATE,
+    `Status` ENUM('Assigned', 'Engaged', 'Battle Lost', 'Travelling'),
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Personnel_ID, Mission_ID)
+);
+
+CREATE TABLE ASSIGNED_TO_ARCHIVE (
+    Personnel_ID INT,
+    Mission_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Personnel_ID, Mission_ID)
+);
+
+CREATE TABLE OWNERSHIP_ARCHIVE (
+    Personnel_ID INT,
+    Pokemon_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Personnel_ID, Pokemon_ID)
+);
+
+CREATE TABLE FIELD_ENGAGEMENT_ARCHIVE (
+    Grunt_Personnel_ID INT,
+    Trainer_ID INT,
+    Mission_ID INT,
+    Pokemon_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Grunt_Personnel_ID, Trainer_ID, Mission_ID)
+);
+
+CREATE TABLE EXPERIMENTATION_EVENT_ARCHIVE (
+    Scientist_Personnel_ID INT,
+    Serum_ID INT,
+    Pokemon_ID INT,
+    Project_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Scientist_Personnel_ID, Serum_ID, Pokemon_ID, Project_ID)
+);
+
+-- ====== GROUP 9: Log ID Sequences for Experiment Ingest ======
+-- EXPERIMENTAL_LOG has no AUTO_INCREMENT (Log_ID counts per project), so
+-- experiment_ingest.py reserves Log_IDs here in blocks: one row per project
+-- holding the next unreserved Log_ID. Existing databases apply
+-- migrations/004_experimental_log_sequence.sql instead.
+
+CREATE TABLE EXPERIMENTAL_LOG_SEQUENCE (
+    Project_ID INT PRIMARY KEY,
+    Next_Log_ID INT NOT NULL,
+    FOREIGN KEY (Project_ID) REFERENCES RESEARCH_PROJECT(Project_ID)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+-- ====== GROUP 10: History Tables for Closed Missions ======
+-- mission_archive.py moves Completed, Failed and Aborted missions here, with
+-- their junction rows, once they are older than a cutoff (python3 main_app.py
+-- archive-missions), so the live MISSION tables hold roughly the open work.
+-- No foreign keys, as in GROUP 8. READ 3, READ 6 and READ 7 read both sides.
+-- Existing databases apply migrations/005_mission_history.sql instead.
+
+CREATE TABLE MISSION_HISTORY (
+    Mission_ID INT PRIMARY KEY,
+    Objective TEXT NOT NULL,
+    `Status` ENUM('Completed', 'Failed', 'Aborted') NOT NULL,
+    StartDate DATE,
+    EndDate DATE,
+    Target_Trainer_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_mission_history_trainer (Target_Trainer_ID)
+);
+
+-- Base_ID is the assignee's base when the mission was archived; READ 7 credits
+-- archived missions to that base from then on.
+CREATE TABLE MISSION_ASSIGNMENT_HISTORY (
+    Mission_ID INT,
+    Personnel_ID INT,
+    Role VARCHAR(100),
+    AssignedDate DATE,
+    `Status` ENUM('Assigned', 'Engaged', 'Battle Lost', 'Travelling'),
+    Base_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Mission_ID, Personnel_ID),
+    KEY idx_mission_assignment_history_personnel (Personnel_ID, Mission_ID)
+);
+
+CREATE TABLE MISSION_ASSETS_HISTORY (
+    Mission_ID INT,
+    Asset_Code VARCHAR(50),
+    Acquisition_Status ENUM('Pending', 'Acquired', 'Lost', 'Returned'),
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Mission_ID, Asset_Code)
+);
+
+CREATE TABLE ASSIGNED_TO_HISTORY (
+    Personnel_ID INT,
+    Mission_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Personnel_ID, Mission_ID)
+);
+
+CREATE TABLE FIELD_ENGAGEMENT_HISTORY (
+    Grunt_Personnel_ID INT,
+    Trainer_ID INT,
+    Mission_ID INT,
+    Pokemon_ID INT,
+    Archived_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Grunt_Personnel_ID, Trainer_ID, Mission_ID)
+);
+
+-- BASE_MISSION_HISTORY_STATS: the archived half of BASE_MISSION_STATS. Written
+-- only by the archive job (history never changes), and READ 7 adds the two.
+CREATE TABLE BASE_MISSION_HISTORY_STATS (
+    Base_ID INT PRIMARY KEY,
+    Total_Missions INT NOT NULL DEFAULT 0,
+    Completed_Missions INT NOT NULL DEFAULT 0
+);
+
+-- ====== GROUP 11: Full-Text Search ======
+-- search.py (python3 main_app.py search) ranks mission and experiment log
+-- objectives with these instead of LIKE '%...%' scans. Existing databases
+-- apply migrations/006_fulltext_search.sql instead.
+
+CREATE FULLTEXT INDEX ft_mission_objective ON MISSION (Objective);
+CREATE FULLTEXT INDEX ft_mission_history_objective ON MISSION_HISTORY (Objective);
+CREATE FULLTEXT INDEX ft_experimental_log_objective ON EXPERIMENTAL_LOG (Objective);
+
 -- --- End of schema.sql ---
\ No newline at end of file
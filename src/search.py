@@ -0,0 +1,308 @@
+"""
+Full-Text Search (search.py)
+Ranked keyword search over MISSION.Objective (live and archived missions) and
+EXPERIMENTAL_LOG.Objective. On MySQL it uses the FULLTEXT indexes from
+schema.sql GROUP 11 (migrations/006_fulltext_search.sql) in natural language
+mode, instead of a LIKE '%...%' scan over every objective. Backends without
+them (SQLite, or MySQL before the migration) fall back to an in-process
+inverted index built from one pass over the column and kept until the tables
+change.
+
+    python3 main_app.py search "Mt. Moon legendary"
+    python3 main_app.py search "cloning vat" --in logs --page-size 20
+    python3 main_app.py search "Team Rocket" --page-size 20 --page-token <token>
+
+Mission hits carry the status and the assigned personnel, log hits the
+project. Both are ordered by relevance, then key. Words shorter than three
+characters and InnoDB's default stopwords are ignored, as MySQL ignores them.
+"""
+
+import re
+import math
+import time
+import bisect
+import threading
+
+from cache import result_cache
+from operations import STREAM_BATCH_SIZE, DEFAULT_PAGE_SIZE, stream_rows, encode_page_token, decode_page_token
+
+MIN_TOKEN_LENGTH = 3          # innodb_ft_min_token_size
+INDEX_MAX_AGE = 60.0          # seconds; bounds staleness from writers in other processes
+
+# INNODB_FT_DEFAULT_STOPWORD
+STOPWORDS = frozenset((
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en', 'for', 'from', 'how', 'i', 'in',
+    'is', 'it', 'la', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'what', 'when', 'where', 'who',
+    'will', 'with', 'und', 'www',
+))
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Target -> (tables with a FULLTEXT index on Objective, key columns of a hit).
+TARGETS = {
+    'missions': (('MISSION', 'MISSION_HISTORY'), ('Mission_ID',)),
+    'logs': (('EXPERIMENTAL_LOG',), ('Project_ID', 'Log_ID')),
+}
+
+_MATCH = "MATCH (Objective) AGAINST (%s IN NATURAL LANGUAGE MODE)"
+
+# Ranked keys of the matching rows; {seek} and {limit} make it a keyset page.
+FULLTEXT_KEYS_SQL = {
+    'missions': f"""
+        SELECT Mission_ID, Score FROM (
+            SELECT Mission_ID, {_MATCH} AS Score FROM MISSION WHERE {_MATCH}
+            UNION ALL
+            SELECT Mission_ID, {_MATCH} AS Score FROM MISSION_HISTORY WHERE {_MATCH}
+        ) hits
+        WHERE {{seek}}
+        ORDER BY Score DESC, Mission_ID
+        {{limit}}
+    """,
+    'logs': f"""
+        SELECT Project_ID, Log_ID, Score FROM (
+            SELECT Project_ID, Log_ID, {_MATCH} AS Score FROM EXPERIMENTAL_LOG WHERE {_MATCH}
+        ) hits
+        WHERE {{seek}}
+        ORDER BY Score DESC, Project_ID, Log_ID
+        {{limit}}
+    """,
+}
+_SEEK = {
+    'missions': "(Score < %s OR (Score = %s AND Mission_ID > %s))",
+    'logs': "(Score < %s OR (Score = %s AND (Project_ID > %s OR (Project_ID = %s AND Log_ID > %s))))",
+}
+
+# Every objective, for building the inverted index.
+DOCUMENTS_SQL = {
+    'missions': """
+        SELECT Mission_ID, Objective FROM MISSION
+        UNION ALL
+        SELECT Mission_ID, Objective FROM MISSION_HISTORY
+    """,
+    'logs': "SELECT Project_ID, Log_ID, Objective FROM EXPERIMENTAL_LOG",
+}
+
+FULLTEXT_TABLES_SQL = """
+    SELECT DISTINCT TABLE_NAME FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND INDEX_TYPE = 'FULLTEXT' AND COLUMN_NAME = 'Objective'
+"""
+
+MISSION_DETAILS_SQL = """
+    SELECT Mission_ID, `Status`, 0 AS Archived, StartDate, EndDate, Objective FROM MISSION
+    WHERE Mission_ID IN ({ids})
+    UNION ALL
+    SELECT Mission_ID, `Status`, 1 AS Archived, StartDate, EndDate, Objective FROM MISSION_HISTORY
+    WHERE Mission_ID IN ({ids})
+"""
+MISSION_PERSONNEL_SQL = """
+    SELECT a.Mission_ID, p.FName, p.LName, a.Role
+    FROM (
+        SELECT Mission_ID, Personnel_ID, Role FROM MISSION_ASSIGNMENT WHERE Mission_ID IN ({ids})
+        UNION ALL
+        SELECT Mission_ID, Personnel_ID, Role FROM MISSION_ASSIGNMENT_HISTORY WHERE Mission_ID IN ({ids})
+    ) a
+    JOIN PERSONNEL p ON p.Personnel_ID = a.Personnel_ID
+    ORDER BY a.Mission_ID, p.LName, p.Personnel_ID
+"""
+LOG_DETAILS_SQL = """
+    SELECT l.Project_ID, l.Log_ID, rp.Title AS Project_Title, l.`Status`, l.StartDate, l.Objective
+    FROM EXPERIMENTAL_LOG l
+    JOIN RESEARCH_PROJECT rp ON rp.Project_ID = l.Project_ID
+    WHERE {keys}
+"""
+
+
+def tokenize(text):
+    """The indexable words of `text`: lowercased, at least MIN_TOKEN_LENGTH long, no stopwords."""
+    return [word for word in _TOKEN_RE.findall((text or '').lower())
+            if len(word) >= MIN_TOKEN_LENGTH and word not in STOPWORDS]
+
+
+def _check(target, query):
+    if target not in TARGETS:
+        raise ValueError(f"Unknown search target '{target}'; expected one of {', '.join(TARGETS)}.")
+    if not tokenize(query):
+        raise ValueError(f"Nothing to search for in '{query}': every word is a stopword "
+                         f"or shorter than {MIN_TOKEN_LENGTH} characters.")
+
+
+# --- Inverted Index Fallback ---
+
+class InvertedIndex:
+    """
+    Term -> {key: term frequency} over one target's objectives. Ranks the way
+    InnoDB FULLTEXT does, summing tf * idf^2 over the query's terms, with the
+    idf smoothed so a word found in every row still counts.
+    """
+
+    def __init__(self, documents):
+        self.postings = {}
+        self.documents = 0
+        for key, text in documents:
+            self.documents += 1
+            for term in tokenize(text):
+                postings = self.postings.setdefault(term, {})
+                postings[key] = postings.get(key, 0) + 1
+        self.built_at = time.monotonic()
+
+    def search(self, query):
+        """Every matching key as (score, key), best first, then by key."""
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            weight = math.log10((self.documents + 1) / len(postings)) ** 2
+            for key, frequency in postings.items():
+                scores[key] = scores.get(key, 0.0) + frequency * weight
+        return sorted(((score, key) for key, score in scores.items()), key=lambda hit: (-hit[0], hit[1]))
+
+
+_indexes = {}               # (dsn, target) -> (InvertedIndex, cache generation of its tables)
+_indexes_lock = threading.Lock()
+_fulltext_tables = {}       # dsn -> tables with a FULLTEXT index on Objective
+
+
+def _documents(pool, target):
+    keys = TARGETS[target][1]
+    return ((tuple(row[k] for k in keys), row['Objective']) for row in stream_rows(pool, DOCUMENTS_SQL[target]))
+
+
+def _inverted_index(pool, target):
+    """
+    The target's index, rebuilt when a write in this process invalidated one
+    of its tables (see cache.py) or after INDEX_MAX_AGE seconds.
+    """
+    tables = TARGETS[target][0]
+    with _indexes_lock:
+        generation = result_cache.generation(tables)
+        index, built_for = _indexes.get((pool.dsn, target), (None, None))
+        if index is None or built_for != generation or time.monotonic() - index.built_at > INDEX_MAX_AGE:
+            index = InvertedIndex(_documents(pool, target))
+            _indexes[(pool.dsn, target)] = (index, generation)
+        return index
+
+
+def engine(pool, target):
+    """'fulltext' if every table of `target` has its FULLTEXT index, else 'inverted-index'."""
+    if pool.dialect != 'mysql':
+        return 'inverted-index'
+    if pool.dsn not in _fulltext_tables:
+        with pool.connection() as connection, connection.cursor() as cursor:
+            cursor.execute(FULLTEXT_TABLES_SQL)
+            _fulltext_tables[pool.dsn] = {row['TABLE_NAME'].upper() for row in cursor.fetchall()}
+    return 'fulltext' if set(TARGETS[target][0]) <= _fulltext_tables[pool.dsn] else 'inverted-index'
+
+
+# --- Ranked Keys ---
+
+def _fulltext_keys(pool, target, query, after=None, limit=None):
+    """(score, key) from the FULLTEXT indexes, best first, strictly after the `after` (score, key)."""
+    keys = TARGETS[target][1]
+    matches = (query,) * (2 * len(TARGETS[target][0]))
+    if after is None:
+        seek, seek_params = "TRUE", ()
+    else:
+        score, key = after
+        seek = _SEEK[target]
+        seek_params = (score, score, *key) if len(key) == 1 else (score, score, key[0], key[0], key[1])
+    sql = FULLTEXT_KEYS_SQL[target].format(seek=seek, limit="LIMIT %s" if limit is not None else "")
+    params = (*matches, *seek_params, *((limit,) if limit is not None else ()))
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(float(row['Score']), tuple(row[k] for k in keys)) for row in cursor.fetchall()]
+
+
+def _index_keys(pool, target, query, after=None, limit=None):
+    """(score, key) from the inverted index, with the same ordering and seek as _fulltext_keys."""
+    hits = _inverted_index(pool, target).search(query)
+    start = 0
+    if after is not None:
+        score, key = after
+        start = bisect.bisect_right([(-s, k) for s, k in hits], (-score, key))
+    return hits[start:] if limit is None else hits[start:start + limit]
+
+
+def _ranked_keys(pool, target, query, after=None, limit=None):
+    if engine(pool, target) == 'fulltext':
+        return _fulltext_keys(pool, target, query, after, limit)
+    return _index_keys(pool, target, query, after, limit)
+
+
+# --- Hit Details ---
+
+def _mission_hits(cursor, ranked):
+    ids = [key[0] for _, key in ranked]
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(MISSION_DETAILS_SQL.format(ids=placeholders), (*ids, *ids))
+    missions = {row['Mission_ID']: row for row in cursor.fetchall()}
+    cursor.execute(MISSION_PERSONNEL_SQL.format(ids=placeholders), (*ids, *ids))
+    personnel = {}
+    for row in cursor.fetchall():
+        personnel.setdefault(row['Mission_ID'], []).append(f"{row['FName']} {row['LName']} ({row['Role']})")
+
+    for score, (mission_id,) in ranked:
+        mission = missions.get(mission_id)
+        if mission is None:
+            continue  # deleted since it was ranked
+        yield {'Mission_ID': mission_id, 'Score': round(score, 6), 'Status': mission['Status'],
+               'Archived': bool(mission['Archived']), 'StartDate': mission['StartDate'],
+               'EndDate': mission['EndDate'], 'Objective': mission['Objective'],
+               'Personnel': '; '.join(personnel.get(mission_id, ()))}
+
+
+def _log_hits(cursor, ranked):
+    condition = ' OR '.join(["(l.Project_ID = %s AND l.Log_ID = %s)"] * len(ranked))
+    cursor.execute(LOG_DETAILS_SQL.format(keys=condition), [value for _, key in ranked for value in key])
+    logs = {(row['Project_ID'], row['Log_ID']): row for row in cursor.fetchall()}
+    for score, key in ranked:
+        log = logs.get(key)
+        if log is None:
+            continue
+        yield {'Project_ID': key[0], 'Log_ID': key[1], 'Score': round(score, 6), 'Status': log['Status'],
+               'Project_Title': log['Project_Title'], 'StartDate': log['StartDate'], 'Objective': log['Objective']}
+
+
+_HITS = {'missions': _mission_hits, 'logs': _log_hits}
+
+
+def _hits(pool, target, ranked):
+    if not ranked:
+        return []
+    with pool.connection() as connection, connection.cursor() as cursor:
+        return list(_HITS[target](cursor, ranked))
+
+
+# --- Search ---
+
+def search_page(pool, query, target='missions', page_size=DEFAULT_PAGE_SIZE, token=None):
+    """
+    One page of ranked hits for `query`. Returns (rows, next_token), where
+    next_token is None once the last page has been reached.
+    """
+    _check(target, query)
+    page_size = int(page_size)
+    if page_size < 1:
+        raise ValueError("Page size must be at least 1.")
+    after = None
+    if token is not None:
+        score, *key = decode_page_token(token)
+        after = (float(score), tuple(key))
+
+    ranked = _ranked_keys(pool, target, query, after, page_size + 1)
+    next_token = None
+    if len(ranked) > page_size:
+        ranked = ranked[:page_size]
+        score, key = ranked[-1]
+        next_token = encode_page_token([score, *key])
+    return _hits(pool, target, ranked), next_token
+
+
+def iter_search(pool, query, target='missions', batch_size=STREAM_BATCH_SIZE):
+    """
+    Every ranked hit for `query`, streamed: the matching keys are ranked in
+    one pass, then the hit rows are fetched and yielded `batch_size` at a time.
+    """
+    _check(target, query)
+    ranked = _ranked_keys(pool, target, query)
+    for start in range(0, len(ranked), batch_size):
+        yield from _hits(pool, target, ranked[start:start + batch_size])
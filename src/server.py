@@ -0,0 +1,331 @@
+"""
+Warm Daemon (server.py)
+Long-running server mode for automation that makes many short calls. One
+process keeps the imports, the parsed command table, the result cache and a
+pool of already-open connections warm, and serves the headless commands over
+HTTP with JSON, on a Unix domain socket (default) or a loopback TCP port. A
+call then costs one local round trip instead of a Python start, the driver
+imports and a database handshake. client.py is the matching thin client.
+
+    python3 main_app.py serve --socket /tmp/chimera.sock --workers 8
+    python3 client.py --socket /tmp/chimera.sock top-personnel --limit 3
+    python3 client.py --socket /tmp/chimera.sock health
+
+Endpoints:
+    POST /run      {"argv": ["set-mission-status", "--mission-id", "7", "--status", "Completed"]}
+                   -> JSON lines: one per result row, then a trailer
+                      {"_end": true, "ok": ..., "error": ..., "stderr": ...}
+    GET  /health   pool check; 503 when the database is unreachable
+    GET  /stats    server counters, result cache and query metrics as JSON
+    GET  /metrics  the same metrics in Prometheus text format
+
+At most --workers commands run at once; further requests wait up to
+--queue-timeout seconds for a slot and are then refused with 503. There is
+no authentication: the socket is created mode 0600 and TCP is loopback-only.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import socket
+import signal
+import threading
+import ipaddress
+import socketserver
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pymysql
+
+import metrics
+from cache import result_cache
+
+DEFAULT_SOCKET = '/tmp/chimera.sock'
+DEFAULT_WORKERS = 4
+DEFAULT_QUEUE_TIMEOUT = 30.0    # seconds a request waits for a free worker
+HEALTH_TIMEOUT = 2.0            # seconds /health waits for a connection
+MAX_REQUEST_BYTES = 1 << 20
+FLUSH_EVERY_ROWS = 500
+
+
+# --- Per-request stderr ---
+
+class _StderrRouter:
+    """
+    Stand-in for sys.stderr while serving: what a request thread prints (page
+    tokens, progress, warnings) is collected and sent back to its client;
+    everything else still reaches the real stream.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    @contextmanager
+    def capture(self):
+        buffer = self._local.buffer = io.StringIO()
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = None
+
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer or self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+# --- Service ---
+
+class Service:
+    """
+    Runs commands for the request handlers. `dispatch(argv)` parses one
+    command line and returns (command name, callable producing rows); `encode_row`
+    makes a row JSON-ready. Exceptions in `errors` are reported to the client
+    as failed commands; anything else is logged here as a server fault.
+    """
+
+    def __init__(self, pool, dispatch, encode_row, errors, workers=DEFAULT_WORKERS,
+                 queue_timeout=DEFAULT_QUEUE_TIMEOUT):
+        if workers < 1:
+            raise ValueError("Workers must be at least 1.")
+        self.pool = pool
+        self.dispatch = dispatch
+        self.encode_row = encode_row
+        self.errors = errors
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.stderr = _StderrRouter(sys.stderr)
+        self._slots = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.requests = 0
+        self.failed = 0
+        self.rejected = 0
+        self.in_flight = 0
+
+    def _count(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def warm_up(self):
+        """Opens every pooled connection up front so the first requests skip the handshake."""
+        connections = []
+        try:
+            for _ in range(self.pool.max_size):
+                connections.append(self.pool.acquire())
+        finally:
+            for connection in connections:
+                self.pool.release(connection)
+        return len(connections)
+
+    def counters(self):
+        with self._lock:
+            return {'uptime_s': round(time.monotonic() - self.started, 1), 'workers': self.workers,
+                    'in_flight': self.in_flight, 'requests': self.requests, 'failed': self.failed,
+                    'rejected': self.rejected}
+
+    def health(self):
+        try:
+            with self.pool.connection(timeout=HEALTH_TIMEOUT) as connection:
+                connection.ping(reconnect=False)
+            status = 'ok'
+        except pymysql.Error as e:
+            status = f"unavailable: {e}"
+        return {'status': status, 'dsn': self.pool.dsn, 'dialect': self.pool.dialect, **self.counters()}
+
+    def stats(self):
+        return {'server': self.counters(), 'cache': result_cache.stats(), 'metrics': metrics.registry.to_dict()}
+
+    @contextmanager
+    def slot(self):
+        """A worker slot, or None once the queue timeout passes."""
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._count(rejected=1)
+            yield None
+            return
+        self._count(requests=1, in_flight=1)
+        try:
+            yield True
+        finally:
+            self._count(in_flight=-1)
+            self._slots.release()
+
+    def run(self, argv, write_line):
+        """
+        Runs one command, passing each JSON line of the response to
+        `write_line`, and ends with the trailer. Returns True on success.
+        """
+        error = None
+        with self.stderr.capture() as captured:
+            rows = None
+            try:
+                name, produce = self.dispatch(argv)
+                with metrics.command(name):
+                    rows = produce()
+                    for count, row in enumerate(rows, start=1):
+                        write_line(json.dumps(self.encode_row(row), default=str))
+                        if count % FLUSH_EVERY_ROWS == 0:
+                            write_line(None)
+            except (BrokenPipeError, ConnectionResetError):
+                raise  # client went away; nothing left to tell it
+            except self.errors as e:
+                error = str(e)
+            except Exception as e:
+                error = f"Internal error: {type(e).__name__}: {e}"
+                print(f"[ERROR] {' '.join(argv)}: {error}", file=self.stderr._stream)
+            finally:
+                close = getattr(rows, 'close', None)
+                if close:
+                    close()  # release an unbuffered cursor if the stream was cut short
+        if error:
+            self._count(failed=1)
+        write_line(json.dumps({'_end': True, 'ok': error is None, 'error': error, 'stderr': captured.getvalue()}))
+        return error is None
+
+
+# --- HTTP ---
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = 'ChimeraDB'
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, fmt, *args):
+        pass  # per-request logs would drown the stderr of a busy daemon
+
+    def _send_json(self, status, payload, content_type='application/json'):
+        body = (payload if isinstance(payload, str) else json.dumps(payload, default=str)).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == '/health':
+            health = service.health()
+            self._send_json(200 if health['status'] == 'ok' else 503, health)
+        elif self.path == '/stats':
+            self._send_json(200, service.stats())
+        elif self.path == '/metrics':
+            self._send_json(200, metrics.registry.to_prometheus(), 'text/plain; version=0.0.4')
+        else:
+            self._send_json(404, {'error': f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/run':
+            self._send_json(404, {'error': f"Unknown endpoint {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length > MAX_REQUEST_BYTES:
+                raise ValueError("Request too large.")
+            argv = json.loads(self.rfile.read(length) or b'{}').get('argv')
+            if not isinstance(argv, list) or not argv or not all(isinstance(a, str) for a in argv):
+                raise ValueError('Expected {"argv": ["command", "--option", "value", ...]}.')
+        except (ValueError, AttributeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        service = self.server.service
+        with service.slot() as slot:
+            if slot is None:
+                self._send_json(503, {'error': f"All {service.workers} workers busy for {service.queue_timeout:g}s."})
+                return
+            # Rows stream as they are produced; the body ends when the connection closes.
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+
+            def write_line(line):
+                if line is None:
+                    self.wfile.flush()
+                else:
+                    self.wfile.write(line.encode('utf-8') + b'\n')
+            try:
+                service.run(argv, write_line)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _remove_stale_socket(path):
+    """Removes a socket file left by a daemon that is no longer running."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.remove(path)
+    else:
+        raise OSError(f"Another daemon is already listening on {path}.")
+    finally:
+        probe.close()
+
+
+def make_server(service, socket_path=None, host=None, port=None):
+    """An HTTP server bound to a Unix socket, or to host:port when `port` is given."""
+    if port is not None:
+        host = host or '127.0.0.1'
+        try:
+            loopback = ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+        except (OSError, ValueError):
+            loopback = False
+        if not loopback:
+            raise ValueError(f"Refusing to listen on {host}: the daemon has no authentication, use a loopback address.")
+        server = ThreadingHTTPServer((host, port), _RequestHandler)
+    else:
+        socket_path = socket_path or DEFAULT_SOCKET
+        _remove_stale_socket(socket_path)
+        old_umask = os.umask(0o177)  # created 0600: only this user can connect
+        try:
+            server = _UnixHTTPServer(socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+    server.service = service
+    return server
+
+
+def address_of(server):
+    if isinstance(server.server_address, tuple):
+        return f"http://{server.server_address[0]}:{server.server_address[1]}"
+    return server.server_address
+
+
+def serve(service, server):
+    """
+    Serves until SIGINT or SIGTERM. While serving, sys.stderr is routed per
+    request thread. Returns the final counters.
+    """
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    previous_term = signal.signal(signal.SIGTERM, stop)
+    real_stderr, sys.stderr = sys.stderr, service.stderr
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sys.stderr = real_stderr
+        signal.signal(signal.SIGTERM, previous_term)
+        server.server_close()
+        if not isinstance(server.server_address, tuple) and os.path.exists(server.server_address):
+            os.remove(server.server_address)
+    return service.counters()
@@ -0,0 +1,347 @@
+"""
+Columnar Analytics Snapshot (snapshot.py)
+Exports the tables behind the aggregate reports into a directory of NumPy
+column files and answers READ 2, 3, 5 and 7 from them with vectorized
+group-bys over memory-mapped arrays. Analysts can re-run those reports with
+different cuts as often as they like, in milliseconds, without putting any
+load on the production database.
+
+    python3 main_app.py snapshot-export --out snapshots/2026-10-17
+    python3 main_app.py analytics top-personnel --snapshot snapshots/2026-10-17 --base-id 3 --limit 10
+    python3 main_app.py analytics base-success-rate --snapshot snapshots/2026-10-17 --started-after 2025-01-01
+
+The export reads every table inside one consistent snapshot, streaming rows
+from an unbuffered cursor into preallocated column files, so memory stays flat
+however large the tables are. Text and ENUM columns are dictionary-encoded
+(int32 codes plus the list of values in manifest.json), dates are
+datetime64[D] with NaT for NULL, and NULL foreign keys are stored as -1.
+
+NumPy is optional; only these two commands need it (pip install numpy).
+"""
+
+import os
+import json
+import time
+import datetime
+
+from metrics import InstrumentedSSDictCursor
+
+try:
+    import numpy as np
+except ImportError:  # Only snapshot-export and analytics need it.
+    np = None
+
+SNAPSHOT_VERSION = 3
+MANIFEST = 'manifest.json'
+EXPORT_BATCH_ROWS = 10000
+NULL_ID = -1
+
+# Column kinds -> on-disk dtype.
+# id: primary/foreign key; ref: nullable foreign key (NULL_ID); int: measure;
+# date: DATE (NaT for NULL); code: dictionary-encoded text or ENUM.
+DTYPES = {'id': 'int32', 'ref': 'int32', 'int': 'int64', 'date': 'datetime64[D]', 'code': 'int32'}
+
+# Table -> (columns as (name, kind), ORDER BY). Entity tables are sorted by
+# their key so joins are binary searches; junction tables keep scan order.
+SNAPSHOT_TABLES = {
+    'MISSION': ((('Mission_ID', 'id'), ('Status', 'code'), ('StartDate', 'date'), ('Target_Trainer_ID', 'ref')),
+                'Mission_ID'),
+    'MISSION_ASSIGNMENT': ((('Mission_ID', 'id'), ('Personnel_ID', 'id'), ('Base_ID', 'ref')), None),
+    'PERSONNEL': ((('Personnel_ID', 'id'), ('FName', 'code'), ('LName', 'code'), ('Base_ID', 'ref'),
+                   ('RetiredDate', 'date')), 'Personnel_ID'),
+    'BASE': ((('Base_ID', 'id'), ('Name', 'code')), 'Base_ID'),
+    'TRAINER': ((('Trainer_ID', 'id'), ('NotorietyScore', 'int')), 'Trainer_ID'),
+    'POKEMON': ((('Pokemon_ID', 'id'), ('HP', 'int'), ('Attack', 'int'), ('Defense', 'int')), 'Pokemon_ID'),
+    'POKEMON_TYPE': ((('Pokemon_ID', 'id'), ('Type', 'code')), None),
+}
+
+# Tables exported from a query instead of the table itself. Missions and their
+# assignments are the live rows plus the archived ones (mission_archive.py), so
+# the reports see both; an assignment's Base_ID is the base READ 7 credits it
+# to (the assignee's current base, or their base when the mission was archived).
+SNAPSHOT_SOURCES = {
+    'MISSION': """
+        SELECT Mission_ID, `Status`, StartDate, Target_Trainer_ID FROM MISSION
+        UNION ALL
+        SELECT Mission_ID, `Status`, StartDate, Target_Trainer_ID FROM MISSION_HISTORY
+    """,
+    'MISSION_ASSIGNMENT': """
+        SELECT ma.Mission_ID, ma.Personnel_ID, p.Base_ID
+        FROM MISSION_ASSIGNMENT ma
+        LEFT JOIN PERSONNEL p ON p.Personnel_ID = ma.Personnel_ID
+        UNION ALL
+        SELECT Mission_ID, Personnel_ID, Base_ID FROM MISSION_ASSIGNMENT_HISTORY
+    """,
+}
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("Columnar snapshots need NumPy (pip install numpy).")
+
+
+# --- Export ---
+
+def _encode(kind, values, dictionary):
+    """One batch of column values as an array of the column's dtype."""
+    if kind == 'code':
+        return np.fromiter((dictionary.setdefault(value, len(dictionary)) for value in values),
+                           dtype=DTYPES[kind], count=len(values))
+    if kind == 'ref':
+        values = [NULL_ID if value is None else value for value in values]
+    return np.array(values, dtype=DTYPES[kind])
+
+
+def _export_table(connection, out_dir, table, batch_rows):
+    columns, order_by = SNAPSHOT_TABLES[table]
+    source = f"({SNAPSHOT_SOURCES[table]}) s" if table in SNAPSHOT_SOURCES else table
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) AS N FROM {source}")
+        total = cursor.fetchone()['N']
+
+    arrays = {name: np.lib.format.open_memmap(os.path.join(out_dir, f"{table}.{name}.npy"), mode='w+',
+                                              dtype=DTYPES[kind], shape=(total,))
+              for name, kind in columns}
+    dictionaries = {name: {} for name, kind in columns if kind == 'code'}
+    sql = f"SELECT {', '.join(f'`{name}`' for name, _ in columns)} FROM {source}"
+    if order_by:
+        sql += f" ORDER BY {order_by}"
+
+    filled = 0
+    cursor = connection.cursor(InstrumentedSSDictCursor)
+    try:
+        cursor.execute(sql)
+        while True:
+            rows = cursor.fetchmany(batch_rows)
+            if not rows:
+                break
+            if filled + len(rows) > total:
+                raise ValueError(f"{table} grew during the export; is the snapshot transaction open?")
+            for name, kind in columns:
+                arrays[name][filled:filled + len(rows)] = _encode(kind, [row[name] for row in rows],
+                                                                  dictionaries.get(name))
+            filled += len(rows)
+    finally:
+        cursor.close()
+    for array in arrays.values():
+        array.flush()
+
+    return {
+        'rows': total,
+        'sorted_by': order_by,
+        'columns': {name: {'kind': kind, 'dtype': DTYPES[kind], 'file': f"{table}.{name}.npy",
+                           **({'values': list(dictionaries[name])} if kind == 'code' else {})}
+                    for name, kind in columns},
+    }
+
+
+def export_snapshot(pool, out_dir, batch_rows=EXPORT_BATCH_ROWS):
+    """
+    Writes every SNAPSHOT_TABLES table to `out_dir` from one REPEATABLE READ
+    consistent snapshot. manifest.json is written last, so an interrupted
+    export is never mistaken for a complete one. Yields {'Table', 'Rows',
+    'Seconds'} per table.
+    """
+    require_numpy()
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)  # the directory is being overwritten
+
+    manifest = {'version': SNAPSHOT_VERSION, 'source': pool.dsn,
+                'created_at': datetime.datetime.now().isoformat(timespec='seconds'), 'tables': {}}
+    with pool.connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+        for table in SNAPSHOT_TABLES:
+            started = time.monotonic()
+            manifest['tables'][table] = _export_table(connection, out_dir, table, int(batch_rows))
+            yield {'Table': table, 'Rows': manifest['tables'][table]['rows'],
+                   'Seconds': round(time.monotonic() - started, 3)}
+        connection.rollback()
+
+    tmp = manifest_path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, manifest_path)
+
+
+# --- Snapshot Access ---
+
+class Snapshot:
+    """A snapshot directory opened read-only; column files are memory-mapped on first use."""
+
+    def __init__(self, path):
+        require_numpy()
+        manifest_path = os.path.join(path, MANIFEST)
+        if not os.path.exists(manifest_path):
+            raise ValueError(f"{path} is not a complete snapshot (no {MANIFEST}); run snapshot-export.")
+        with open(manifest_path, encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"{path} has snapshot version {self.manifest.get('version')}, expected {SNAPSHOT_VERSION}.")
+        self.path = path
+        self.created_at = self.manifest['created_at']
+        self._columns = {}
+
+    def column(self, table, name):
+        key = (table, name)
+        if key not in self._columns:
+            spec = self.manifest['tables'][table]['columns'][name]
+            self._columns[key] = np.load(os.path.join(self.path, spec['file']), mmap_mode='r')
+        return self._columns[key]
+
+    def values(self, table, name):
+        """The dictionary of a code column: values[code] is the original text."""
+        return self.manifest['tables'][table]['columns'][name]['values']
+
+    def code(self, table, name, value):
+        """The code for `value` in a code column, or -1 if it never occurs."""
+        values = self.values(table, name)
+        return values.index(value) if value in values else -1
+
+
+def _lookup(keys, ids):
+    """
+    Positions of `ids` in the sorted key column `keys`, plus a mask of the ids
+    actually present (the inner-join condition).
+    """
+    if not len(keys):
+        return np.zeros(len(ids), dtype=np.intp), np.zeros(len(ids), dtype=bool)
+    positions = np.minimum(np.searchsorted(keys, ids), len(keys) - 1)
+    return positions, keys[positions] == ids
+
+
+def _mission_mask(snap, status=None, started_after=None, started_before=None):
+    """Boolean mask over MISSION rows for a status and StartDate range (NULL dates never match)."""
+    mask = np.ones(len(snap.column('MISSION', 'Mission_ID')), dtype=bool)
+    if status is not None:
+        mask &= snap.column('MISSION', 'Status') == snap.code('MISSION', 'Status', status)
+    start = snap.column('MISSION', 'StartDate')
+    if started_after is not None:
+        mask &= start >= np.datetime64(started_after, 'D')
+    if started_before is not None:
+        mask &= start < np.datetime64(started_before, 'D')
+    return mask
+
+
+def _assignments(snap):
+    """MISSION_ASSIGNMENT rows joined to MISSION and PERSONNEL: (mission pos, person pos, both found)."""
+    mission_pos, mission_found = _lookup(snap.column('MISSION', 'Mission_ID'),
+                                         snap.column('MISSION_ASSIGNMENT', 'Mission_ID'))
+    person_pos, person_found = _lookup(snap.column('PERSONNEL', 'Personnel_ID'),
+                                       snap.column('MISSION_ASSIGNMENT', 'Personnel_ID'))
+    return mission_pos, person_pos, mission_found & person_found
+
+
+# --- Vectorized Reports ---
+
+def pending_mission_risk(snap, base_id=None, started_after=None, started_before=None):
+    """READ 2. `base_id` keeps missions with at least one assignee from that base."""
+    missions = _mission_mask(snap, 'Pending', started_after, started_before)
+    if base_id is not None:
+        mission_pos, person_pos, found = _assignments(snap)
+        found &= snap.column('PERSONNEL', 'Base_ID')[person_pos] == int(base_id)
+        at_base = np.zeros(len(missions), dtype=bool)
+        at_base[mission_pos[found]] = True
+        missions &= at_base
+
+    targets = snap.column('MISSION', 'Target_Trainer_ID')[missions]
+    positions, found = _lookup(snap.column('TRAINER', 'Trainer_ID'), targets)
+    scores = snap.column('TRAINER', 'NotorietyScore')[positions[found]]
+    scores = scores[scores > 0]
+    return {'Mission_Count': int(scores.size), 'Total_Risk': int(scores.sum()) if scores.size else None}
+
+
+def top_performing_personnel(snap, limit=5, base_id=None, started_after=None, started_before=None):
+    """READ 3. `base_id` ranks only personnel currently at that base; retired personnel are skipped."""
+    completed = _mission_mask(snap, 'Completed', started_after, started_before)
+    mission_pos, person_pos, found = _assignments(snap)
+    found &= completed[mission_pos]
+    found[found] = np.isnat(snap.column('PERSONNEL', 'RetiredDate')[person_pos[found]])
+    if base_id is not None:
+        found &= snap.column('PERSONNEL', 'Base_ID')[person_pos] == int(base_id)
+
+    personnel_ids = snap.column('PERSONNEL', 'Personnel_ID')
+    counts = np.bincount(person_pos[found], minlength=len(personnel_ids))
+    ranked = np.flatnonzero(counts)
+    ranked = ranked[np.lexsort((personnel_ids[ranked], -counts[ranked]))][:int(limit)]
+
+    fnames, lnames = snap.values('PERSONNEL', 'FName'), snap.values('PERSONNEL', 'LName')
+    fcodes, lcodes = snap.column('PERSONNEL', 'FName'), snap.column('PERSONNEL', 'LName')
+    return [{'FName': fnames[fcodes[i]], 'LName': lnames[lcodes[i]], 'Mission_Count': int(counts[i])}
+            for i in ranked]
+
+
+def pokemon_stats_by_type(snap):
+    """READ 5: averages rounded to 4 places, as MySQL's integer division returns them."""
+    type_codes = snap.column('POKEMON_TYPE', 'Type')
+    positions, found = _lookup(snap.column('POKEMON', 'Pokemon_ID'), snap.column('POKEMON_TYPE', 'Pokemon_ID'))
+    type_codes, positions = type_codes[found], positions[found]
+
+    types = snap.values('POKEMON_TYPE', 'Type')
+    counts = np.bincount(type_codes, minlength=len(types))
+    sums = {stat: np.bincount(type_codes, weights=snap.column('POKEMON', stat)[positions], minlength=len(types))
+            for stat in ('HP', 'Attack', 'Defense')}
+    rows = [{'Type': types[code],
+             'Avg_HP': round(sums['HP'][code] / counts[code], 4),
+             'Avg_Atk': round(sums['Attack'][code] / counts[code], 4),
+             'Avg_Def': round(sums['Defense'][code] / counts[code], 4)}
+            for code in np.flatnonzero(counts)]
+    rows.sort(key=lambda row: (-row['Avg_Atk'], row['Type']))
+    return rows
+
+
+def mission_success_rate_by_base(snap, base_id=None, started_after=None, started_before=None):
+    """
+    READ 7 from the fact tables: a base counts each mission once however many
+    of its people are on it, the same rule BASE_MISSION_STATS follows, and
+    archived missions count for the base recorded when they were archived.
+    """
+    missions = _mission_mask(snap, None, started_after, started_before)
+    completed = snap.column('MISSION', 'Status') == snap.code('MISSION', 'Status', 'Completed')
+    mission_pos, found = _lookup(snap.column('MISSION', 'Mission_ID'), snap.column('MISSION_ASSIGNMENT', 'Mission_ID'))
+    found &= missions[mission_pos]
+
+    base_ids = snap.column('BASE', 'Base_ID')
+    base_pos, base_found = _lookup(base_ids, snap.column('MISSION_ASSIGNMENT', 'Base_ID'))
+    found &= base_found
+    if base_id is not None:
+        found &= base_ids[base_pos] == int(base_id)
+
+    # Distinct (base, mission) pairs, packed into one int64 key.
+    n_missions = len(missions)
+    pairs = np.unique(base_pos[found].astype(np.int64) * n_missions + mission_pos[found])
+    pair_base, pair_mission = np.divmod(pairs, n_missions) if n_missions else (pairs, pairs)
+    totals = np.bincount(pair_base, minlength=len(base_ids))
+    done = np.bincount(pair_base, weights=completed[pair_mission], minlength=len(base_ids))
+
+    names, name_codes = snap.values('BASE', 'Name'), snap.column('BASE', 'Name')
+    ranked = np.flatnonzero(totals)
+    ranked = ranked[np.lexsort((base_ids[ranked], -totals[ranked]))]
+    return [{'Base_Name': names[name_codes[i]], 'Total_Missions': int(totals[i]),
+             'Completed_Missions': int(done[i]), 'Success_Rate': done[i] / totals[i] * 100}
+            for i in ranked]
+
+
+# Report name (as in dashboard.py) -> (function, cut options it accepts).
+REPORTS = {
+    'pending-risk': (pending_mission_risk, ('base_id', 'started_after', 'started_before')),
+    'top-personnel': (top_performing_personnel, ('limit', 'base_id', 'started_after', 'started_before')),
+    'pokemon-type-stats': (pokemon_stats_by_type, ()),
+    'base-success-rate': (mission_success_rate_by_base, ('base_id', 'started_after', 'started_before')),
+}
+
+
+def run_report(snap, name, **options):
+    """
+    Runs report `name` on an open Snapshot. Options the report does not take
+    must be None. Returns a list of rows.
+    """
+    func, accepted = REPORTS[name]
+    unused = [option for option, value in options.items() if value is not None and option not in accepted]
+    if unused:
+        raise ValueError(f"{name} does not take {', '.join('--' + o.replace('_', '-') for o in unused)}.")
+    result = func(snap, **{option: value for option, value in options.items() if option in accepted and value is not None})
+    return result if isinstance(result, list) else [result]
@@ -0,0 +1,845 @@
+"""
+Embedded SQLite Backend (sqlite_backend.py)
+Runs Chimera DB in-process on SQLite instead of a MySQL server, for CI, demos
+and offline experiments: nothing to install or start, and no network round
+trip per query. schema.sql and populate.sql are translated on load and the
+twelve operations run unchanged, because SQLitePool hands out connections that
+behave like the pool's pymysql ones:
+
+- `%s` parameters, dict rows, execute() returning the row count, and the
+  lastrowid of a multi-row INSERT being the first generated ID;
+- the MySQL dialect the code uses (backticks, CURDATE(), IF(), GREATEST(),
+  FOR UPDATE, SET SESSION ..., TRUNCATE, INSERT IGNORE, the no-op ON
+  DUPLICATE KEY UPDATE col = col, UPDATE with a table alias, decimal
+  division) is rewritten statement by statement;
+- sqlite3 errors are re-raised as the matching pymysql exception, so every
+  existing `except pymysql.Error` handler keeps working.
+
+    python3 main_app.py --sqlite chimera.db sqlite-init --populate
+    python3 main_app.py --sqlite chimera.db active-missions
+    CHIMERA_SQLITE_PATH=chimera.db python3 main_app.py
+
+MySQL-only features (EXPLAIN FORMAT=JSON, LOAD DATA INFILE, FLUSH TABLES and
+the Handler_* status counters) raise pymysql.err.NotSupportedError or report
+nothing, and FULLTEXT indexes are skipped. The summary tables are kept by
+SQLite ports of the schema.sql triggers; renumbering a MISSION or BASE primary
+key is not tracked, so run summary-rebuild after doing that.
+"""
+
+import os
+import re
+import time
+import decimal
+import datetime
+import itertools
+import sqlite3
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache
+
+import pymysql
+
+from db import (ConnectionPool, DEFAULT_POOL_SIZE, DEFAULT_CHECKOUT_TIMEOUT, DEFAULT_PING_INTERVAL,
+                DEFAULT_LOCK_WAIT_TIMEOUT)
+from metrics import registry, InstrumentedCursorMixin, InstrumentedUnbufferedMixin
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_PATH = os.path.join(SRC_DIR, 'schema.sql')
+POPULATE_PATH = os.path.join(SRC_DIR, 'populate.sql')
+
+MEMORY = ':memory:'
+
+# --- Type Conversion ---
+# Declared column types pick the converter, so DATE/DATETIME/DECIMAL columns
+# come back as the same Python types pymysql returns.
+
+sqlite3.register_converter('DATE', lambda value: datetime.date.fromisoformat(value.decode()[:10]))
+sqlite3.register_converter('DATETIME', lambda value: datetime.datetime.fromisoformat(value.decode()))
+sqlite3.register_converter('DECIMAL', lambda value: decimal.Decimal(value.decode()))
+
+
+def _adapt(value):
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _params(args):
+    if args is None:
+        return ()
+    if isinstance(args, dict):
+        raise pymysql.err.NotSupportedError(0, "Named (%(name)s) parameters are not supported on SQLite.")
+    return tuple(_adapt(value) for value in args)
+
+
+# --- Errors ---
+
+_ERRORS = (
+    (sqlite3.IntegrityError, pymysql.err.IntegrityError),
+    (sqlite3.ProgrammingError, pymysql.err.ProgrammingError),
+    (sqlite3.OperationalError, pymysql.err.OperationalError),
+    (sqlite3.NotSupportedError, pymysql.err.NotSupportedError),
+    (sqlite3.DataError, pymysql.err.DataError),
+    (sqlite3.InterfaceError, pymysql.err.InterfaceError),
+    (sqlite3.Error, pymysql.err.DatabaseError),
+)
+
+
+@contextmanager
+def _mysql_errors():
+    """Re-raises sqlite3 errors as the matching pymysql exception."""
+    try:
+        yield
+    except sqlite3.Error as e:
+        for sqlite_error, mysql_error in _ERRORS:
+            if isinstance(e, sqlite_error):
+                raise mysql_error(getattr(e, 'sqlite_errorcode', 0), str(e)) from e
+
+
+# --- Dialect Translation ---
+
+_TOKEN_RE = re.compile(r"""
+      (?P<comment>--[^\n]*|\#[^\n]*|/\*.*?\*/)
+    | (?P<string>'(?:[^'\\]|\\.|'')*')
+    | (?P<dstring>"(?:[^"\\]|\\.|"")*")
+    | (?P<ident>`[^`]*`)
+    | (?P<param>%s|%%)
+    | (?P<end>;)
+""", re.S | re.X)
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0', '\\': '\\', "'": "'", '"': '"', '%': '\\%', '_': '\\_'}
+
+# Applied to the code between literals, in order.
+_REWRITES = tuple((re.compile(pattern, re.I), replacement) for pattern, replacement in (
+    (r'\bCURDATE\(\)', "date('now', 'localtime')"),
+    (r'\bNOW\(\)', "datetime('now', 'localtime')"),
+    (r'\bVERSION\(\)', "('SQLite ' || sqlite_version())"),
+    (r'@@auto_increment_increment\b', '1'),
+    (r'\bIF\s*\(', 'IIF('),
+    (r'\bGREATEST\s*\(', 'MAX('),
+    (r'\bLEAST\s*\(', 'MIN('),
+    (r'\s+FOR\s+UPDATE\b', ''),
+    (r'\bINSERT\s+IGNORE\b', 'INSERT OR IGNORE'),
+    (r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\s+(\w+)\s*=\s*\1\b', 'ON CONFLICT DO NOTHING'),
+    (r'\bTRUNCATE\s+(?:TABLE\s+)?', 'DELETE FROM '),
+    (r'\bUPDATE\s+(\w+)\s+(?!SET\b)(\w+)\s+SET\b', r'UPDATE \1 AS \2 SET'),
+    # MySQL's / is decimal division; SQLite's truncates integers.
+    (r'\s/\s', ' * 1.0 / '),
+))
+
+
+def _string_literal(text, quote, has_params):
+    """A MySQL string literal ('...' or "...", backslash escapes) as an SQLite one."""
+    body = text[1:-1].replace(quote * 2, quote)
+    body = re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(1)), body, flags=re.S)
+    body = body.replace("'", "''")
+    if has_params:
+        body = body.replace('%%', '%')
+    return f"'{body}'"
+
+
+def _tokens(sql):
+    """Yields (kind, text) for the literals, comments and code of a statement or script."""
+    position = 0
+    for match in _TOKEN_RE.finditer(sql):
+        if match.start() > position:
+            yield 'code', sql[position:match.start()]
+        yield match.lastgroup, match.group()
+        position = match.end()
+    if position < len(sql):
+        yield 'code', sql[position:]
+
+
+@lru_cache(maxsize=1024)
+def translate(sql, has_params=True):
+    """Rewrites one MySQL statement as SQLite; `has_params` says whether %s/%% are placeholders."""
+    parts = []
+    for kind, text in _tokens(sql):
+        if kind == 'code':
+            for pattern, replacement in _REWRITES:
+                text = pattern.sub(replacement, text)
+        elif kind == 'string':
+            text = _string_literal(text, "'", has_params)
+        elif kind == 'dstring':
+            text = _string_literal(text, '"', has_params)
+        elif kind == 'ident':
+            text = '"' + text[1:-1] + '"'
+        elif kind == 'param' and has_params:
+            text = '?' if text == '%s' else '%'
+        elif kind == 'comment':
+            text = ' '
+        parts.append(text)
+    return ''.join(parts).strip().rstrip(';').rstrip()
+
+
+def split_statements(script):
+    """Splits an SQL script on `;`, skipping comments and DELIMITER blocks (routines, triggers)."""
+    script = re.sub(r'^DELIMITER\s+(\S+)\s*$.*?^DELIMITER\s+;\s*$', '', script, flags=re.M | re.S)
+    statements, current = [], []
+    for kind, text in _tokens(script):
+        if kind == 'end':
+            statements.append(''.join(current).strip())
+            current = []
+        elif kind != 'comment':
+            current.append(text)
+    statements.append(''.join(current).strip())
+    return [statement for statement in statements if statement]
+
+
+# Statements with no SQLite counterpart, or that act on the connection instead.
+_SPECIAL = tuple((re.compile(pattern, re.I | re.S), kind) for pattern, kind in (
+    (r'^SET\s+(?:SESSION\s+|GLOBAL\s+)?TRANSACTION\b', 'noop'),
+    (r'^SET\s+(?:SESSION\s+)?(?:innodb_lock_wait_timeout|unique_checks|sql_mode|NAMES)\b', 'noop'),
+    (r'^SET\s+(?:SESSION\s+)?foreign_key_checks\s*=\s*(\w+)', 'foreign_keys'),
+    (r'^SET\s+@(\w+)\s*:?=\s*(.+?)$', 'variable'),
+    (r'^(?:START\s+TRANSACTION|BEGIN)\b', 'begin'),
+    (r'^COMMIT\b', 'commit'),
+    (r'^ROLLBACK\s*$', 'rollback'),
+    (r'^KILL\s+(?:QUERY\s+|CONNECTION\s+)?(\S+)', 'kill'),
+    (r'^SHOW\s+(?:SESSION\s+|GLOBAL\s+)?STATUS\b', 'status'),
+    (r'^ANALYZE\s+(?:NO_WRITE_TO_BINLOG\s+|LOCAL\s+)?TABLE\b', 'analyze'),
+    (r'^(?:USE|CREATE\s+DATABASE|DROP\s+DATABASE)\b', 'noop'),
+    (r'^CREATE\s+FULLTEXT\s+INDEX\b', 'noop'),  # search.py uses its inverted index instead
+    (r'^(?:LOAD\s+DATA|FLUSH|LOCK\s+TABLES|UNLOCK\s+TABLES|EXPLAIN\s+FORMAT|SHOW|OPTIMIZE|CALL)\b', 'unsupported'),
+))
+
+
+@lru_cache(maxsize=1024)
+def _classify(sql):
+    """(kind, regex groups) for a special statement, or ('sql', ()) for anything else."""
+    statement = ''.join(text for kind, text in _tokens(sql) if kind != 'comment').strip().rstrip(';').rstrip()
+    for pattern, kind in _SPECIAL:
+        match = pattern.match(statement)
+        if match:
+            return kind, match.groups()
+    return 'sql', ()
+
+
+def _literal(text, params):
+    """The value of a SET @var / KILL operand: %s, NULL, a number or a quoted string."""
+    text = text.strip()
+    if text == '%s':
+        return params[0] if params else None
+    if text.upper() == 'NULL':
+        return None
+    if text[:1] in ("'", '"'):
+        return translate(text, bool(params))[1:-1].replace("''", "'")
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+# --- Cursors ---
+
+class _SQLiteCursor:
+    """
+    pymysql DictCursor look-alike over a sqlite3 cursor. Buffered: a SELECT
+    reads every row on execute() and returns the row count, as pymysql does.
+    """
+
+    _buffered = True
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._cursor = connection._db.cursor()
+        self._rows = None
+        self._index = 0
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+        self.arraysize = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def close(self):
+        if self._cursor is not None:
+            self._cursor.close()
+            self._cursor = None
+
+    # --- Execution ---
+
+    def _result(self, description=None, rows=None, rowcount=0):
+        self.description = description
+        self._rows = rows
+        self._index = 0
+        self.rowcount = rowcount
+        return rowcount
+
+    def _special(self, query, kind, groups, params):
+        connection = self.connection
+        if kind == 'foreign_keys':
+            connection._db.execute(f"PRAGMA foreign_keys = {'ON' if _literal(groups[0], params) else 'OFF'}")
+        elif kind == 'variable':
+            value = _literal(groups[1], params)
+            if value is None:
+                connection.variables.pop(groups[0], None)
+            else:
+                connection.variables[groups[0]] = value
+        elif kind == 'begin':
+            connection.begin()
+        elif kind == 'commit':
+            connection.commit()
+        elif kind == 'rollback':
+            connection.rollback()
+        elif kind == 'kill':
+            target = _CONNECTIONS.get(_literal(groups[0], params))
+            if target is None:
+                raise pymysql.err.InternalError(1094, f"Unknown thread id: {groups[0]}")
+            target.interrupt()
+        elif kind == 'status':
+            # No server status counters; an empty result keeps callers' sums at zero.
+            return self._result((('Variable_name',) + (None,) * 6, ('Value',) + (None,) * 6), [])
+        elif kind == 'analyze':
+            connection._db.execute('ANALYZE')
+        elif kind == 'unsupported':
+            raise pymysql.err.NotSupportedError(0, f"{' '.join(query.split()[:2]).upper()} is not available on the SQLite backend.")
+        return self._result()
+
+    def _fetch_result(self):
+        description = self._cursor.description
+        if description is None:
+            return self._result(rowcount=max(self._cursor.rowcount, 0))
+        description = tuple((column[0],) + (None,) * 6 for column in description)
+        if not self._buffered:
+            self._result(description, None, -1)
+            return 0
+        names = [column[0] for column in description]
+        rows = [dict(zip(names, row)) for row in self._cursor.fetchall()]
+        return self._result(description, rows, len(rows))
+
+    def execute(self, query, args=None):
+        params = _params(args)
+        kind, groups = _classify(query)
+        if kind != 'sql':
+            return self._special(query, kind, groups, params)
+        sql = translate(query, args is not None)
+        with _mysql_errors():
+            self.connection._begin_implicit()
+            self._cursor.execute(sql, params)
+            self.lastrowid = self._cursor.lastrowid
+            return self._fetch_result()
+
+    def executemany(self, query, args):
+        rows = [_params(row) for row in args]
+        if not rows:
+            return 0
+        sql = translate(query, True)
+        with _mysql_errors():
+            self.connection._begin_implicit()
+            # MySQL reports the first ID of a multi-row INSERT; keep that contract.
+            self._cursor.execute(sql, rows[0])
+            first_id, affected = self._cursor.lastrowid, max(self._cursor.rowcount, 0)
+            if len(rows) > 1:
+                self._cursor.executemany(sql, rows[1:])
+                affected += max(self._cursor.rowcount, 0)
+        self.lastrowid = first_id
+        return self._result(rowcount=affected)
+
+    # --- Fetching ---
+
+    def fetchone(self):
+        if self._rows is None:
+            return None
+        if self._index >= len(self._rows):
+            return None
+        self._index += 1
+        return self._rows[self._index - 1]
+
+    def fetchmany(self, size=None):
+        if self._rows is None:
+            return []
+        size = self.arraysize if size is None else size
+        rows = self._rows[self._index:self._index + size]
+        self._index += len(rows)
+        return rows
+
+    def fetchall(self):
+        if self._rows is None:
+            return []
+        rows = self._rows[self._index:]
+        self._index = len(self._rows)
+        return rows
+
+
+class _SQLiteUnbufferedCursor(_SQLiteCursor):
+    """pymysql SSDictCursor look-alike: rows are read from SQLite as they are fetched."""
+
+    _buffered = False
+
+    def _names(self):
+        return [column[0] for column in self.description]
+
+    def fetchone(self):
+        if self.description is None:
+            return None
+        with _mysql_errors():
+            row = self._cursor.fetchone()
+        return dict(zip(self._names(), row)) if row is not None else None
+
+    def fetchmany(self, size=None):
+        if self.description is None:
+            return []
+        with _mysql_errors():
+            rows = self._cursor.fetchmany(self.arraysize if size is None else size)
+        names = self._names()
+        return [dict(zip(names, row)) for row in rows]
+
+    def fetchall(self):
+        if self.description is None:
+            return []
+        with _mysql_errors():
+            rows = self._cursor.fetchall()
+        names = self._names()
+        return [dict(zip(names, row)) for row in rows]
+
+
+class SQLiteDictCursor(InstrumentedCursorMixin, _SQLiteCursor):
+    """The SQLite pool's default cursor."""
+
+
+class SQLiteSSDictCursor(InstrumentedUnbufferedMixin, _SQLiteUnbufferedCursor):
+    """Unbuffered variant for streamed reports."""
+
+
+# --- Connections ---
+
+_thread_ids = itertools.count(1)
+_CONNECTIONS = weakref.WeakValueDictionary()  # thread_id() -> connection, for KILL QUERY
+
+
+class SQLiteConnection:
+    """
+    One sqlite3 connection behind the subset of pymysql's Connection API the
+    application uses. Transactions start implicitly at the first statement, as
+    with autocommit=False on MySQL. User variables (SET @name = ...) are kept
+    per connection and readable in SQL as session_var('name').
+    """
+
+    def __init__(self, database, timeout=DEFAULT_LOCK_WAIT_TIMEOUT, uri=False):
+        with _mysql_errors():
+            self._db = sqlite3.connect(database, timeout=timeout, uri=uri, isolation_level=None,
+                                       check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES)
+            self._db.execute("PRAGMA foreign_keys = ON")
+        self.variables = {}
+        self._db.create_function('session_var', 1, self.variables.get, deterministic=False)
+        self._thread_id = next(_thread_ids)
+        _CONNECTIONS[self._thread_id] = self
+
+    @property
+    def open(self):
+        return self._db is not None
+
+    def _check_open(self):
+        if self._db is None:
+            raise pymysql.err.InterfaceError(0, "Connection is closed.")
+
+    def thread_id(self):
+        return self._thread_id
+
+    def ping(self, reconnect=False):
+        self._check_open()
+
+    def cursor(self, cursor=None):
+        self._check_open()
+        if cursor is not None and issubclass(cursor, pymysql.cursors.SSCursor):
+            return SQLiteSSDictCursor(self)
+        return SQLiteDictCursor(self)
+
+    def begin(self):
+        self._check_open()
+        with _mysql_errors():
+            if self._db.in_transaction:
+                self._db.execute("COMMIT")  # MySQL's START TRANSACTION commits implicitly too
+            self._db.execute("BEGIN")
+
+    def _begin_implicit(self):
+        self._check_open()
+        if not self._db.in_transaction:
+            self._db.execute("BEGIN")
+
+    def commit(self):
+        self._check_open()
+        with _mysql_errors():
+            if self._db.in_transaction:
+                self._db.execute("COMMIT")
+        registry.record_transaction(committed=True)
+
+    def rollback(self):
+        self._check_open()
+        if self._db.in_transaction:
+            with _mysql_errors():
+                self._db.execute("ROLLBACK")
+            registry.record_transaction(committed=False)
+
+    def reset(self):
+        """Rolls back whatever the last borrower left open, without counting it."""
+        self._check_open()
+        if self._db.in_transaction:
+            with _mysql_errors():
+                self._db.execute("ROLLBACK")
+
+    def interrupt(self):
+        """Aborts the statement running on this connection (KILL QUERY)."""
+        if self._db is not None:
+            self._db.interrupt()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+# --- Pool ---
+
+_memory_ids = itertools.count(1)
+
+
+class SQLitePool(ConnectionPool):
+    """
+    ConnectionPool over one SQLite database file (or ':memory:', shared by the
+    pool's connections and its clones while the pool is open). File databases
+    use WAL so readers never wait for the writer; lock_wait_timeout becomes
+    SQLite's busy timeout. Isolation is always SERIALIZABLE, SQLite's only level.
+    """
+
+    dialect = 'sqlite'
+
+    def __init__(self, path, max_size=DEFAULT_POOL_SIZE,
+                 checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT,
+                 ping_interval=DEFAULT_PING_INTERVAL,
+                 isolation_level=None,
+                 lock_wait_timeout=DEFAULT_LOCK_WAIT_TIMEOUT,
+                 **ignored):
+        self._init_pool(max_size, checkout_timeout, ping_interval, None, lock_wait_timeout)
+        if path == MEMORY:
+            path = f"file:chimera-{os.getpid()}-{next(_memory_ids)}?mode=memory&cache=shared"
+        self.path = path
+        self._uri = path.startswith('file:')
+        self._anchor = None
+        if 'mode=memory' in path:
+            # A shared in-memory database lives as long as one connection to it.
+            self._anchor = self._open_connection()
+        else:
+            with _mysql_errors():
+                journal = sqlite3.connect(path)
+                try:
+                    journal.execute("PRAGMA journal_mode = WAL")
+                finally:
+                    journal.close()
+
+    @property
+    def dsn(self):
+        return f"sqlite:{self.path}"
+
+    def _open_connection(self, **overrides):
+        # MySQL-only options (local_infile, ...) have no meaning here.
+        timeout = self.lock_wait_timeout if self.lock_wait_timeout is not None else DEFAULT_LOCK_WAIT_TIMEOUT
+        return SQLiteConnection(self.path, timeout=timeout, uri=self._uri)
+
+    def _apply_session_settings(self, connection):
+        pass  # foreign keys and the busy timeout are set when the connection opens
+
+    def clone(self, **pool_overrides):
+        options = dict(
+            max_size=self.max_size,
+            checkout_timeout=self.checkout_timeout,
+            ping_interval=self.ping_interval,
+            lock_wait_timeout=self.lock_wait_timeout,
+        )
+        options.update(pool_overrides)
+        return SQLitePool(self.path, **options)
+
+    def close(self):
+        super().close()
+        if self._anchor is not None:
+            self._anchor.close()
+            self._anchor = None
+
+
+# --- Schema ---
+
+_CREATE_TABLE_RE = re.compile(r'^CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?\s*\((.*)\)([^)]*)$', re.I | re.S)
+_ALTER_FK_RE = re.compile(r'^ALTER\s+TABLE\s+`?(\w+)`?\s+ADD\s+(CONSTRAINT\s+\w+\s+FOREIGN\s+KEY\b.*)$', re.I | re.S)
+_INDEX_ITEM_RE = re.compile(r'^(?:UNIQUE\s+)?(?:KEY|INDEX)\s+`?(\w+)`?\s*(\(.*\))$', re.I | re.S)
+_COUNTER_RE = re.compile(r'^`?(\w+)`?\s+BIGINT\s+NOT\s+NULL\s+AUTO_INCREMENT\b', re.I)
+_ENUM_RE = re.compile(r'^(`?\w+`?)\s+ENUM\s*(\(.*?\))(.*)$', re.I | re.S)
+
+
+def _split_items(body):
+    """Splits a CREATE TABLE body on its top-level commas."""
+    items, current, depth = [], [], 0
+    for kind, text in _tokens(body):
+        if kind != 'code':
+            current.append(text)
+            continue
+        for char in text:
+            if char == ',' and depth == 0:
+                items.append(''.join(current).strip())
+                current = []
+                continue
+            depth += (char == '(') - (char == ')')
+            current.append(char)
+    items.append(''.join(current).strip())
+    return [item for item in items if item]
+
+
+# SQLite only auto-increments an INTEGER PRIMARY KEY, and the implicit rowid
+# of a table with a composite key reuses the highest value once that row is
+# deleted. The Seq insertion counters (engagement_graph.py) must never go
+# back, so each one is filled in by an AFTER INSERT trigger from this table.
+SEQ_COUNTER_SQL = ("CREATE TABLE IF NOT EXISTS SEQ_COUNTER "
+                   "(Table_Name TEXT PRIMARY KEY, Last_Value INTEGER NOT NULL)")
+
+
+def _counter_statements(table, column):
+    """The seed row and AFTER INSERT trigger that number `table`.`column` like AUTO_INCREMENT."""
+    return [
+        f"INSERT INTO SEQ_COUNTER (Table_Name, Last_Value) VALUES ('{table}', 0)",
+        f"""CREATE TRIGGER trg_{table.lower()}_{column.lower()} AFTER INSERT ON {table} FOR EACH ROW WHEN NEW.{column} IS NULL
+BEGIN
+        UPDATE SEQ_COUNTER SET Last_Value = Last_Value + 1 WHERE Table_Name = '{table}';
+        UPDATE {table} SET {column} = (SELECT Last_Value FROM SEQ_COUNTER WHERE Table_Name = '{table}')
+         WHERE rowid = NEW.rowid;
+END""",
+    ]
+
+
+def _create_table(table, body, foreign_keys):
+    """
+    A MySQL CREATE TABLE as SQLite statements: the table, then its inline
+    indexes. AUTO_INCREMENT columns outside the primary key (the Seq insertion
+    counters) become plain INTEGER columns numbered by a trigger.
+    """
+    items, indexes, counters = [], [], []
+    for item in _split_items(body):
+        counter = _COUNTER_RE.match(item)
+        if counter:
+            counters.append(counter.group(1))
+            items.append(f"{counter.group(1)} INTEGER")
+            continue
+        index = _INDEX_ITEM_RE.match(item)
+        if index:
+            unique = 'UNIQUE ' if item.upper().startswith('UNIQUE') else ''
+            indexes.append(f"CREATE {unique}INDEX {index.group(1)} ON {table} {index.group(2)}")
+            continue
+        enum = _ENUM_RE.match(item)
+        if enum:
+            item = f"{enum.group(1)} TEXT CHECK ({enum.group(1)} IN {enum.group(2)}){enum.group(3)}"
+        item = re.sub(r'\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b', 'INTEGER PRIMARY KEY AUTOINCREMENT', item, flags=re.I)
+        items.append(item)
+    items += foreign_keys
+    statements = [f"CREATE TABLE {table} (\n    " + ",\n    ".join(items) + "\n)", *indexes]
+    if counters:
+        statements.append(SEQ_COUNTER_SQL)
+        for column in counters:
+            statements += _counter_statements(table, column)
+    return statements
+
+
+def translate_schema(script):
+    """
+    schema.sql (or a migration) as a list of SQLite statements. ENUMs become
+    CHECK constraints, inline KEYs become CREATE INDEX, and foreign keys added
+    later with ALTER TABLE (PERSONNEL -> BASE) are folded into CREATE TABLE,
+    since SQLite only checks them when a row is written. The DELIMITER blocks
+    (stored routines and triggers) are replaced by SUMMARY_TRIGGERS.
+    """
+    statements = split_statements(script)
+    foreign_keys = {}
+    for statement in statements:
+        match = _ALTER_FK_RE.match(statement)
+        if match:
+            foreign_keys.setdefault(match.group(1).upper(), []).append(match.group(2))
+
+    translated = []
+    for statement in statements:
+        if _ALTER_FK_RE.match(statement) or _classify(statement)[0] == 'noop':
+            continue
+        match = _CREATE_TABLE_RE.match(statement)
+        if match:
+            table = match.group(1)
+            translated += _create_table(table, match.group(2), foreign_keys.pop(table.upper(), []))
+        else:
+            translated.append(statement)
+    if re.search(r'^DELIMITER\b', script, re.M):
+        translated += SUMMARY_TRIGGERS
+    return translated
+
+
+# --- Summary Triggers ---
+# SQLite ports of the GROUP 7 triggers in schema.sql (SQLite has no stored
+# procedures, so each procedure is a statement template). Unlike MySQL, SQLite
+# fires the child-table triggers for ON DELETE CASCADE, but only after the
+# parent row is gone; the templates resolve the person's base through
+# PERSONNEL, so those cascaded calls find no base and change nothing.
+
+_ACTIVE = "session_var('skip_summary_triggers') IS NULL"
+
+
+def _base_of(personnel):
+    return f"(SELECT Base_ID FROM PERSONNEL WHERE Personnel_ID = {personnel})"
+
+
+def _assignment_added(personnel, mission):
+    base = _base_of(personnel)
+    return f"""
+        INSERT INTO BASE_MISSION_STATS (Base_ID, Total_Missions, Completed_Missions)
+            SELECT {base}, 1, (SELECT COUNT(*) FROM MISSION WHERE Mission_ID = {mission} AND Status = 'Completed')
+            WHERE {base} IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM BASE_MISSION_LINK WHERE Base_ID = {base} AND Mission_ID = {mission})
+            ON CONFLICT (Base_ID) DO UPDATE SET Total_Missions = Total_Missions + 1,
+                                                Completed_Missions = Completed_Missions + excluded.Completed_Missions;
+        INSERT INTO BASE_MISSION_LINK (Base_ID, Mission_ID, Assignees)
+            SELECT {base}, {mission}, 1 WHERE {base} IS NOT NULL
+            ON CONFLICT (Base_ID, Mission_ID) DO UPDATE SET Assignees = Assignees + 1;"""
+
+
+def _assignment_removed(personnel, mission):
+    base = _base_of(personnel)
+    return f"""
+        UPDATE BASE_MISSION_STATS
+           SET Total_Missions = Total_Missions - 1,
+               Completed_Missions = Completed_Missions
+                   - (SELECT COUNT(*) FROM MISSION WHERE Mission_ID = {mission} AND Status = 'Completed')
+         WHERE Base_ID = {base}
+           AND EXISTS (SELECT 1 FROM BASE_MISSION_LINK WHERE Base_ID = {base} AND Mission_ID = {mission} AND Assignees <= 1);
+        DELETE FROM BASE_MISSION_LINK WHERE Base_ID = {base} AND Mission_ID = {mission} AND Assignees <= 1;
+        UPDATE BASE_MISSION_LINK SET Assignees = Assignees - 1 WHERE Base_ID = {base} AND Mission_ID = {mission};"""
+
+
+def _personnel_added(personnel, base):
+    return f"""
+        INSERT INTO BASE_MISSION_STATS (Base_ID, Total_Missions, Completed_Missions)
+            SELECT {base}, COUNT(*), COALESCE(SUM(m.Status = 'Completed'), 0)
+              FROM MISSION_ASSIGNMENT ma
+              JOIN MISSION m ON m.Mission_ID = ma.Mission_ID
+             WHERE ma.Personnel_ID = {personnel} AND {base} IS NOT NULL
+               AND NOT EXISTS (SELECT 1 FROM BASE_MISSION_LINK l WHERE l.Base_ID = {base} AND l.Mission_ID = ma.Mission_ID)
+             GROUP BY ma.Personnel_ID
+            ON CONFLICT (Base_ID) DO UPDATE SET Total_Missions = Total_Missions + excluded.Total_Missions,
+                                                Completed_Missions = Completed_Missions + excluded.Completed_Missions;
+        INSERT INTO BASE_MISSION_LINK (Base_ID, Mission_ID, Assignees)
+            SELECT {base}, Mission_ID, 1 FROM MISSION_ASSIGNMENT WHERE Personnel_ID = {personnel} AND {base} IS NOT NULL
+            ON CONFLICT (Base_ID, Mission_ID) DO UPDATE SET Assignees = Assignees + 1;"""
+
+
+def _personnel_removed(personnel, base):
+    last_links = f"""
+              FROM MISSION_ASSIGNMENT ma
+              JOIN BASE_MISSION_LINK l ON l.Base_ID = {base} AND l.Mission_ID = ma.Mission_ID
+              JOIN MISSION m ON m.Mission_ID = ma.Mission_ID
+             WHERE ma.Personnel_ID = {personnel} AND l.Assignees <= 1"""
+    missions = f"(SELECT Mission_ID FROM MISSION_ASSIGNMENT WHERE Personnel_ID = {personnel})"
+    return f"""
+        UPDATE BASE_MISSION_STATS
+           SET Total_Missions = Total_Missions - (SELECT COUNT(*) {last_links}),
+               Completed_Missions = Completed_Missions - (SELECT COUNT(*) {last_links} AND m.Status = 'Completed')
+         WHERE Base_ID = {base};
+        DELETE FROM BASE_MISSION_LINK WHERE Base_ID = {base} AND Assignees <= 1 AND Mission_ID IN {missions};
+        UPDATE BASE_MISSION_LINK SET Assignees = Assignees - 1 WHERE Base_ID = {base} AND Mission_ID IN {missions};"""
+
+
+def _pokemon_type(type_, pokemon, sign):
+    return f"""
+        INSERT INTO POKEMON_TYPE_STATS (Type, Pokemon_Count, HP_Sum, Attack_Sum, Defense_Sum)
+            SELECT {type_}, {sign}, {sign} * HP, {sign} * Attack, {sign} * Defense FROM POKEMON WHERE Pokemon_ID = {pokemon}
+            ON CONFLICT (Type) DO UPDATE SET Pokemon_Count = Pokemon_Count + excluded.Pokemon_Count,
+                                             HP_Sum = HP_Sum + excluded.HP_Sum,
+                                             Attack_Sum = Attack_Sum + excluded.Attack_Sum,
+                                             Defense_Sum = Defense_Sum + excluded.Defense_Sum;"""
+
+
+def _trigger(name, event, condition, body):
+    return f"CREATE TRIGGER {name} {event} FOR EACH ROW WHEN {_ACTIVE}{condition}\nBEGIN{body}\nEND"
+
+
+SUMMARY_TRIGGERS = [
+    _trigger('trg_mission_assignment_after_insert', 'AFTER INSERT ON MISSION_ASSIGNMENT', '',
+             _assignment_added('NEW.Personnel_ID', 'NEW.Mission_ID')),
+    _trigger('trg_mission_assignment_after_update', 'AFTER UPDATE OF Mission_ID, Personnel_ID ON MISSION_ASSIGNMENT',
+             ' AND (OLD.Mission_ID <> NEW.Mission_ID OR OLD.Personnel_ID <> NEW.Personnel_ID)',
+             _assignment_removed('OLD.Personnel_ID', 'OLD.Mission_ID')
+             + _assignment_added('NEW.Personnel_ID', 'NEW.Mission_ID')),
+    _trigger('trg_mission_assignment_after_delete', 'AFTER DELETE ON MISSION_ASSIGNMENT', '',
+             _assignment_removed('OLD.Personnel_ID', 'OLD.Mission_ID')),
+    _trigger('trg_personnel_after_update', 'AFTER UPDATE OF Base_ID ON PERSONNEL', ' AND OLD.Base_ID IS NOT NEW.Base_ID',
+             _personnel_removed('NEW.Personnel_ID', 'OLD.Base_ID') + _personnel_added('NEW.Personnel_ID', 'NEW.Base_ID')),
+    _trigger('trg_personnel_before_delete', 'BEFORE DELETE ON PERSONNEL', '',
+             _personnel_removed('OLD.Personnel_ID', 'OLD.Base_ID')),
+    _trigger('trg_mission_after_update', 'AFTER UPDATE OF Status ON MISSION',
+             " AND (OLD.Status = 'Completed') <> (NEW.Status = 'Completed')", """
+        UPDATE BASE_MISSION_STATS SET Completed_Missions = Completed_Missions + IIF(NEW.Status = 'Completed', 1, -1)
+         WHERE Base_ID IN (SELECT Base_ID FROM BASE_MISSION_LINK WHERE Mission_ID = NEW.Mission_ID);"""),
+    _trigger('trg_mission_before_delete', 'BEFORE DELETE ON MISSION', '', """
+        UPDATE BASE_MISSION_STATS
+           SET Total_Missions = Total_Missions - 1, Completed_Missions = Completed_Missions - (OLD.Status = 'Completed')
+         WHERE Base_ID IN (SELECT Base_ID FROM BASE_MISSION_LINK WHERE Mission_ID = OLD.Mission_ID);
+        DELETE FROM BASE_MISSION_LINK WHERE Mission_ID = OLD.Mission_ID;"""),
+    _trigger('trg_base_after_delete', 'AFTER DELETE ON BASE', '', """
+        DELETE FROM BASE_MISSION_LINK WHERE Base_ID = OLD.Base_ID;
+        DELETE FROM BASE_MISSION_STATS WHERE Base_ID = OLD.Base_ID;"""),
+    _trigger('trg_pokemon_type_after_insert', 'AFTER INSERT ON POKEMON_TYPE', '',
+             _pokemon_type('NEW.Type', 'NEW.Pokemon_ID', 1)),
+    _trigger('trg_pokemon_type_after_update', 'AFTER UPDATE OF Type, Pokemon_ID ON POKEMON_TYPE',
+             ' AND (OLD.Type <> NEW.Type OR OLD.Pokemon_ID <> NEW.Pokemon_ID)',
+             _pokemon_type('OLD.Type', 'OLD.Pokemon_ID', -1) + _pokemon_type('NEW.Type', 'NEW.Pokemon_ID', 1)),
+    _trigger('trg_pokemon_type_after_delete', 'AFTER DELETE ON POKEMON_TYPE', '',
+             _pokemon_type('OLD.Type', 'OLD.Pokemon_ID', -1)),
+    _trigger('trg_pokemon_after_update', 'AFTER UPDATE OF HP, Attack, Defense ON POKEMON',
+             ' AND (OLD.HP <> NEW.HP OR OLD.Attack <> NEW.Attack OR OLD.Defense <> NEW.Defense)', """
+        UPDATE POKEMON_TYPE_STATS
+           SET HP_Sum = HP_Sum + NEW.HP - OLD.HP,
+               Attack_Sum = Attack_Sum + NEW.Attack - OLD.Attack,
+               Defense_Sum = Defense_Sum + NEW.Defense - OLD.Defense
+         WHERE Type IN (SELECT Type FROM POKEMON_TYPE WHERE Pokemon_ID = NEW.Pokemon_ID);"""),
+    _trigger('trg_pokemon_before_delete', 'BEFORE DELETE ON POKEMON', '', """
+        UPDATE POKEMON_TYPE_STATS
+           SET Pokemon_Count = Pokemon_Count - 1,
+               HP_Sum = HP_Sum - OLD.HP,
+               Attack_Sum = Attack_Sum - OLD.Attack,
+               Defense_Sum = Defense_Sum - OLD.Defense
+         WHERE Type IN (SELECT Type FROM POKEMON_TYPE WHERE Pokemon_ID = OLD.Pokemon_ID);"""),
+]
+
+
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def init_database(pool, populate=False):
+    """
+    Creates the schema in an empty SQLite database and, with `populate`, loads
+    the populate.sql sample data (the triggers fill the summary tables as it
+    goes in). Yields {'Step', 'Statements', 'Seconds'} per script.
+    """
+    with pool.connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) AS N FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite%'")
+            if cursor.fetchone()['N']:
+                raise ValueError(f"{pool.dsn} already has tables; init needs an empty database.")
+
+        scripts = [('schema', translate_schema(_read(SCHEMA_PATH)))]
+        if populate:
+            scripts.append(('populate', split_statements(_read(POPULATE_PATH))))
+        for step, statements in scripts:
+            started = time.monotonic()
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+            connection.commit()
+            yield {'Step': step, 'Statements': len(statements), 'Seconds': round(time.monotonic() - started, 3)}
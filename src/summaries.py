@@ -0,0 +1,184 @@
+"""
+Summary Tables (summaries.py)
+Rebuild and consistency check for the trigger-maintained summary tables that
+back READ 5 (Pokemon stats by type) and READ 7 (mission success rate by base),
+including BASE_MISSION_HISTORY_STATS, READ 7's half for archived missions.
+
+The tables and the triggers that apply deltas to them live in schema.sql
+(GROUP 7) and migrations/002_summary_tables.sql. Triggers skip their work
+while the session variable @skip_summary_triggers is set, which bulk loads
+use before rebuilding the tables in one pass.
+
+    python3 main_app.py summary-rebuild
+    python3 main_app.py summary-check
+"""
+
+from cache import invalidates
+
+SUMMARY_TABLES = ('BASE_MISSION_LINK', 'BASE_MISSION_STATS', 'BASE_MISSION_HISTORY_STATS', 'POKEMON_TYPE_STATS')
+
+# --- Expected contents, computed from the fact tables ---
+
+# How many people from each base are assigned to each mission. A base counts a
+# mission once, however many of its people are on it.
+EXPECTED_LINKS_SQL = """
+    SELECT p.Base_ID, ma.Mission_ID, COUNT(*) AS Assignees
+    FROM MISSION_ASSIGNMENT ma
+    JOIN PERSONNEL p ON p.Personnel_ID = ma.Personnel_ID
+    WHERE p.Base_ID IS NOT NULL
+    GROUP BY p.Base_ID, ma.Mission_ID
+"""
+
+EXPECTED_BASE_STATS_SQL = """
+    SELECT x.Base_ID, COUNT(*) AS Total_Missions,
+           SUM(m.`Status` = 'Completed') AS Completed_Missions
+    FROM (
+        SELECT DISTINCT p.Base_ID, ma.Mission_ID
+        FROM MISSION_ASSIGNMENT ma
+        JOIN PERSONNEL p ON p.Personnel_ID = ma.Personnel_ID
+        WHERE p.Base_ID IS NOT NULL
+    ) x
+    JOIN MISSION m ON m.Mission_ID = x.Mission_ID
+    GROUP BY x.Base_ID
+"""
+
+# Archived missions count for the base their assignees belonged to when they
+# were archived (MISSION_ASSIGNMENT_HISTORY.Base_ID; see mission_archive.py).
+EXPECTED_HISTORY_STATS_SQL = """
+    SELECT x.Base_ID, COUNT(*) AS Total_Missions,
+           SUM(mh.`Status` = 'Completed') AS Completed_Missions
+    FROM (
+        SELECT DISTINCT Base_ID, Mission_ID
+        FROM MISSION_ASSIGNMENT_HISTORY
+        WHERE Base_ID IS NOT NULL
+    ) x
+    JOIN MISSION_HISTORY mh ON mh.Mission_ID = x.Mission_ID
+    GROUP BY x.Base_ID
+"""
+
+EXPECTED_TYPE_STATS_SQL = """
+    SELECT pt.Type, COUNT(*) AS Pokemon_Count,
+           SUM(p.HP) AS HP_Sum, SUM(p.Attack) AS Attack_Sum, SUM(p.Defense) AS Defense_Sum
+    FROM POKEMON_TYPE pt
+    JOIN POKEMON p ON p.Pokemon_ID = pt.Pokemon_ID
+    GROUP BY pt.Type
+"""
+
+# DELETE rather than TRUNCATE: TRUNCATE commits implicitly, and the rebuild
+# must replace the contents atomically.
+REBUILD_STATEMENTS = (
+    ('BASE_MISSION_LINK', "DELETE FROM BASE_MISSION_LINK",
+     "INSERT INTO BASE_MISSION_LINK (Base_ID, Mission_ID, Assignees)" + EXPECTED_LINKS_SQL),
+    ('BASE_MISSION_STATS', "DELETE FROM BASE_MISSION_STATS",
+     "INSERT INTO BASE_MISSION_STATS (Base_ID, Total_Missions, Completed_Missions)" + EXPECTED_BASE_STATS_SQL),
+    ('BASE_MISSION_HISTORY_STATS', "DELETE FROM BASE_MISSION_HISTORY_STATS",
+     "INSERT INTO BASE_MISSION_HISTORY_STATS (Base_ID, Total_Missions, Completed_Missions)" + EXPECTED_HISTORY_STATS_SQL),
+    ('POKEMON_TYPE_STATS', "DELETE FROM POKEMON_TYPE_STATS",
+     "INSERT INTO POKEMON_TYPE_STATS (Type, Pokemon_Count, HP_Sum, Attack_Sum, Defense_Sum)" + EXPECTED_TYPE_STATS_SQL),
+)
+
+# Link rows that differ from the fact tables (missing, extra or wrong count).
+LINK_DRIFT_SQL = """
+    SELECT e.Base_ID, e.Mission_ID, e.Assignees AS Expected, l.Assignees AS Actual
+    FROM ({expected}) e
+    LEFT JOIN BASE_MISSION_LINK l ON l.Base_ID = e.Base_ID AND l.Mission_ID = e.Mission_ID
+    WHERE l.Assignees IS NULL OR l.Assignees <> e.Assignees
+    UNION ALL
+    SELECT l.Base_ID, l.Mission_ID, NULL, l.Assignees
+    FROM BASE_MISSION_LINK l
+    LEFT JOIN ({expected}) e ON e.Base_ID = l.Base_ID AND e.Mission_ID = l.Mission_ID
+    WHERE e.Base_ID IS NULL
+    LIMIT %s
+""".format(expected=EXPECTED_LINKS_SQL)
+
+DEFAULT_DRIFT_LIMIT = 100
+
+
+# --- Rebuild ---
+
+def rebuild_summaries(cursor):
+    """
+    Recomputes every summary table from the fact tables on an open cursor,
+    without committing. Yields (table, rows written) as each one finishes.
+    """
+    for table, clear_sql, fill_sql in REBUILD_STATEMENTS:
+        cursor.execute(clear_sql)
+        yield table, cursor.execute(fill_sql)
+
+
+@invalidates(*SUMMARY_TABLES)
+def rebuild(pool):
+    """
+    Rebuilds the summary tables in one transaction. It runs SERIALIZABLE so the
+    fact rows it reads stay locked until commit: a concurrent write either
+    lands before the rebuild reads it or applies its delta on top afterwards.
+    Returns one {'Table', 'Rows'} dict per summary table.
+    """
+    with pool.connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL SERIALIZABLE")
+            counts = list(rebuild_summaries(cursor))
+        connection.commit()
+    return [{'Table': table, 'Rows': rows} for table, rows in counts]
+
+
+# --- Consistency Check ---
+
+def _keyed(rows, key, columns):
+    return {row[key]: tuple(int(row[c] or 0) for c in columns) for row in rows}
+
+
+def _diff(table, key, columns, expected, actual):
+    """Rows of `expected` and `actual` (both {key: values}) that disagree; all-zero stored rows count as absent."""
+    zero = (0,) * len(columns)
+    for k in sorted(set(expected) | set(actual), key=str):
+        want = expected.get(k, zero)
+        have = actual.get(k, zero)
+        for column, w, h in zip(columns, want, have):
+            if w != h:
+                yield {'Summary': table, 'Key': k, 'Column': column, 'Expected': w, 'Actual': h}
+
+
+def check(pool, limit=DEFAULT_DRIFT_LIMIT):
+    """
+    Compares the summary tables with the fact tables. Returns one dict per
+    disagreeing value (Summary, Key, Column, Expected, Actual); an empty list
+    means the summaries are consistent. At most `limit` link rows are listed.
+    """
+    base_columns = ('Total_Missions', 'Completed_Missions')
+    type_columns = ('Pokemon_Count', 'HP_Sum', 'Attack_Sum', 'Defense_Sum')
+    drift = []
+    with pool.connection() as connection, connection.cursor() as cursor:
+        # One snapshot for both sides of every comparison (pooled sessions run
+        # READ COMMITTED, where each statement would see a fresh one).
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+
+        cursor.execute(EXPECTED_BASE_STATS_SQL)
+        expected = _keyed(cursor.fetchall(), 'Base_ID', base_columns)
+        cursor.execute("SELECT Base_ID, Total_Missions, Completed_Missions FROM BASE_MISSION_STATS")
+        actual = _keyed(cursor.fetchall(), 'Base_ID', base_columns)
+        drift += _diff('BASE_MISSION_STATS', 'Base_ID', base_columns, expected, actual)
+
+        cursor.execute(EXPECTED_HISTORY_STATS_SQL)
+        expected = _keyed(cursor.fetchall(), 'Base_ID', base_columns)
+        cursor.execute("SELECT Base_ID, Total_Missions, Completed_Missions FROM BASE_MISSION_HISTORY_STATS")
+        actual = _keyed(cursor.fetchall(), 'Base_ID', base_columns)
+        drift += _diff('BASE_MISSION_HISTORY_STATS', 'Base_ID', base_columns, expected, actual)
+
+        cursor.execute(EXPECTED_TYPE_STATS_SQL)
+        expected = _keyed(cursor.fetchall(), 'Type', type_columns)
+        cursor.execute("SELECT Type, Pokemon_Count, HP_Sum, Attack_Sum, Defense_Sum FROM POKEMON_TYPE_STATS")
+        actual = _keyed(cursor.fetchall(), 'Type', type_columns)
+        drift += _diff('POKEMON_TYPE_STATS', 'Type', type_columns, expected, actual)
+
+        cursor.execute(LINK_DRIFT_SQL, (int(limit),))
+        for row in cursor.fetchall():
+            drift.append({
+                'Summary': 'BASE_MISSION_LINK',
+                'Key': f"{row['Base_ID']}/{row['Mission_ID']}",
+                'Column': 'Assignees',
+                'Expected': row['Expected'] or 0,
+                'Actual': row['Actual'] or 0,
+            })
+    return drift
@@ -0,0 +1,238 @@
+"""
+End-to-end checks of the headless commands on the embedded SQLite backend
+(sqlite_backend.py). Every test gets a fresh `sqlite-init --populate`
+database and runs commands in-process, the way the daemon does, so the
+result cache and the engagement graph carry over between commands.
+
+    python -m pytest -q
+"""
+
+import json
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+import headless
+
+READ_COMMANDS = (
+    ('active-missions',),
+    ('pending-risk',),
+    ('top-personnel', '--limit', 100),
+    ('unassigned-assets',),
+    ('pokemon-type-stats',),
+    ('untargeted-trainers', '--min-score', 0),
+    ('base-success-rate',),
+)
+
+
+def run(capsys, db, *argv):
+    """Runs one headless command against `db`. Returns (exit status, output rows)."""
+    status = headless.main(['--sqlite', db, *map(str, argv)])
+    out = capsys.readouterr().out
+    return status, [json.loads(line) for line in out.splitlines() if line]
+
+
+def query(db, sql, params=()):
+    """Reads `db` directly, bypassing the application."""
+    with closing(sqlite3.connect(db)) as connection:
+        return connection.execute(sql, params).fetchall()
+
+
+def assert_summaries_clean(capsys, db):
+    status, drift = run(capsys, db, 'summary-check')
+    assert (status, drift) == (0, [])
+
+
+def reports(capsys, db):
+    """The order-independent results of the reports that read both live and archived missions."""
+    results = {}
+    for argv in (('top-personnel', '--limit', 100), ('base-success-rate',), ('untargeted-trainers', '--min-score', 0)):
+        status, rows = run(capsys, db, *argv)
+        assert status == 0
+        results[argv[0]] = sorted(json.dumps(row, sort_keys=True) for row in rows)
+    return results
+
+
+@pytest.fixture
+def db(tmp_path, capsys):
+    path = str(tmp_path / 'chimera.db')
+    status, steps = run(capsys, path, 'sqlite-init', '--populate')
+    assert status == 0
+    assert [step['Step'] for step in steps] == ['schema', 'populate']
+    return path
+
+
+# --- Reads ---
+
+@pytest.mark.parametrize('argv', READ_COMMANDS, ids=[argv[0] for argv in READ_COMMANDS])
+def test_read_reports(capsys, db, argv):
+    status, rows = run(capsys, db, *argv)
+    assert status == 0
+    assert rows
+
+
+@pytest.mark.parametrize('command', ('active-missions', 'unassigned-assets'))
+def test_pages_match_the_streamed_report(capsys, db, command):
+    _, streamed = run(capsys, db, command)
+    paged, token = [], None
+    while True:
+        status = headless.main(['--sqlite', db, command, '--page-size', '7', *(['--page-token', token] if token else [])])
+        out, err = capsys.readouterr()
+        assert status == 0
+        paged += [json.loads(line) for line in out.splitlines() if line]
+        if 'next page token: ' not in err:
+            break
+        token = err.split('next page token: ')[1].split()[0]
+    assert [{k: v for k, v in row.items() if k != 'Personnel_ID'} for row in paged] == streamed
+
+
+def test_reads_are_not_counted_as_rollbacks(capsys, db):
+    headless.metrics.registry.reset()
+    assert run(capsys, db, 'pokemon-type-stats')[0] == 0
+    assert headless.metrics.registry.rollbacks == 0
+
+
+# --- Writes ---
+
+def test_writes_keep_summaries_in_step(capsys, db):
+    status, [recruit] = run(capsys, db, 'recruit', '--first-name', 'Test', '--last-name', 'Grunt',
+                            '--rank', 'grunt', '--base-id', 1)
+    assert status == 0
+    assert run(capsys, db, 'assign-pokemon', '--personnel-id', recruit['Personnel_ID'], '--pokemon-id', 3)[0] == 0
+    pending = query(db, "SELECT Mission_ID FROM MISSION WHERE Status = 'Pending' ORDER BY Mission_ID")[0][0]
+    status, [changed] = run(capsys, db, 'set-mission-status', '--mission-id', pending, '--status', 'completed')
+    assert (status, changed['Rows_Affected']) == (0, 1)
+    status, [changed] = run(capsys, db, 'set-pokemon-stats', '--pokemon-id', 3, '--hp', 99, '--attack', 98, '--defense', 97)
+    assert (status, changed['Rows_Affected']) == (0, 1)
+
+    # A grunt on missions, without experiment events (which would block the cascade).
+    grunt = query(db, """SELECT ma.Personnel_ID FROM MISSION_ASSIGNMENT ma JOIN GRUNT g ON g.Grunt_Personnel_ID = ma.Personnel_ID
+                         ORDER BY ma.Personnel_ID""")[0][0]
+    for personnel_id in (recruit['Personnel_ID'], grunt):
+        status, [fired] = run(capsys, db, 'fire', '--personnel-id', personnel_id, '--yes')
+        assert (status, fired['Rows_Affected']) == (0, 1)
+    assert_summaries_clean(capsys, db)
+
+
+def test_bulk_set_mission_status(capsys, db):
+    status, chunks = run(capsys, db, 'bulk-set-mission-status', '--status', 'aborted', '--from-status', 'pending',
+                         '--chunk-size', 2)
+    assert status == 0
+    assert sum(chunk['Updated'] for chunk in chunks) > 0
+    assert query(db, "SELECT COUNT(*) FROM MISSION WHERE Status = 'Pending'") == [(0,)]
+    assert_summaries_clean(capsys, db)
+
+
+def test_archive_missions_keeps_report_results(capsys, db):
+    before = reports(capsys, db)
+    status, batches = run(capsys, db, 'archive-missions', '--older-than', 0, '--batch-size', 3, '--yes')
+    assert status == 0
+    assert sum(batch['Missions'] for batch in batches) > 0
+    assert query(db, "SELECT COUNT(*) FROM MISSION WHERE Status IN ('Completed', 'Failed', 'Aborted')") == [(0,)]
+    assert reports(capsys, db) == before
+    assert_summaries_clean(capsys, db)
+
+
+def test_retire_archives_history_fire_cannot_delete(capsys, db):
+    scientist = query(db, "SELECT MIN(Scientist_Personnel_ID) FROM EXPERIMENTATION_EVENT")[0][0]
+    events = query(db, "SELECT COUNT(*) FROM EXPERIMENTATION_EVENT WHERE Scientist_Personnel_ID = ?", (scientist,))
+
+    assert run(capsys, db, 'fire', '--personnel-id', scientist, '--yes')[0] == 1   # ON DELETE RESTRICT
+    status, steps = run(capsys, db, 'retire', '--personnel-id', scientist, '--batch-size', 1, '--yes')
+    assert status == 0
+    assert steps[-1]['Step'] == 'delete' and steps[-1]['Rows'] == 1
+    assert query(db, "SELECT COUNT(*) FROM PERSONNEL WHERE Personnel_ID = ?", (scientist,)) == [(0,)]
+    assert query(db, "SELECT COUNT(*) FROM EXPERIMENTATION_EVENT_ARCHIVE WHERE Scientist_Personnel_ID = ?",
+                 (scientist,)) == events
+    assert_summaries_clean(capsys, db)
+
+
+def test_retire_report_fails_on_an_unknown_id(capsys, db):
+    person = query(db, "SELECT MIN(Personnel_ID) FROM PERSONNEL")[0][0]
+    status = headless.main(['--sqlite', db, 'retire', '--personnel-id', str(person), '--personnel-id', '999999', '--report'])
+    out, err = capsys.readouterr()
+    assert status == 1
+    assert {json.loads(line)['Personnel_ID'] for line in out.splitlines() if line} == {person}
+    assert '999999' in err
+
+
+def test_soft_retired_personnel_are_not_live(capsys, db):
+    _, active = run(capsys, db, 'active-missions', '--page-size', 1000)
+    person = active[0]['Personnel_ID']
+    assert run(capsys, db, 'retire', '--personnel-id', person, '--soft', '--yes')[0] == 0
+
+    _, active = run(capsys, db, 'active-missions', '--page-size', 1000)
+    assert person not in {row['Personnel_ID'] for row in active}
+    _, streamed = run(capsys, db, 'active-missions')
+    assert len(streamed) == len(active)
+    assert run(capsys, db, 'assign-pokemon', '--personnel-id', person, '--pokemon-id', 3)[0] == 1
+    assert_summaries_clean(capsys, db)
+
+
+def test_event_batch_skips_duplicates_but_not_foreign_key_errors(db):
+    existing = query(db, """SELECT Scientist_Personnel_ID, Serum_ID, Pokemon_ID, Project_ID
+                            FROM EXPERIMENTATION_EVENT LIMIT 1""")[0]
+    scientist, serum, pokemon, project = existing
+    new = query(db, """SELECT MIN(Pokemon_ID) FROM POKEMON WHERE Pokemon_ID NOT IN
+                       (SELECT Pokemon_ID FROM EXPERIMENTATION_EVENT WHERE Scientist_Personnel_ID = ?
+                        AND Serum_ID = ? AND Project_ID = ?)""", (scientist, serum, project))[0][0]
+    pool = headless.sqlite_backend.SQLitePool(db)
+    try:
+        with pool.connection() as connection:
+            written, errors = headless.experiment_ingest.write_batch(
+                connection, 'event', [existing, (scientist, serum, new, project), (scientist, serum, 999999, project)])
+    finally:
+        pool.close()
+    assert written == 1
+    assert list(errors) == [2]
+
+
+# --- Engagement Graph ---
+
+def test_graph_drops_edges_deleted_by_the_same_process(capsys, db):
+    grunt = query(db, "SELECT MIN(Grunt_Personnel_ID) FROM FIELD_ENGAGEMENT")[0][0]
+    status, neighbours = run(capsys, db, 'graph', 'neighbors', '--node', f"personnel:{grunt}")
+    assert status == 0 and neighbours
+    assert run(capsys, db, 'untargeted-trainers', '--min-score', 0, '--rank-by', 'centrality')[0] == 0
+
+    assert run(capsys, db, 'retire', '--personnel-id', grunt, '--yes')[0] == 0
+    assert run(capsys, db, 'graph', 'neighbors', '--node', f"personnel:{grunt}")[0] == 1
+    status, ranked = run(capsys, db, 'untargeted-trainers', '--min-score', 0, '--rank-by', 'centrality')
+    assert status == 0
+    engagements = dict(query(db, "SELECT Trainer_ID, COUNT(*) FROM FIELD_ENGAGEMENT GROUP BY Trainer_ID"))
+    assert {row['Trainer_ID']: row['Engagements'] for row in ranked} == \
+        {row['Trainer_ID']: engagements.get(row['Trainer_ID'], 0) for row in ranked}
+
+
+def test_graph_loads_an_insert_that_reuses_a_deleted_rowid(capsys, db):
+    assert run(capsys, db, 'graph', 'stats')[0] == 0
+    [(person, old_pokemon)] = query(db, "SELECT Personnel_ID, Pokemon_ID FROM OWNERSHIP ORDER BY rowid DESC LIMIT 1")
+    new_pokemon = query(db, """SELECT MIN(Pokemon_ID) FROM POKEMON
+                               WHERE Pokemon_ID NOT IN (SELECT Pokemon_ID FROM OWNERSHIP WHERE Personnel_ID = ?)""",
+                        (person,))[0][0]
+    # Another process: the delete frees the highest rowid, and the insert takes it again.
+    with closing(sqlite3.connect(db)) as connection, connection:
+        connection.execute("DELETE FROM OWNERSHIP WHERE Personnel_ID = ? AND Pokemon_ID = ?", (person, old_pokemon))
+        connection.execute("INSERT INTO OWNERSHIP (Personnel_ID, Pokemon_ID) VALUES (?, ?)", (person, new_pokemon))
+
+    status, neighbours = run(capsys, db, 'graph', 'neighbors', '--node', f"personnel:{person}", '--kind', 'pokemon',
+                             '--full-check')
+    assert status == 0
+    owned = {row['ID'] for row in neighbours}
+    assert new_pokemon in owned and old_pokemon not in owned
+    assert owned == {pokemon for (pokemon,) in query(db, "SELECT Pokemon_ID FROM OWNERSHIP WHERE Personnel_ID = ?",
+                                                       (person,))}
+
+
+# --- Daemon ---
+
+@pytest.mark.parametrize('argv', (('import-recruits', '-'), ('ingest-experiments', 'events.jsonl', '-')),
+                         ids=('import-recruits', 'ingest-experiments'))
+def test_daemon_refuses_stdin(db, argv):
+    pool = headless.sqlite_backend.SQLitePool(db)
+    try:
+        with pytest.raises(headless.CommandError, match='no stdin'):
+            headless._serve_dispatcher(pool)(list(argv))
+    finally:
+        pool.close()